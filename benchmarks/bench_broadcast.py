@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark one physics tick of player broadcasts at 10/50/200 connected
+clients, every player moving: one PLAYER_UPDATE per player awaited on every
+other socket in turn (the original path) versus the queued fan-out of a
+single PLAYER_SNAPSHOT, where the tick only enqueues and per-client writers send.
+
+Each fake socket yields to the event loop on send, like a real socket write;
+one of them is a slow client taking 1 ms per send.
+
+A second table spreads the players over an area that grows with their
+number (constant density) and compares the default interest radius with
+sending every player to everyone.
+
+Usage:
+    python3 benchmarks/bench_broadcast.py [ticks]
+"""
+
+import sys
+import os
+import time
+import random
+import asyncio
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.WARNING)
+
+from server import MinecraftServer, DEFAULT_INTEREST_RADIUS
+from protocol import create_player_update_message
+
+
+class FakeWebSocket:
+    """Counts frames; every send yields to the event loop for `delay` seconds."""
+
+    remote_address = ("bench", 0)
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.frames = 0
+        self.bytes = 0
+
+    async def send(self, frame):
+        await asyncio.sleep(self.delay)
+        self.frames += 1
+        self.bytes += len(frame)
+
+
+def move_players(server):
+    for player in server.players.values():
+        x, y, z = player.position
+        player.position = (x + 0.01, y, z)
+
+
+async def sequential_tick(server):
+    """Original path: each update is awaited on every socket in turn."""
+    for player in server.players.values():
+        frame = create_player_update_message(player).to_json()
+        for pid, websocket in server.clients.items():
+            if pid != player.id:
+                await websocket.send(frame)
+
+
+async def measure(clients, ticks):
+    server = MinecraftServer()
+    await server.register_client(FakeWebSocket(delay=0.001))
+    for _ in range(clients - 1):
+        await server.register_client(FakeWebSocket())
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        move_players(server)
+        await sequential_tick(server)
+    sequential = (time.perf_counter() - start) / ticks
+
+    enqueue = 0.0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        move_players(server)
+        tick_start = time.perf_counter()
+        await server._broadcast_physics_updates()
+        enqueue += time.perf_counter() - tick_start
+        await server.flush_outboxes()  # Mostly waiting on the slow client
+    delivered = (time.perf_counter() - start) / ticks
+    frames = sum(outbox.sent for outbox in server.outboxes.values()) / ticks
+    for outbox in server.outboxes.values():
+        outbox.task.cancel()
+    return sequential, enqueue / ticks, delivered, frames
+
+
+async def measure_spread(clients, ticks, interest_radius):
+    server = MinecraftServer(interest_radius=interest_radius)
+    sockets = [FakeWebSocket() for _ in range(clients)]
+    for websocket in sockets:
+        await server.register_client(websocket)
+    rng = random.Random(clients)
+    side = 40 * clients ** 0.5  # About one player per 40x40 blocks
+    for player in server.players.values():
+        player.position = (rng.uniform(0, side), 70.0, rng.uniform(0, side))
+        server.player_grid.move(player.id, player.position)
+    await server._broadcast_physics_updates()  # Initial keyframes
+    await server.flush_outboxes()
+    sent = sum(websocket.bytes for websocket in sockets)
+
+    elapsed = 0.0
+    for _ in range(ticks):
+        move_players(server)
+        for player in server.players.values():
+            server.player_grid.move(player.id, player.position)
+        start = time.perf_counter()
+        await server._broadcast_physics_updates()
+        elapsed += time.perf_counter() - start
+        await server.flush_outboxes()
+    per_client = (sum(websocket.bytes for websocket in sockets) - sent) / ticks / clients
+    for outbox in server.outboxes.values():
+        outbox.task.cancel()
+    return elapsed / ticks, per_client
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'clients':>7} {'sequential ms':>14} {'tick ms':>8} {'delivered ms':>13} {'frames/tick':>12}")
+    for clients in (10, 50, 200):
+        sequential, tick, delivered, frames = asyncio.run(measure(clients, ticks))
+        print(f"{clients:>7} {sequential * 1000:>14.1f} {tick * 1000:>8.1f} {delivered * 1000:>13.1f} "
+              f"{frames:>12.0f}")
+
+    print()
+    print(f"players spread out, interest radius {DEFAULT_INTEREST_RADIUS} vs everyone")
+    print(f"{'clients':>7} {'all ms':>7} {'aoi ms':>7} {'all B/client':>13} {'aoi B/client':>13}")
+    for clients in (10, 50, 200):
+        everyone, everyone_bytes = asyncio.run(measure_spread(clients, ticks, 0))
+        nearby, nearby_bytes = asyncio.run(measure_spread(clients, ticks, DEFAULT_INTEREST_RADIUS))
+        print(f"{clients:>7} {everyone * 1000:>7.1f} {nearby * 1000:>7.1f} "
+              f"{everyone_bytes:>13.0f} {nearby_bytes:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
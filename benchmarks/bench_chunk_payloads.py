@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark the WORLD_CHUNK frames built for a burst of joining players,
+with and without the server's chunk payload cache, and the join bandwidth
+and client parse time of JSON versus binary chunk frames.
+
+Usage:
+    python3 benchmarks/bench_chunk_payloads.py [joins]
+"""
+
+import sys
+import os
+import time
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.WARNING)
+
+from server import MinecraftServer, STORAGE_BACKENDS, DEFAULT_SPAWN_POSITION
+from protocol import Message, create_world_chunk_message, decode_chunk_frame
+
+
+def main():
+    joins = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{'backend':<8} {'joins':>5} {'uncached ms':>12} {'cached ms':>10} {'speedup':>8}")
+    for storage in STORAGE_BACKENDS:
+        server = MinecraftServer(world_storage=storage)
+        world = server.world
+        keys = world.chunks_by_distance(DEFAULT_SPAWN_POSITION)
+
+        start = time.perf_counter()
+        for _ in range(joins):
+            for cx, cz in keys:
+                chunk = world.get_world_chunk(cx, cz)
+                if chunk["blocks"]:
+                    create_world_chunk_message(chunk).to_json()
+        uncached = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(joins):
+            for cx, cz in keys:
+                server.get_chunk_payload(cx, cz)
+        cached = time.perf_counter() - start
+
+        print(f"{storage:<8} {joins:>5} {uncached * 1000:>12.0f} {cached * 1000:>10.0f} "
+              f"{uncached / cached:>7.0f}x")
+
+    # One join's worth of frames in each encoding, and what the client does with them
+    frames = {encoding: [frame for frame in (server.get_chunk_payload(cx, cz, encoding) for cx, cz in keys)
+                         if frame is not None]
+              for encoding in ("json", "binary")}
+    start = time.perf_counter()
+    for frame in frames["json"]:
+        for key in Message.from_json(frame).data["blocks"]:
+            tuple(map(int, key.split(',')))
+    json_parse = time.perf_counter() - start
+    start = time.perf_counter()
+    for frame in frames["binary"]:
+        decode_chunk_frame(frame)
+    binary_parse = time.perf_counter() - start
+
+    json_bytes = sum(len(frame.encode()) for frame in frames["json"])
+    binary_bytes = sum(len(frame) for frame in frames["binary"])
+    print()
+    print(f"{'encoding':<8} {'join KiB':>9} {'parse ms':>9}")
+    print(f"{'json':<8} {json_bytes / 1024:>9.0f} {json_parse * 1000:>9.1f}")
+    print(f"{'binary':<8} {binary_bytes / 1024:>9.0f} {binary_parse * 1000:>9.1f}")
+    print(f"ratio    {json_bytes / binary_bytes:>8.0f}x {json_parse / binary_parse:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
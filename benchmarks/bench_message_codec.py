@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the message codecs: size, encode and decode cost of each
+message type that has a binary layout, JSON text versus binary frames.
+
+Usage:
+    python3 benchmarks/bench_message_codec.py [iterations]
+"""
+
+import sys
+import os
+import timeit
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.WARNING)
+
+from protocol import (
+    PlayerState, BlockUpdate, BlockType, create_player_move_message, create_player_update_message,
+    create_block_place_message, create_block_destroy_message, create_world_update_message,
+    create_move_ack_message, encode_message, decode_message,
+)
+
+
+def sample_messages():
+    player = PlayerState("3f2b8c1e-5d4a-4b7e-9c1f-2a6d8e0b4c7a", (64.21875, 71.0, -12.5), (271.40625, -8.4375),
+                         "Joueur")
+    player.velocity = [0.3125, -4.90625, 0.0]
+    player.on_ground = True
+    edits = [BlockUpdate((64 + n, 70, -12), BlockType.BRICK, player.id) for n in range(8)]
+    return {
+        "player_move": create_player_move_message(player.position, player.rotation, 1234),
+        "move_ack": create_move_ack_message(1234),
+        "move_ack (correction)": create_move_ack_message(1234, correction=player),
+        "player_update": create_player_update_message(player),
+        "block_place": create_block_place_message((64, 70, -12), BlockType.BRICK),
+        "block_destroy": create_block_destroy_message((64, 70, -12)),
+        "world_update (1)": create_world_update_message(edits[:1]),
+        "world_update (8)": create_world_update_message(edits),
+    }
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"per message, {iterations} iterations")
+    print(f"{'message':<22} {'json B':>7} {'bin B':>6} {'json enc':>9} {'bin enc':>8} "
+          f"{'json dec':>9} {'bin dec':>8}")
+    for name, message in sample_messages().items():
+        text, frame = encode_message(message, "json"), encode_message(message, "binary")
+        costs = [timeit.timeit(call, number=iterations) / iterations * 1e6 for call in (
+            lambda: encode_message(message, "json"), lambda: encode_message(message, "binary"),
+            lambda: decode_message(text), lambda: decode_message(frame))]
+        print(f"{name:<22} {len(text.encode()):>7} {len(frame):>6} " +
+              " ".join(f"{cost:>7.2f}µs" for cost in costs))
+
+
+if __name__ == "__main__":
+    main()
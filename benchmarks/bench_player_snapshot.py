@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Bandwidth report for player replication: bytes each client receives per tick
+with one PLAYER_UPDATE per player (original format), with a PLAYER_SNAPSHOT
+of full player dicts, and with quantized delta snapshots including their
+periodic keyframes. Half of the players walk, the others stand still.
+
+Usage:
+    python3 benchmarks/bench_player_snapshot.py [ticks]
+"""
+
+import sys
+import os
+import json
+import math
+import random
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.WARNING)
+
+from server import SNAPSHOT_KEYFRAME_INTERVAL, PHYSICS_TICK_RATE
+from protocol import (
+    Message, MessageType, PlayerState, create_player_update_message, create_player_snapshot_message,
+    quantize_player_state, player_state_delta,
+)
+
+
+def walk(players, rng, tick):
+    """Move the first half of the players along circles, turning as they go."""
+    for n, player in enumerate(players[:len(players) // 2]):
+        angle = (tick + n * 7) / PHYSICS_TICK_RATE
+        player.position = (64 + 20 * math.cos(angle), 70.0, 64 + 20 * math.sin(angle))
+        player.rotation = (math.degrees(angle) % 360, rng.uniform(-10, 10))
+        player.velocity = [-20 * math.sin(angle) / PHYSICS_TICK_RATE, 0.0, 20 * math.cos(angle) / PHYSICS_TICK_RATE]
+        player.on_ground = True
+
+
+def measure(count, ticks):
+    rng = random.Random(count)
+    players = [PlayerState(f"player-{n:04d}-{rng.getrandbits(64):016x}", (64.0, 70.0, 64.0), (0.0, 0.0))
+               for n in range(count)]
+    updates = full = delta = 0
+    previous_full, baselines = {}, {}
+    for tick in range(1, ticks + 1):
+        walk(players, rng, tick)
+
+        # Original: every player's PLAYER_UPDATE reaches each of the other clients
+        updates += sum(len(create_player_update_message(player).to_json()) for player in players[1:])
+
+        # PLAYER_SNAPSHOT of the full dicts of the players that changed
+        dicts = {player.id: json.dumps(player.to_dict()) for player in players}
+        changed = [json.loads(value) for pid, value in dicts.items() if previous_full.get(pid) != value]
+        previous_full = dicts
+        if changed:
+            full += len(Message(MessageType.PLAYER_SNAPSHOT, {"tick": tick, "players": changed}).to_json())
+
+        # Quantized deltas, full keyframes every SNAPSHOT_KEYFRAME_INTERVAL ticks
+        states = {player.id: quantize_player_state(player) for player in players}
+        if tick % SNAPSHOT_KEYFRAME_INTERVAL == 0:
+            entries, keyframe = list(states.values()), True
+        else:
+            entries = [entry for entry in (player_state_delta(state, baselines.get(pid))
+                                           for pid, state in states.items()) if entry is not None]
+            keyframe = False
+        baselines = states
+        if entries:
+            delta += len(create_player_snapshot_message(tick, entries, keyframe).to_json())
+    return updates / ticks, full / ticks, delta / ticks
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2 * SNAPSHOT_KEYFRAME_INTERVAL
+    print(f"bytes per client per tick, {ticks} ticks, keyframe every {SNAPSHOT_KEYFRAME_INTERVAL}")
+    print(f"{'players':>7} {'updates':>10} {'full snap':>10} {'delta':>8} {'vs updates':>11} {'vs full':>8}")
+    for count in (10, 50, 200):
+        updates, full, delta = measure(count, ticks)
+        print(f"{count:>7} {updates:>10.0f} {full:>10.0f} {delta:>8.0f} "
+              f"{updates / delta:>10.1f}x {full / delta:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark server startup: regenerating the world vs loading its cached snapshot
+(--world-cache, voxel storage).
+
+Usage:
+    python3 benchmarks/bench_world_cache.py
+"""
+
+import gc
+import sys
+import os
+import tempfile
+import time
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.WARNING)
+
+from server import GameWorld, STORAGE_BACKENDS, world_cache_path
+
+REPEATS = 3
+
+
+def best_of(build):
+    """Return the fastest of REPEATS timed calls to build() (teardown not timed)."""
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        world = build()
+        times.append(time.perf_counter() - start)
+        del world
+        gc.collect()
+    return min(times)
+
+
+def generate_whole_world(storage):
+    world = GameWorld(storage=storage)
+    world.generate_chunks()  # Voxel worlds otherwise only generate the spawn area
+    return world
+
+
+def main():
+    # World caches need voxel storage: both startups without a cache are
+    # compared with loading the cached snapshot into chunk arrays
+    with tempfile.TemporaryDirectory() as cache_dir:
+        GameWorld(storage="voxel", world_cache=cache_dir)  # writes the snapshot
+        size = os.path.getsize(world_cache_path(cache_dir))
+        load_time = best_of(lambda: GameWorld(storage="voxel", world_cache=cache_dir))
+    print(f"snapshot: {size / 1024:.0f} KB, loaded in {load_time:.3f} s")
+    print(f"{'backend':<8} {'generate s':>11} {'speedup':>8}")
+    for storage in STORAGE_BACKENDS:
+        generate_time = best_of(lambda: generate_whole_world(storage))
+        print(f"{storage:<8} {generate_time:>11.3f} {generate_time / load_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
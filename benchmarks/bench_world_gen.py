@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Benchmark parallel chunk generation: wall time and speedup per worker count.
+
+Usage:
+    python3 benchmarks/bench_world_gen.py [world_size]
+"""
+
+import sys
+import os
+import time
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.WARNING)
+
+from server import WORLD_SEED
+from world_gen import generate_chunks
+from world_storage import CHUNK_SIZE
+
+
+def main():
+    world_size = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    side = world_size // CHUNK_SIZE
+    keys = [(cx, cz) for cx in range(side) for cz in range(side)]
+    cpus = os.cpu_count() or 1
+    counts = sorted({n for n in (1, 2, 4, 8, cpus) if n <= cpus})
+
+    print(f"{len(keys)} chunks ({world_size}x{world_size} blocks), {cpus} CPUs")
+    print(f"{'workers':>7} {'seconds':>8} {'chunks/s':>9} {'speedup':>8}")
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        for _ in generate_chunks(WORLD_SEED, keys, workers=workers):
+            pass
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>7} {elapsed:>8.2f} {len(keys) / elapsed:>9.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
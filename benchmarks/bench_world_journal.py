@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark the block journal: cost of recording an edit and replaying 1M edits.
+
+Usage:
+    python3 benchmarks/bench_world_journal.py
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.WARNING)
+
+from server import GameWorld, STORAGE_BACKENDS, WORLD_SIZE
+from protocol import BlockType
+from world_journal import BlockJournal
+
+EDITS = 1_000_000
+
+
+def main():
+    rng = random.Random(7)
+    edits = [((rng.randrange(WORLD_SIZE), rng.randrange(40, 120), rng.randrange(WORLD_SIZE)),
+              rng.random() < 0.7) for _ in range(EDITS)]
+
+    print(f"{'backend':<8} {'edits':>9} {'record us':>10} {'flush s':>8} {'replay s':>9}")
+    for storage in STORAGE_BACKENDS:
+        with tempfile.TemporaryDirectory() as journal_dir:
+            world = GameWorld(storage=storage, journal=BlockJournal(journal_dir, fsync_policy="never"))
+            journal = world.journal
+
+            # Time only the event-loop side of journaling
+            start = time.perf_counter()
+            for position, place in edits:
+                if place:
+                    journal.record_set(position, BlockType.BRICK, None, None)
+                else:
+                    journal.record_remove(position)
+            record_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            journal.close()
+            flush_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            restored = GameWorld(storage=storage, journal=BlockJournal(journal_dir))
+            replay_time = time.perf_counter() - start
+            restored.journal.close()
+
+        print(f"{storage:<8} {EDITS:>9} {record_time / EDITS * 1e6:>10.2f} {flush_time:>8.2f} {replay_time:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
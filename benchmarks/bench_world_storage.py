@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark GameWorld storage backends: memory footprint and lookup speed.
+
+Usage:
+    python3 benchmarks/bench_world_storage.py
+"""
+
+import sys
+import os
+import random
+import time
+import tracemalloc
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.INFO)
+
+from server import GameWorld, STORAGE_BACKENDS, WORLD_SIZE, DEFAULT_CHUNK_SIZE
+
+LOOKUPS = 200_000
+
+
+def measure_build(storage):
+    """Build a world and return (world, seconds, bytes allocated)."""
+    random.seed(452692)
+    tracemalloc.start()
+    start = time.perf_counter()
+    world = GameWorld(storage=storage)
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return world, elapsed, current
+
+
+def measure_lookups(world, positions):
+    """Return (seconds for `in` checks, seconds for get() calls)."""
+    blocks = world.world
+    start = time.perf_counter()
+    for position in positions:
+        position in blocks
+    contains_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for position in positions:
+        blocks.get(position)
+    get_time = time.perf_counter() - start
+    return contains_time, get_time
+
+
+def measure_chunks(world):
+    """Return seconds to extract every chunk of the world."""
+    start = time.perf_counter()
+    for cx in range(WORLD_SIZE // DEFAULT_CHUNK_SIZE):
+        for cz in range(WORLD_SIZE // DEFAULT_CHUNK_SIZE):
+            world.get_world_chunk(cx, cz)
+    return time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(7)
+    positions = [(rng.randrange(WORLD_SIZE), rng.randrange(64), rng.randrange(WORLD_SIZE))
+                 for _ in range(LOOKUPS)]
+
+    print(f"{'backend':<8} {'blocks':>8} {'build s':>8} {'memory MB':>10} {'B/block':>8} "
+          f"{'in ns':>7} {'get ns':>7} {'chunks s':>9}")
+    for storage in STORAGE_BACKENDS:
+        world, build_time, memory = measure_build(storage)
+        contains_time, get_time = measure_lookups(world, positions)
+        chunk_time = measure_chunks(world)
+        count = len(world.world)
+        print(f"{storage:<8} {count:>8} {build_time:>8.2f} {memory / 1e6:>10.1f} {memory / count:>8.0f} "
+              f"{contains_time / LOOKUPS * 1e9:>7.0f} {get_time / LOOKUPS * 1e9:>7.0f} {chunk_time:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
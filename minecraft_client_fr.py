@@ -161,6 +161,9 @@ CAMERA_MIN_DISTANCE = 0.1  # Distance minimale de la caméra au joueur
 CAMERA_PREFERRED_DISTANCE = 0.3  # Distance préférée de la caméra
 CAMERA_COLLISION_MARGIN = 0.05  # Marge pour éviter les collisions visuelles
 
+# Prediction constants
+PREDICTION_BUFFER_SIZE = 512  # Pas de physique gardés en attente d'acquittement (~8 s à 60 FPS)
+
 # Python 2/3 compatibility
 xrange = range
 
@@ -187,6 +190,46 @@ def cube_vertices(x, y, z, n):
         x+n,y-n,z-n, x-n,y-n,z-n, x-n,y+n,z-n, x+n,y+n,z-n,  # back
     ]
 
+class PredictionBuffer:
+    """Entrées locales pas encore acquittées par le serveur (prédiction côté client).
+
+    Chaque pas de physique est enregistré avec le numéro du prochain PLAYER_MOVE.
+    Quand le serveur refuse un mouvement, on repart de son état et on rejoue les
+    pas postérieurs avec la même MinecraftPhysics que le jeu. En vol, le pas est
+    un déplacement (dx, dy, dz) rejoué avec la seule résolution des collisions.
+    """
+
+    def __init__(self, size: int = PREDICTION_BUFFER_SIZE):
+        self.inputs = deque(maxlen=size)  # [seq, dt, vx, vz, jumping, flight]
+        self.seq = 0
+
+    def record(self, dt, vx, vz, jumping, flight=None):
+        """Enregistre un pas de physique (flight: déplacement en vol), rattaché au prochain mouvement envoyé."""
+        self.inputs.append((self.seq + 1, dt, vx, vz, jumping, flight))
+
+    def next_seq(self):
+        """Numéro du mouvement à envoyer."""
+        self.seq += 1
+        return self.seq
+
+    def acknowledge(self, seq):
+        """Oublie les pas des mouvements jusqu'à seq inclus."""
+        while self.inputs and self.inputs[0][0] <= seq:
+            self.inputs.popleft()
+
+    def replay(self, physics, position, dy, on_ground):
+        """Rejoue les pas en attente depuis l'état du serveur; renvoie (position, dy, au sol)."""
+        for _, dt, vx, vz, jumping, flight in self.inputs:
+            if flight is not None:
+                x, y, z = position
+                target = (x + flight[0], y + flight[1], z + flight[2])
+                position, _ = physics.collision_detector.resolve_collision(position, target)
+                continue
+            position, velocity, on_ground = physics.update_position(position, (vx, dy, vz), dt, on_ground, jumping)
+            dy = velocity[1]
+        return position, dy, on_ground
+
+
 class AdvancedNetworkClient:
     """Client réseau simplifié avec reconnexion automatique."""
 
@@ -203,6 +246,9 @@ class AdvancedNetworkClient:
         self.reconnect_delay = 5
         self.ping_ms = 0
         self.messages_sent = self.messages_received = 0
+        self.snapshot_decoder = PlayerSnapshotDecoder()
+        self.prediction = PredictionBuffer()
+        self.message_codec = "json"  # Codec choisi par le serveur dans WORLD_INIT
 
     def start_connection(self):
         """Démarre la connexion réseau dans un thread séparé."""
@@ -242,9 +288,13 @@ class AdvancedNetworkClient:
         self.connected = True
         self.connection_attempts = 0
         self.reconnect_delay = 5
+        self.message_codec = "json"  # JSON jusqu'à la réponse du serveur
 
-        # Envoi du message de connexion
-        join_msg = create_player_join_message(config.get("player", "name", "Joueur"))
+        # Envoi du message de connexion, avec les chunks encore en mémoire après une reconnexion
+        model = self.window.model
+        join_msg = create_player_join_message(config.get("player", "name", "Joueur"),
+                                              known_chunks=dict(model.chunk_versions),
+                                              world_epoch=model.world_epoch)
         await self.websocket.send(join_msg.to_json())
         self.messages_sent += 1
 
@@ -253,7 +303,12 @@ class AdvancedNetworkClient:
         try:
             async for message_str in self.websocket:
                 try:
-                    message = Message.from_json(message_str)
+                    if is_compressed_frame(message_str):
+                        message_str = decompress_frame(message_str)
+                    if is_chunk_frame(message_str):
+                        message = Message(MessageType.WORLD_CHUNK, decode_chunk_frame(message_str))
+                    else:
+                        message = decode_message(message_str)
                     self.messages_received += 1
                     pyglet.clock.schedule_once(lambda dt, msg=message: self._handle_server_message(msg), 0)
                 except Exception:
@@ -283,6 +338,7 @@ class AdvancedNetworkClient:
                 if player_id:
                     self.player_id = player_id
                     print(f"✅ Player ID received: {player_id}")
+                self.message_codec = message.data.get("message_codec") or "json"
                 
                 self.window.model.load_world_data(message.data)
                 if self.player_id and not self.window.local_player_cube:
@@ -294,6 +350,11 @@ class AdvancedNetworkClient:
                 self.window.request_cameras_list()
             elif message.type == MessageType.WORLD_CHUNK:
                 self.window.model.load_world_chunk(message.data)
+            elif message.type == MessageType.CHUNK_UNLOAD:
+                for chunk_x, chunk_z in message.data.get("chunks", []):
+                    self.window.model.unload_chunk(chunk_x, chunk_z)
+            elif message.type == MessageType.CHUNK_DELTA:
+                self.window.model.apply_chunk_delta(message.data)
             elif message.type == MessageType.WORLD_UPDATE:
                 for block_data in message.data.get("blocks", []):
                     block_update = BlockUpdate.from_dict(block_data)
@@ -316,13 +377,36 @@ class AdvancedNetworkClient:
                         self.window.local_player_cube.velocity = player_data["velocity"]
                         self.window.local_player_cube.on_ground = player_data.get("on_ground", False)
                 else:
-                    self.window.model.other_players[player_id] = PlayerState.from_dict(player_data)
+                    self._remote_player(player_id).apply_dict(player_data)
+            elif message.type == MessageType.MOVE_ACK:
+                self.prediction.acknowledge(message.data["seq"])
+                if "position" in message.data:  # Mouvement refusé: on repart de l'état du serveur
+                    self.window.apply_server_correction(tuple(message.data["position"]),
+                                                        message.data["velocity"][1],
+                                                        message.data.get("on_ground", False))
+            elif message.type == MessageType.PLAYER_SNAPSHOT:
+                # Notre propre état vient des confirmations de mouvement du serveur
+                updated, left = self.snapshot_decoder.apply_entries(message.data)
+                now = time.monotonic()
+                for entry in updated:
+                    if entry["id"] != self.player_id:
+                        self._remote_player(entry["id"]).apply_entry(entry, now)
+                for player_id in left:  # Sorti de notre zone d'intérêt
+                    self.window.model.other_players.pop(player_id, None)
             elif message.type == MessageType.PLAYER_LIST:
-                self.window.model.other_players = {}
+                # Seuls les snapshots créent les autres joueurs: la liste inclut aussi ceux
+                # hors de notre zone d'intérêt, que les snapshots ne mettraient jamais à jour
+                listed = set()
+                now = time.monotonic()
+                other_players = self.window.model.other_players
                 for player_data in message.data.get("players", []):
-                    player = PlayerState.from_dict(player_data)
-                    if player.id != self.player_id:
-                        self.window.model.other_players[player.id] = player
+                    player_id = player_data["id"]
+                    if player_id != self.player_id:
+                        if player_id in other_players:
+                            self._remote_player(player_id).apply_dict(player_data, now)
+                        listed.add(player_id)
+                for player_id in [pid for pid in other_players if pid not in listed]:
+                    del other_players[player_id]
             elif message.type == MessageType.CHAT_BROADCAST:
                 self.window.show_message(f"[CHAT] {message.data.get('text', '')}")
             elif message.type == MessageType.CAMERAS_LIST:
@@ -334,6 +418,14 @@ class AdvancedNetworkClient:
         except Exception as e:
             print(f"Erreur message {message.type}: {e}")
 
+    def _remote_player(self, player_id):
+        """Renvoie l'autre joueur à mettre à jour sur place, créé à sa première apparition."""
+        other_players = self.window.model.other_players
+        player = other_players.get(player_id)
+        if not isinstance(player, RemotePlayer):
+            player = other_players[player_id] = RemotePlayer(player_id, (0.0, 0.0, 0.0), (0.0, 0.0))
+        return player
+
     def send_message(self, message: Message):
         """Envoie un message au serveur."""
         if self.connected and self.websocket and self.loop:
@@ -345,7 +437,7 @@ class AdvancedNetworkClient:
         """Envoie un message de manière asynchrone."""
         if self.websocket:
             try:
-                await self.websocket.send(message.to_json())
+                await self.websocket.send(encode_message(message, self.message_codec))
                 self.messages_sent += 1
             except Exception as e:
                 print(f"Erreur envoi: {e}")
@@ -382,7 +474,9 @@ class EnhancedClientModel:
         self.queue = deque()
         self.other_players = {}
         self.world_size, self.spawn_position = 128, [30, 50, 80]
-        
+        self.chunk_versions = {}  # (cx, cz) -> version du chunk reçu, renvoyée au serveur à la reconnexion
+        self.world_epoch = None  # Monde auquel ces versions se rapportent
+
         # Local player and cubes management
         self.local_player = None
         self.cubes = {}  # All cubes (local + remote)
@@ -423,9 +517,18 @@ class EnhancedClientModel:
         """Charge les données initiales du monde depuis le serveur."""
         self.world_size = world_data.get("world_size", 128)
         self.spawn_position = world_data.get("spawn_position", [30, 50, 80])
+        self.world_epoch = world_data.get("world_epoch")
 
     def load_world_chunk(self, chunk_data):
-        """Charge un chunk de données du monde."""
+        """Charge un chunk de données du monde (trame JSON ou binaire décodée)."""
+        if "version" in chunk_data:
+            # Surface puis intérieur: on garde la plus ancienne version reçue
+            key = (chunk_data["chunk_x"], chunk_data["chunk_z"])
+            self.chunk_versions[key] = min(chunk_data["version"], self.chunk_versions.get(key, chunk_data["version"]))
+        if "positions" in chunk_data:
+            for position, block_type in zip(chunk_data["positions"], chunk_data["block_types"]):
+                self.add_block(position, block_type, immediate=False)
+            return
         for pos_str, block_type in chunk_data.get("blocks", {}).items():
             try:
                 position = tuple(map(int, pos_str.split(',')))
@@ -433,8 +536,27 @@ class EnhancedClientModel:
             except ValueError:
                 continue
 
+    def unload_chunk(self, chunk_x, chunk_z):
+        """Oublie un chunk sorti du rayon de vue (le serveur le renverra au retour)."""
+        self.chunk_versions.pop((chunk_x, chunk_z), None)
+        for position in self.sectors.pop((chunk_x, 0, chunk_z), []):
+            self.hide_block(position)
+            self.world.pop(position, None)
+
+    def apply_chunk_delta(self, delta):
+        """Rejoue les modifications d'un chunk gardé pendant une déconnexion (CHUNK_DELTA)."""
+        for edit in delta["blocks"]:
+            position, block_type = tuple(edit["position"]), edit["block_type"]
+            if self.world.get(position) not in (None, block_type):
+                self.remove_block(position, immediate=False)
+            if block_type != BlockType.AIR:
+                self.add_block(position, block_type, immediate=False)
+        self.chunk_versions[(delta["chunk_x"], delta["chunk_z"])] = delta["version"]
+
     def add_block(self, position, block_type, immediate=True):
         """Ajoute un bloc au monde."""
+        if self.world.get(position) == block_type:
+            return  # Déjà connu (bloc enfoui renvoyé quand un creusage l'expose)
         self.world[position] = block_type
         self.sectors.setdefault(sectorize(position), []).append(position)
         action = self.show_block if self.exposed(position) else lambda p: None
@@ -1186,13 +1308,7 @@ class MinecraftWindow(BaseWindow):
         dx, dy, dz = self.get_motion_vector()
         dx, dy, dz = dx * d, dy * d, dz * d
 
-        # Initialize or update physics system
-        if not hasattr(self, '_collision_detector'):
-            self._collision_detector = MinecraftCollisionDetector(self.model.world)
-            self._physics = MinecraftPhysics(self._collision_detector)
-
-        # Update collision detector with current world
-        self._collision_detector.world_blocks = self.model.world
+        physics = self._get_physics()
 
         # Current state
         current_velocity = (dx / dt if dt > 0 else 0, self.dy, dz / dt if dt > 0 else 0)
@@ -1233,14 +1349,16 @@ class MinecraftWindow(BaseWindow):
             x, y, z = self.position
             x, y, z = self.collide((x + dx, y + dy, z + dz), PLAYER_HEIGHT)
             self.position = (x, y, z)
+            self.network.prediction.record(dt, 0.0, 0.0, False, flight=(dx, dy, dz))
         else:
             # Standard physics with gravity and collision
-            new_position, new_velocity, new_on_ground = self._physics.update_position(
+            new_position, new_velocity, new_on_ground = physics.update_position(
                 self.position, current_velocity, dt, on_ground, self.jumping
             )
 
             self.position = new_position
             self.dy = new_velocity[1]
+            self.network.prediction.record(dt, current_velocity[0], current_velocity[2], self.jumping)
 
             # Update local player cube position
             if self.local_player_cube:
@@ -1251,9 +1369,22 @@ class MinecraftWindow(BaseWindow):
             # Update collision types for compatibility
             self.collision_types["top"] = new_on_ground
 
+    def _get_physics(self):
+        """Moteur physique du joueur local, recalé sur le monde et la taille reçus du serveur.
+
+        Le détecteur est créé avant WORLD_INIT: sa taille de monde est remise à
+        jour à chaque appel pour ne pas garder la valeur par défaut.
+        """
+        if not hasattr(self, '_collision_detector'):
+            self._collision_detector = MinecraftCollisionDetector(self.model.world, self.model.world_size)
+            self._physics = MinecraftPhysics(self._collision_detector)
+        self._collision_detector.world_blocks = self.model.world
+        self._collision_detector.manager.world_size = self.model.world_size
+        return self._physics
+
     def collide(self, position, height):
         """Collision simplifiée avec snapping sévère pour éviter la pénétration visuelle."""
-        collision_detector = MinecraftCollisionDetector(self.model.world)
+        collision_detector = MinecraftCollisionDetector(self.model.world, self.model.world_size)
         other_cubes = self.model.get_other_cubes()
         collision_detector.set_other_cubes(other_cubes)
 
@@ -1277,9 +1408,17 @@ class MinecraftWindow(BaseWindow):
     def _send_position_update(self):
         """Envoie la mise à jour de position au serveur."""
         if self.network.connected:
-            move_msg = create_player_move_message(self.position, self.rotation)
+            move_msg = create_player_move_message(self.position, self.rotation, self.network.prediction.next_seq())
             self.network.send_message(move_msg)
 
+    def apply_server_correction(self, position, dy, on_ground):
+        """Recale le joueur sur l'état du serveur puis rejoue les entrées non acquittées."""
+        self.position, self.dy, on_ground = self.network.prediction.replay(self._get_physics(), position, dy, on_ground)
+        self.collision_types["top"] = on_ground
+        if self.local_player_cube:
+            self.local_player_cube.update_position(self.position)
+            self.local_player_cube.on_ground = on_ground
+
     def update_position_display(self):
         """Met à jour l'affichage permanent de la position."""
         x, y, z = self.position
@@ -1938,7 +2077,7 @@ Statut: {connection_status}"""
 
         for player_id, player in self.model.other_players.items():
             if hasattr(player, 'name') and hasattr(player, 'position') and player.name:
-                x, y, z = player.position
+                x, y, z = player.sample()[0] if isinstance(player, RemotePlayer) else player.position
                 player_distance = math.sqrt((x - self.position[0])**2 +
                                           (y - self.position[1])**2 +
                                           (z - self.position[2])**2)
@@ -67,23 +67,24 @@ collision_logger.setLevel(logging.INFO)
 def get_block_type_from_data(block_data):
     """Helper function to extract block type from block data.
     
-    Handles both old string format and new dict format for backward compatibility.
+    Client-side worlds store plain type strings, server worlds store
+    BlockRecord values.
     """
-    if isinstance(block_data, dict):
-        return block_data.get("type")
-    return block_data
+    if type(block_data) is str:
+        return block_data
+    return block_data.type
 
 
 def has_block_collision(block_data):
     """Helper function to check if a block has collision.
     
-    Handles both old string format and new dict format for backward compatibility.
+    Client-side worlds store plain type strings, server worlds store
+    BlockRecord values.
     """
-    if isinstance(block_data, dict):
-        return block_data.get("collision", True)
-    else:
-        # For old string format, water and air don't have collision
+    if type(block_data) is str:
+        # For plain type strings, water and air don't have collision
         return block_data not in {"water", "air"}
+    return block_data.collision
 
 
 
@@ -98,8 +99,8 @@ class UnifiedCollisionManager:
     """
     
     def __init__(self, world_blocks: Dict[Tuple[int, int, int], str], 
-                 world_size: int = WORLD_SIZE, world_height: int = WORLD_HEIGHT):
-        """Initialize the collision manager."""
+                 world_size: Optional[int] = WORLD_SIZE, world_height: int = WORLD_HEIGHT):
+        """Initialize the collision manager (world_size None: unbounded in X and Z)."""
         self.world_blocks = world_blocks
         self.other_players = []  # List of other players for player-to-player collision
         self.world_size = world_size
@@ -118,11 +119,11 @@ class UnifiedCollisionManager:
         x, y, z = position
         player_half_width = PLAYER_WIDTH / 2
         
-        # Clamp X coordinate (allow player center from half_width to world_size - half_width)
-        x = max(player_half_width, min(x, self.world_size - player_half_width))
-        
-        # Clamp Z coordinate (allow player center from half_width to world_size - half_width)
-        z = max(player_half_width, min(z, self.world_size - player_half_width))
+        # Clamp X and Z (player center from half_width to world_size - half_width);
+        # a world_size of None is unbounded horizontally
+        if self.world_size is not None:
+            x = max(player_half_width, min(x, self.world_size - player_half_width))
+            z = max(player_half_width, min(z, self.world_size - player_half_width))
         
         # Clamp Y coordinate (don't allow falling below 0 or above world height)
         y = max(0.0, min(y, self.world_height - PLAYER_HEIGHT))
@@ -872,7 +873,7 @@ class MinecraftCollisionDetector:
     """Legacy compatibility wrapper around UnifiedCollisionManager."""
     
     def __init__(self, world_blocks: Dict[Tuple[int, int, int], str], 
-                 world_size: int = WORLD_SIZE, world_height: int = WORLD_HEIGHT):
+                 world_size: Optional[int] = WORLD_SIZE, world_height: int = WORLD_HEIGHT):
         self.manager = UnifiedCollisionManager(world_blocks, world_size, world_height)
         self.world_blocks = world_blocks  # For compatibility
         
@@ -947,11 +948,13 @@ _global_collision_manager = None
 _global_physics_manager = None
 
 def get_collision_manager(world_blocks: Dict[Tuple[int, int, int], str],
-                         world_size: int = WORLD_SIZE, 
+                         world_size: Optional[int] = WORLD_SIZE, 
                          world_height: int = WORLD_HEIGHT) -> UnifiedCollisionManager:
-    """Get or create global collision manager."""
+    """Get or create global collision manager (world_size None: no clamping to world bounds)."""
     global _global_collision_manager
-    if _global_collision_manager is None or _global_collision_manager.world_blocks != world_blocks:
+    # Identity check: comparing world mappings by value walks every block
+    if (_global_collision_manager is None or _global_collision_manager.world_blocks is not world_blocks
+            or _global_collision_manager.world_size != world_size):
         _global_collision_manager = UnifiedCollisionManager(world_blocks, world_size, world_height)
     return _global_collision_manager
 
@@ -973,7 +976,7 @@ def unified_check_collision(position: Tuple[float, float, float],
                            world_blocks: Dict[Tuple[int, int, int], str],
                            other_players: List = None,
                            player_id: str = None,
-                           world_size: int = WORLD_SIZE,
+                           world_size: Optional[int] = WORLD_SIZE,
                            world_height: int = WORLD_HEIGHT) -> bool:
     """
     Unified collision check for both blocks and players.
@@ -983,7 +986,8 @@ def unified_check_collision(position: Tuple[float, float, float],
         world_blocks: World block dictionary
         other_players: List of other players
         player_id: Player ID for collision avoidance
-        world_size: World size (X and Z dimensions)
+        world_size: World size (X and Z dimensions); None for an unbounded
+            world, where positions are not clamped
         world_height: World height (Y dimension)
     """
     manager = get_collision_manager(world_blocks, world_size, world_height)
@@ -996,9 +1000,9 @@ def unified_check_player_collision(position: Tuple[float, float, float],
                                   other_players: List,
                                   player_id: str = None) -> bool:
     """
-    Unified player-to-player collision check.
+    Unified player-to-player collision check (world bounds play no part).
     """
-    manager = UnifiedCollisionManager({})  # Empty world blocks
+    manager = UnifiedCollisionManager({}, world_size=None)  # Empty world blocks, no clamping
     manager.set_other_players(other_players)
     return manager.check_player_collision(position, player_id)
 
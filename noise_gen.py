@@ -1,6 +1,8 @@
 import random as rand 
 import math
 
+import numpy as np
+
 class NoiseParameters:
     def __init__(self, octaves, amplitude, smoothness, roughness, heightOffset):
         self.octaves = octaves
@@ -62,3 +64,52 @@ class NoiseGen:
         result = (((totalValue / 2.1) + 1.2) * self.noiseParams.amplitude) + self.noiseParams.heightOffset
 
         return (totalValue / 5) + self.noiseParams.heightOffset
+
+    def height_map(self, x0, z0, w, h):
+        """Return getHeight for a w x h block of columns as an array indexed [x - x0, z - z0].
+
+        Bit-identical to the scalar path: the integer hash wraps in int64 but
+        only its low 31 bits are kept, and the cosine lerp weights depend on x
+        or z alone, so they are computed with math.cos per row/column and
+        only exact IEEE +, *, / run vectorized.
+        """
+        xs = np.arange(x0, x0 + w, dtype=np.float64)
+        zs = np.arange(z0, z0 + h, dtype=np.float64)
+        totalValue = np.zeros((w, h), dtype=np.float64)
+
+        for a in range(self.noiseParams.octaves - 1):
+            freq = math.pow(2.0, a)
+            nx = xs * freq / self.noiseParams.smoothness
+            nz = zs * freq / self.noiseParams.smoothness
+            totalValue += self._noise_grid(nx, nz) * self.noiseParams.amplitude
+
+        return (totalValue / 5) + self.noiseParams.heightOffset
+
+    def _noise_grid(self, x, z):
+        """Vectorized _noise over the outer product of 1-D x and z coordinates."""
+        floorX = np.trunc(x)
+        floorZ = np.trunc(z)
+
+        fx = floorX[:, None]
+        fz = floorZ[None, :]
+        s = self._getNoise2_array(fx + fz * 57)
+        t = self._getNoise2_array((fx + 1) + fz * 57)
+        u = self._getNoise2_array(fx + (fz + 1) * 57)
+        v = self._getNoise2_array((fx + 1) + (fz + 1) * 57)
+
+        muX = self._lerp_weights(x - floorX)[:, None]
+        muZ = self._lerp_weights(z - floorZ)[None, :]
+        rec1 = s * (1 - muX) + t * muX
+        rec2 = u * (1 - muX) + v * muX
+        return rec1 * (1 - muZ) + rec2 * muZ
+
+    def _getNoise2_array(self, n):
+        """Vectorized _getNoise2; int64 wrap-around preserves the masked low bits."""
+        n = (n + self.seed).astype(np.int64)
+        n = (n << 13) ^ n
+        newn = (n * (n * n * 60493 + 19990303) + 1376312589) & 0x7fffffff
+        return 1.0 - (newn.astype(np.float64) / 1073741824.0)
+
+    def _lerp_weights(self, fractions):
+        """Cosine interpolation weights, computed with math.cos like _lerp."""
+        return np.array([(1.0 - math.cos(f * 3.14)) / 2.0 for f in fractions.tolist()], dtype=np.float64)
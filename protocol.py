@@ -6,11 +6,16 @@ Defines message types and data structures used between client and server.
 import json
 import asyncio
 import socket
+import struct
+import zlib
 import threading
 import time
 import math
+from collections import deque
 from enum import Enum
-from typing import Dict, List, Tuple, Any, Optional, Set
+from typing import Dict, List, Tuple, Any, Optional, Sequence, Set, Union
+
+import numpy as np
 
 # Pyglet and OpenGL imports for window abstraction
 try:
@@ -54,8 +59,12 @@ class MessageType(Enum):
     # Server to Client
     WORLD_INIT = "world_init"
     WORLD_CHUNK = "world_chunk"
+    CHUNK_UNLOAD = "chunk_unload"
+    CHUNK_DELTA = "chunk_delta"
     WORLD_UPDATE = "world_update"
     PLAYER_UPDATE = "player_update"
+    PLAYER_SNAPSHOT = "player_snapshot"
+    MOVE_ACK = "move_ack"
     BLOCK_UPDATE = "block_update"
     CHAT_BROADCAST = "chat_broadcast"
     PLAYER_LIST = "player_list"
@@ -78,6 +87,61 @@ class BlockType:
     AIR = "air"  # Represents removed blocks
     CAT = "cat"  # Cat block
 
+class BlockRecord:
+    """Immutable block data stored for each voxel of the world.
+
+    Natural blocks share one interned instance per (type, collision) pair, so a
+    world of a few hundred thousand blocks holds only a handful of records.
+    Camera and user blocks carry a block_id/owner and get their own instance.
+    """
+
+    __slots__ = ("type", "collision", "block_id", "owner")
+    _interned: Dict[Tuple[str, bool], 'BlockRecord'] = {}
+
+    def __init__(self, block_type: str, collision: bool,
+                 block_id: Optional[str] = None, owner: Optional[str] = None):
+        object.__setattr__(self, "type", block_type)
+        object.__setattr__(self, "collision", collision)
+        object.__setattr__(self, "block_id", block_id)
+        object.__setattr__(self, "owner", owner)
+
+    @classmethod
+    def shared(cls, block_type: str, collision: bool) -> 'BlockRecord':
+        """Return the interned record for a block without block_id or owner."""
+        key = (block_type, collision)
+        record = cls._interned.get(key)
+        if record is None:
+            record = cls._interned[key] = cls(block_type, collision)
+        return record
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BlockRecord is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("BlockRecord is immutable")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the plain dict format."""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __reduce__(self):
+        return (BlockRecord, (self.type, self.collision, self.block_id, self.owner))
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, BlockRecord):
+            return NotImplemented
+        return (self.type, self.collision, self.block_id, self.owner) == \
+               (other.type, other.collision, other.block_id, other.owner)
+
+    def __hash__(self) -> int:
+        return hash((self.type, self.collision, self.block_id, self.owner))
+
+    def __repr__(self) -> str:
+        return (f"BlockRecord(type={self.type!r}, collision={self.collision!r}, "
+                f"block_id={self.block_id!r}, owner={self.owner!r})")
+
 class Message:
     """Base message class for client-server communication."""
 
@@ -659,6 +723,601 @@ class PlayerState(Cube):
         player.size = data.get("size", 0.5)
         return player
 
+# ---------- Player snapshots ----------
+# PLAYER_SNAPSHOT entries carry fixed-point player states under short keys.
+# A keyframe lists every player in full; other snapshots only list the
+# fields that changed since the previous snapshot of the same stream, plus
+# full entries for players entering the client's area of interest and the
+# ids of players that left it.
+POSITION_STEPS = 64    # Fixed-point steps per block
+ROTATION_STEPS = 256   # Fixed-point steps per turn (360 degrees)
+VELOCITY_STEPS = 64    # Fixed-point steps per block/s
+_SNAPSHOT_FIELDS = {   # Short key -> PlayerState attribute
+    "p": "position", "r": "rotation", "v": "velocity", "g": "on_ground", "f": "flying",
+    "s": "sprinting", "n": "name", "z": "size", "c": "is_connected", "u": "is_rtsp_user",
+}
+
+
+def quantize_player_state(player: PlayerState) -> Dict[str, Any]:
+    """Return the fixed-point snapshot entry of a player (every field)."""
+    x, y, z = player.position
+    horizontal, vertical = player.rotation
+    return {
+        "id": player.id,
+        "p": [round(x * POSITION_STEPS), round(y * POSITION_STEPS), round(z * POSITION_STEPS)],
+        "r": [round(horizontal * ROTATION_STEPS / 360) % ROTATION_STEPS,
+              round(vertical * ROTATION_STEPS / 360)],
+        "v": [round(component * VELOCITY_STEPS) for component in player.velocity],
+        "g": player.on_ground,
+        "f": player.flying,
+        "s": player.sprinting,
+        "n": player.name,
+        "z": player.size,
+        "c": player.is_connected,
+        "u": player.is_rtsp_user,
+    }
+
+
+def player_state_delta(state: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return the entry with only the fields of `state` that differ from `baseline`.
+
+    None means nothing changed; without a baseline the full entry is returned.
+    """
+    if baseline is None:
+        return state
+    delta = {key: value for key, value in state.items() if baseline.get(key) != value}
+    if not delta:
+        return None
+    delta["id"] = state["id"]
+    return delta
+
+
+def dequantize_player_state(state: Dict[str, Any]) -> PlayerState:
+    """Rebuild a PlayerState from a full snapshot entry."""
+    return _dequantize_into(PlayerState(state["id"], (0.0, 0.0, 0.0), (0.0, 0.0)), state)
+
+
+def _dequantize_into(player: PlayerState, state: Dict[str, Any]) -> PlayerState:
+    """Write the fields of a full snapshot entry into an existing player."""
+    x, y, z = state["p"]
+    horizontal, vertical = state["r"]
+    player.position = (x / POSITION_STEPS, y / POSITION_STEPS, z / POSITION_STEPS)
+    player.rotation = (horizontal * 360 / ROTATION_STEPS, vertical * 360 / ROTATION_STEPS)
+    player.velocity = [component / VELOCITY_STEPS for component in state["v"]]
+    player.on_ground = state["g"]
+    player.flying = state["f"]
+    player.sprinting = state["s"]
+    player.name = state["n"]
+    player.size = state["z"]
+    player.is_connected = state["c"]
+    player.is_rtsp_user = state["u"]
+    return player
+
+
+def encode_player_snapshot(tick: int, entries: Sequence[str], keyframe: bool = False,
+                           left: Sequence[str] = ()) -> str:
+    """JSON text of a PLAYER_SNAPSHOT whose entries are already JSON-encoded.
+
+    Same text as create_player_snapshot_message(...).to_json(), but each entry
+    is encoded once per tick and shared by every client frame it appears in.
+    """
+    return ('{"type": "player_snapshot", "data": {"tick": %d, "keyframe": %s, "players": [%s], "left": %s}, '
+            '"player_id": null}' % (tick, "true" if keyframe else "false", ", ".join(entries), json.dumps(list(left))))
+
+
+class PlayerSnapshotDecoder:
+    """Client side of PLAYER_SNAPSHOT: applies deltas to the last known entries."""
+
+    def __init__(self):
+        self.baselines: Dict[str, Dict[str, Any]] = {}
+        self.tick: Optional[int] = None
+
+    def apply(self, data: Dict[str, Any]) -> Tuple[List[PlayerState], List[str]]:
+        """Apply one snapshot; returns the players it updated and the ids that left."""
+        entries, left = self.apply_entries(data)
+        return [dequantize_player_state(entry) for entry in entries], left
+
+    def apply_entries(self, data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Apply one snapshot; returns the full entries it updated and the ids that left.
+
+        Deltas for a player without a baseline (e.g. after a lost snapshot)
+        are ignored until the next keyframe. Players missing from a keyframe
+        count as gone. The entries are the decoder's baselines: read them
+        before the next snapshot, do not keep them.
+        """
+        left = list(data.get("left", []))
+        if data.get("keyframe"):
+            listed = {entry["id"] for entry in data.get("players", [])}
+            left.extend(pid for pid in self.baselines if pid not in listed)
+            self.baselines = {}
+        for pid in left:
+            self.baselines.pop(pid, None)
+        updated = []
+        for entry in data.get("players", []):
+            baseline = self.baselines.get(entry["id"])
+            if baseline is None:
+                if len(entry) < len(_SNAPSHOT_FIELDS) + 1:
+                    continue
+                baseline = {}
+            baseline.update(entry)
+            self.baselines[entry["id"]] = baseline
+            updated.append(baseline)
+        self.tick = data.get("tick")
+        return updated, left
+
+
+# ---------- Remote player interpolation ----------
+# Clients render other players slightly in the past, between the two
+# updates that surround the render time, so movement stays smooth whatever
+# the update rate. Past the newest update the motion is extrapolated for a
+# short while, then eased back to the last known position (players that
+# stop moving are simply no longer listed in snapshots).
+INTERPOLATION_DELAY = 0.1          # Seconds behind the newest update (two 20 Hz ticks)
+INTERPOLATION_BUFFER_SIZE = 16     # Timestamped samples kept per player
+MAX_EXTRAPOLATION = 0.1            # Seconds of dead reckoning past the newest update
+_REPLICATED_FIELDS = ("position", "rotation", "velocity", "on_ground", "flying", "sprinting",
+                      "name", "size", "is_connected", "is_rtsp_user")
+
+
+class RemotePlayer(PlayerState):
+    """Another player as seen by a client, updated in place and interpolated at render time."""
+
+    def __init__(self, id: str, position: Tuple[float, float, float],
+                 rotation: Tuple[float, float], name: Optional[str] = None,
+                 is_connected: bool = True, is_rtsp_user: bool = False):
+        super().__init__(id, position, rotation, name, is_connected, is_rtsp_user)
+        self.samples = deque(maxlen=INTERPOLATION_BUFFER_SIZE)  # [(time, position, rotation)]
+
+    @classmethod
+    def from_state(cls, state: PlayerState, timestamp: Optional[float] = None) -> 'RemotePlayer':
+        """Create from a decoded state, as the first sample of its buffer."""
+        player = cls(state.id, state.position, state.rotation)
+        player.apply_state(state, timestamp)
+        return player
+
+    def apply_state(self, state: PlayerState, timestamp: Optional[float] = None):
+        """Copy a decoded state into this player and record its position at `timestamp`."""
+        for field in _REPLICATED_FIELDS:
+            setattr(self, field, getattr(state, field))
+        self._record_sample(timestamp)
+
+    def apply_entry(self, entry: Dict[str, Any], timestamp: Optional[float] = None):
+        """Dequantize a full snapshot entry into this player and record it at `timestamp`."""
+        _dequantize_into(self, entry)
+        self._record_sample(timestamp)
+
+    def apply_dict(self, data: Dict[str, Any], timestamp: Optional[float] = None):
+        """Copy a PlayerState.to_dict() payload into this player and record it at `timestamp`."""
+        self.position = tuple(data["position"])
+        self.rotation = tuple(data["rotation"])
+        self.velocity = list(data.get("velocity", (0.0, 0.0, 0.0)))
+        self.on_ground = data.get("on_ground", False)
+        self.flying = data.get("flying", False)
+        self.sprinting = data.get("sprinting", False)
+        self.name = data.get("name") or f"Player_{self.id[:8]}"
+        self.size = data.get("size", 0.5)
+        self.is_connected = data.get("is_connected", True)
+        self.is_rtsp_user = data.get("is_rtsp_user", False)
+        self._record_sample(timestamp)
+
+    def _record_sample(self, timestamp: Optional[float]):
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self.samples and timestamp <= self.samples[-1][0]:
+            self.samples.pop()  # Same instant: the newest state wins
+        self.samples.append((timestamp, tuple(self.position), tuple(self.rotation)))
+
+    def sample(self, now: Optional[float] = None) -> Tuple[Tuple[float, float, float], Tuple[float, float]]:
+        """Return the (position, rotation) to render at `now` (monotonic seconds)."""
+        if not self.samples:
+            return self.position, self.rotation
+        render_time = (time.monotonic() if now is None else now) - INTERPOLATION_DELAY
+        samples = self.samples
+        if render_time <= samples[0][0] or len(samples) == 1:
+            _, position, rotation = samples[0] if render_time <= samples[0][0] else samples[-1]
+            return position, rotation
+
+        if render_time >= samples[-1][0]:
+            (t0, p0, r0), (t1, p1, r1) = samples[-2], samples[-1]
+            ahead = render_time - t1
+            if ahead >= 2 * MAX_EXTRAPOLATION:
+                return p1, r1
+            ahead = ahead if ahead <= MAX_EXTRAPOLATION else 2 * MAX_EXTRAPOLATION - ahead
+            fraction = 1.0 + ahead / (t1 - t0)
+        else:
+            index = len(samples) - 1
+            while samples[index - 1][0] > render_time:
+                index -= 1
+            (t0, p0, r0), (t1, p1, r1) = samples[index - 1], samples[index]
+            fraction = (render_time - t0) / (t1 - t0)
+
+        position = tuple(a + (b - a) * fraction for a, b in zip(p0, p1))
+        yaw_step = (r1[0] - r0[0] + 180) % 360 - 180  # Turn the short way round
+        rotation = ((r0[0] + yaw_step * fraction) % 360, r0[1] + (r1[1] - r0[1]) * fraction)
+        return position, rotation
+
+    def get_render_position(self, now: Optional[float] = None) -> Tuple[float, float, float]:
+        """Get the interpolated position for rendering (bottom touching the surface)."""
+        x, y, z = self.sample(now)[0]
+        return (x, y + self.size, z)
+
+
+# ---------- Binary chunk frames ----------
+# Negotiated at PLAYER_JOIN: the client lists the encodings it decodes, the
+# server answers with the one it picked in WORLD_INIT ("json" if unspecified).
+CHUNK_ENCODINGS = ("binary", "json")
+CHUNK_FRAME_MAGIC = b"CVCK"
+CHUNK_FRAME_VERSION = 2
+# magic, frame format version, cx, cz, chunk version, size, height, palette length
+_CHUNK_FRAME_HEADER = struct.Struct("<4sBiiQBHB")
+_CHUNK_FRAME_RUNS = struct.Struct("<I")
+
+
+def encode_chunk_frame(chunk_x: int, chunk_z: int, codes: np.ndarray,
+                       palette: Sequence[Optional[str]], version: int = 0) -> bytes:
+    """Encode a uint8[x, y, z] chunk of palette codes as a binary WORLD_CHUNK frame.
+
+    Layout: header, a palette of the block types present (entry 0 is air),
+    then run-length-encoded columns: every (x, z) column is cut into runs of
+    equal blocks along y, stored as one palette index byte per run followed
+    by one (length - 1) byte per run. Runs never span two columns or more
+    than 256 blocks.
+    """
+    size, height, _ = codes.shape
+    columns = np.ascontiguousarray(codes.transpose(0, 2, 1)).reshape(-1)
+    present = np.unique(columns)
+    present = present[present != 0]
+    local = np.zeros(256, dtype=np.uint8)
+    local[present] = np.arange(1, len(present) + 1)
+    names = [palette[code].encode() for code in present.tolist()]
+
+    starts = np.ones(len(columns), dtype=bool)
+    starts[1:] = columns[1:] != columns[:-1]
+    if height <= 256:
+        starts[::height] = True  # Every column starts a run
+    else:
+        starts[np.arange(len(columns)) % height % 256 == 0] = True  # ... and so does every 256th block
+    offsets = np.flatnonzero(starts)
+    lengths = np.diff(np.append(offsets, len(columns))) - 1
+
+    parts = [_CHUNK_FRAME_HEADER.pack(CHUNK_FRAME_MAGIC, CHUNK_FRAME_VERSION, chunk_x, chunk_z,
+                                      version, size, height, len(names))]
+    parts.extend(bytes([len(name)]) + name for name in names)
+    parts.append(_CHUNK_FRAME_RUNS.pack(len(offsets)))
+    parts.append(local[columns[offsets]].tobytes())
+    parts.append(lengths.astype(np.uint8).tobytes())
+    return b"".join(parts)
+
+
+def is_chunk_frame(frame) -> bool:
+    """Return True for a binary WORLD_CHUNK frame."""
+    return isinstance(frame, (bytes, bytearray)) and frame[:4] == CHUNK_FRAME_MAGIC
+
+
+def decode_chunk_frame(frame: bytes) -> Dict[str, Any]:
+    """Decode a binary WORLD_CHUNK frame into chunk data.
+
+    Returns {"chunk_x", "chunk_z", "version", "positions": list of N (x, y, z)
+    world coordinates, "block_types": list of N block type names}.
+    """
+    magic, frame_version, chunk_x, chunk_z, version, size, height, palette_length = \
+        _CHUNK_FRAME_HEADER.unpack_from(frame, 0)
+    if magic != CHUNK_FRAME_MAGIC or frame_version != CHUNK_FRAME_VERSION:
+        raise ValueError(f"Not a version {CHUNK_FRAME_VERSION} chunk frame")
+    offset = _CHUNK_FRAME_HEADER.size
+    palette = [None]
+    for _ in range(palette_length):
+        length = frame[offset]
+        palette.append(bytes(frame[offset + 1:offset + 1 + length]).decode())
+        offset += 1 + length
+    (runs,) = _CHUNK_FRAME_RUNS.unpack_from(frame, offset)
+    offset += _CHUNK_FRAME_RUNS.size
+    values = np.frombuffer(frame, dtype=np.uint8, count=runs, offset=offset)
+    lengths = np.frombuffer(frame, dtype=np.uint8, count=runs, offset=offset + runs).astype(np.int64) + 1
+
+    columns = np.repeat(values, lengths).reshape(size, size, height)  # [x, z, y]
+    xs, zs, ys = np.nonzero(columns)
+    codes = columns[xs, zs, ys]
+    positions = list(zip((xs + chunk_x * size).tolist(), ys.tolist(), (zs + chunk_z * size).tolist()))
+    names = np.array(palette, dtype=object)
+    return {"chunk_x": chunk_x, "chunk_z": chunk_z, "version": version,
+            "positions": positions, "block_types": names[codes].tolist()}
+
+
+# ---------- Compressed frames ----------
+# Clients that list "zlib" under "compression" at PLAYER_JOIN may receive any
+# frame (text or binary) wrapped in a zlib envelope: magic, one byte saying
+# whether the inner frame is text (0) or binary (1), then the zlib stream.
+COMPRESSIONS = ("zlib",)
+COMPRESSED_FRAME_MAGIC = b"CVZ1"
+
+
+def compress_frame(frame: Union[str, bytes], level: int = 6) -> bytes:
+    """Wrap a text or binary frame in a zlib envelope."""
+    if isinstance(frame, str):
+        return COMPRESSED_FRAME_MAGIC + b"\x00" + zlib.compress(frame.encode(), level)
+    return COMPRESSED_FRAME_MAGIC + b"\x01" + zlib.compress(frame, level)
+
+
+def is_compressed_frame(frame) -> bool:
+    """Return True for a zlib envelope."""
+    return isinstance(frame, (bytes, bytearray)) and frame[:4] == COMPRESSED_FRAME_MAGIC
+
+
+def decompress_frame(frame: bytes) -> Union[str, bytes]:
+    """Unwrap a zlib envelope back into the original text or binary frame."""
+    data = zlib.decompress(frame[5:])
+    return data.decode() if frame[4] == 0 else data
+
+
+# ---------- Binary message codec ----------
+# Negotiated at PLAYER_JOIN like chunk encodings: the client lists the codecs
+# it speaks under "message_codecs", the server answers with the one it picked
+# in WORLD_INIT ("json" if unspecified). With "binary", the message types
+# that have a layout below travel as binary frames: a one-byte type tag, a
+# fixed struct layout, length-prefixed UTF-8 strings, then Message.player_id.
+# Other types, and data that doesn't fit its layout exactly, stay JSON text,
+# so a decoded frame always equals Message.from_json(message.to_json()).
+MESSAGE_CODECS = ("binary", "json")
+_STRING_LENGTH = struct.Struct("<H")
+_NO_STRING = 0xFFFF  # Length marking None
+_BINARY_LAYOUTS: Dict[MessageType, Tuple[int, Any]] = {}  # Type -> (tag, encode)
+_BINARY_TAGS: Dict[int, Tuple[MessageType, Any]] = {}     # Tag -> (type, decode)
+
+
+def register_binary_layout(message_type: MessageType, tag: int, encode, decode):
+    """Give a message type a binary layout.
+
+    `encode(data) -> bytes` raises ValueError (or TypeError/KeyError) for data
+    it cannot represent exactly; `decode(frame, offset) -> (data, offset)`
+    reads it back. Tags stay below 0x40 so binary messages can't be mistaken
+    for chunk frames or zlib envelopes.
+    """
+    if not 0 < tag < 0x40 or tag in _BINARY_TAGS:
+        raise ValueError(f"Binary message tag {tag} is out of range or taken")
+    _BINARY_LAYOUTS[message_type] = (tag, encode)
+    _BINARY_TAGS[tag] = (message_type, decode)
+
+
+def encode_message(message: Message, codec: str = "json") -> Union[str, bytes]:
+    """Encode a message with a negotiated codec (binary frame, or JSON text as the fallback)."""
+    if codec == "binary" and message.type in _BINARY_LAYOUTS:
+        tag, encode = _BINARY_LAYOUTS[message.type]
+        try:
+            return bytes((tag,)) + encode(message.data) + _pack_string(message.player_id)
+        except (ValueError, TypeError, KeyError, struct.error):
+            pass
+    return message.to_json()
+
+
+def is_message_frame(frame) -> bool:
+    """Return True for a binary message frame."""
+    return isinstance(frame, (bytes, bytearray)) and len(frame) > 0 and frame[0] in _BINARY_TAGS
+
+
+def decode_message(frame: Union[str, bytes]) -> Message:
+    """Decode a text (JSON) or binary message frame."""
+    if isinstance(frame, str):
+        return Message.from_json(frame)
+    if not is_message_frame(frame):
+        raise ValueError("Not a message frame")
+    message_type, decode = _BINARY_TAGS[frame[0]]
+    try:
+        data, offset = decode(frame, 1)
+        player_id, offset = _unpack_string(frame, offset)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed {message_type.value} frame: {e}")
+    if offset != len(frame):
+        raise ValueError(f"Malformed {message_type.value} frame: {len(frame) - offset} trailing bytes")
+    return Message(message_type, data, player_id)
+
+
+def _pack_string(value: Optional[str]) -> bytes:
+    if value is None:
+        return _STRING_LENGTH.pack(_NO_STRING)
+    if not isinstance(value, str):
+        raise TypeError("Expected a string")
+    raw = value.encode()
+    if len(raw) >= _NO_STRING:
+        raise ValueError("String too long for a binary frame")
+    return _STRING_LENGTH.pack(len(raw)) + raw
+
+
+def _unpack_string(frame: bytes, offset: int) -> Tuple[Optional[str], int]:
+    (length,) = _STRING_LENGTH.unpack_from(frame, offset)
+    offset += _STRING_LENGTH.size
+    if length == _NO_STRING:
+        return None, offset
+    if offset + length > len(frame):
+        raise struct.error("string runs past the end of the frame")
+    return bytes(frame[offset:offset + length]).decode(), offset + length
+
+
+def _check_keys(data: Dict[str, Any], required: Sequence[str], optional: Sequence[str] = ()):
+    keys = set(data)
+    if not keys.issuperset(required) or not keys.issubset((*required, *optional)):
+        raise ValueError("Data doesn't match the binary layout")
+
+
+def _numbers(values, count: int) -> Sequence[float]:
+    """Return `count` numbers (JSON keeps ints and floats apart, a double holds both)."""
+    if (not isinstance(values, (list, tuple)) or len(values) != count
+            or not all(type(value) in (int, float) for value in values)):
+        raise ValueError(f"Expected {count} numbers")
+    return values
+
+
+def _integers(values, count: int) -> Sequence[int]:
+    if not isinstance(values, (list, tuple)) or len(values) != count or not all(type(value) is int for value in values):
+        raise ValueError(f"Expected {count} integers")
+    return values
+
+
+def _flags(*values: bool) -> int:
+    if not all(type(value) is bool for value in values):
+        raise ValueError("Expected booleans")
+    return sum(1 << bit for bit, value in enumerate(values) if value)
+
+
+def _unflag(flags: int, count: int) -> List[bool]:
+    return [bool(flags >> bit & 1) for bit in range(count)]
+
+
+# PLAYER_MOVE: flags (has seq), position, rotation [, seq]
+_MOVE = struct.Struct("<B5d")
+_MOVE_SEQ = struct.Struct("<I")
+
+
+def _encode_move(data: Dict[str, Any]) -> bytes:
+    _check_keys(data, ("position", "rotation"), ("seq",))
+    seq = data.get("seq")
+    frame = _MOVE.pack(seq is not None, *_numbers(data["position"], 3), *_numbers(data["rotation"], 2))
+    if seq is None:
+        return frame
+    if type(seq) is not int:
+        raise ValueError("Expected an integer seq")
+    return frame + _MOVE_SEQ.pack(seq)
+
+
+def _decode_move(frame: bytes, offset: int) -> Tuple[Dict[str, Any], int]:
+    has_seq, *values = _MOVE.unpack_from(frame, offset)
+    offset += _MOVE.size
+    data = {"position": values[:3], "rotation": values[3:]}
+    if has_seq:
+        (data["seq"],) = _MOVE_SEQ.unpack_from(frame, offset)
+        offset += _MOVE_SEQ.size
+    return data, offset
+
+
+# PLAYER_UPDATE (PlayerState.to_dict): flags, position, rotation, velocity, size, id, name
+_PLAYER = struct.Struct("<B9d")
+_PLAYER_FLAGS = ("flying", "sprinting", "on_ground", "is_connected", "is_rtsp_user")
+
+
+def _encode_player(data: Dict[str, Any]) -> bytes:
+    _check_keys(data, ("id", "position", "rotation", "velocity", "size", "name") + _PLAYER_FLAGS)
+    return (_PLAYER.pack(_flags(*(data[key] for key in _PLAYER_FLAGS)), *_numbers(data["position"], 3),
+                         *_numbers(data["rotation"], 2), *_numbers(data["velocity"], 3),
+                         *_numbers([data["size"]], 1))
+            + _pack_string(data["id"]) + _pack_string(data["name"]))
+
+
+def _decode_player(frame: bytes, offset: int) -> Tuple[Dict[str, Any], int]:
+    flags, *values = _PLAYER.unpack_from(frame, offset)
+    player_id, offset = _unpack_string(frame, offset + _PLAYER.size)
+    name, offset = _unpack_string(frame, offset)
+    data = {"id": player_id, "position": values[:3], "rotation": values[3:5], "name": name,
+            "velocity": values[5:8], "size": values[8]}
+    data.update(zip(_PLAYER_FLAGS, _unflag(flags, len(_PLAYER_FLAGS))))
+    return data, offset
+
+
+# BLOCK_PLACE / BLOCK_DESTROY: position [, block type]
+_BLOCK_POSITION = struct.Struct("<3i")
+
+
+def _encode_block_place(data: Dict[str, Any]) -> bytes:
+    _check_keys(data, ("position", "block_type"))
+    return _BLOCK_POSITION.pack(*_integers(data["position"], 3)) + _pack_string(data["block_type"])
+
+
+def _decode_block_place(frame: bytes, offset: int) -> Tuple[Dict[str, Any], int]:
+    position = list(_BLOCK_POSITION.unpack_from(frame, offset))
+    block_type, offset = _unpack_string(frame, offset + _BLOCK_POSITION.size)
+    return {"position": position, "block_type": block_type}, offset
+
+
+def _encode_block_destroy(data: Dict[str, Any]) -> bytes:
+    _check_keys(data, ("position",))
+    return _BLOCK_POSITION.pack(*_integers(data["position"], 3))
+
+
+def _decode_block_destroy(frame: bytes, offset: int) -> Tuple[Dict[str, Any], int]:
+    return {"position": list(_BLOCK_POSITION.unpack_from(frame, offset))}, offset + _BLOCK_POSITION.size
+
+
+# WORLD_UPDATE (BlockUpdate.to_dict list), column by column: count, every
+# position, a table of the distinct block types and player ids, then two
+# table indices per block. Each column is one struct call whatever the count.
+_BLOCK_COUNT = struct.Struct("<IH")  # Blocks, table strings
+_WORLD_UPDATE_KEYS = {"position", "block_type", "player_id"}
+
+
+def _encode_world_update(data: Dict[str, Any]) -> bytes:
+    _check_keys(data, ("blocks",))
+    blocks = data["blocks"]
+    positions: List[int] = []
+    table: Dict[Optional[str], int] = {}
+    indices: List[int] = []
+    for block in blocks:
+        if block.keys() != _WORLD_UPDATE_KEYS or len(block["position"]) != 3:
+            raise ValueError("Data doesn't match the binary layout")
+        positions.extend(block["position"])
+        indices.append(table.setdefault(block["block_type"], len(table)))
+        indices.append(table.setdefault(block["player_id"], len(table)))
+    if not all(type(value) is int for value in positions):
+        raise ValueError("Expected integer positions")
+    return b"".join([_BLOCK_COUNT.pack(len(blocks), len(table)),
+                     struct.pack(f"<{len(positions)}i", *positions),
+                     *(_pack_string(value) for value in table),
+                     struct.pack(f"<{len(indices)}H", *indices)])
+
+
+def _decode_world_update(frame: bytes, offset: int) -> Tuple[Dict[str, Any], int]:
+    count, table_size = _BLOCK_COUNT.unpack_from(frame, offset)
+    offset += _BLOCK_COUNT.size
+    positions = struct.unpack_from(f"<{3 * count}i", frame, offset)
+    offset += 12 * count
+    table = []
+    for _ in range(table_size):
+        value, offset = _unpack_string(frame, offset)
+        table.append(value)
+    indices = struct.unpack_from(f"<{2 * count}H", frame, offset)
+    offset += 4 * count
+    try:
+        blocks = [{"position": list(positions[3 * n:3 * n + 3]), "block_type": table[indices[2 * n]],
+                   "player_id": table[indices[2 * n + 1]]} for n in range(count)]
+    except IndexError:
+        raise struct.error("string index out of the table")
+    return {"blocks": blocks}, offset
+
+
+# MOVE_ACK: flags (has correction, on_ground), seq [, position, velocity]
+_MOVE_ACK = struct.Struct("<BI")
+_CORRECTION = struct.Struct("<6d")
+
+
+def _encode_move_ack(data: Dict[str, Any]) -> bytes:
+    _check_keys(data, ("seq",), ("position", "velocity", "on_ground"))
+    if type(data["seq"]) is not int:
+        raise ValueError("Expected an integer seq")
+    if len(data) == 1:
+        return _MOVE_ACK.pack(0, data["seq"])
+    _check_keys(data, ("seq", "position", "velocity", "on_ground"))
+    return (_MOVE_ACK.pack(_flags(True, data["on_ground"]), data["seq"])
+            + _CORRECTION.pack(*_numbers(data["position"], 3), *_numbers(data["velocity"], 3)))
+
+
+def _decode_move_ack(frame: bytes, offset: int) -> Tuple[Dict[str, Any], int]:
+    flags, seq = _MOVE_ACK.unpack_from(frame, offset)
+    offset += _MOVE_ACK.size
+    data = {"seq": seq}
+    correction, on_ground = _unflag(flags, 2)
+    if correction:
+        values = _CORRECTION.unpack_from(frame, offset)
+        offset += _CORRECTION.size
+        data.update(position=list(values[:3]), velocity=list(values[3:]), on_ground=on_ground)
+    return data, offset
+
+
+register_binary_layout(MessageType.PLAYER_MOVE, 0x01, _encode_move, _decode_move)
+register_binary_layout(MessageType.PLAYER_UPDATE, 0x02, _encode_player, _decode_player)
+register_binary_layout(MessageType.BLOCK_PLACE, 0x03, _encode_block_place, _decode_block_place)
+register_binary_layout(MessageType.BLOCK_DESTROY, 0x04, _encode_block_destroy, _decode_block_destroy)
+register_binary_layout(MessageType.WORLD_UPDATE, 0x05, _encode_world_update, _decode_world_update)
+register_binary_layout(MessageType.MOVE_ACK, 0x06, _encode_move_ack, _decode_move_ack)
+
+
 class BlockUpdate:
     """Represents a block change in the world."""
 
@@ -680,17 +1339,49 @@ class BlockUpdate:
         """Create from dictionary."""
         return cls(tuple(data["position"]), data["block_type"], data.get("player_id"))
 
-def create_player_join_message(player_name: str) -> Message:
-    """Create a player join message."""
-    return Message(MessageType.PLAYER_JOIN, {"name": player_name})
+def create_player_join_message(player_name: str,
+                               chunk_encodings: Sequence[str] = CHUNK_ENCODINGS,
+                               compression: Sequence[str] = COMPRESSIONS,
+                               message_codecs: Sequence[str] = MESSAGE_CODECS,
+                               known_chunks: Optional[Dict[Tuple[int, int], int]] = None,
+                               world_epoch: Optional[str] = None) -> Message:
+    """Create a player join message, listing the chunk encodings, compressions and message codecs the client decodes.
+
+    A reconnecting client also lists the chunks it still holds with their
+    versions, and the world_epoch of the WORLD_INIT they came with, so the
+    server only sends what changed since.
+    """
+    data = {"name": player_name,
+            "chunk_encodings": list(chunk_encodings),
+            "compression": list(compression),
+            "message_codecs": list(message_codecs)}
+    if known_chunks:
+        data["known_chunks"] = {"epoch": world_epoch,
+                                "chunks": [[cx, cz, version] for (cx, cz), version in known_chunks.items()]}
+    return Message(MessageType.PLAYER_JOIN, data)
 
 def create_player_move_message(position: Tuple[float, float, float],
-                             rotation: Tuple[float, float]) -> Message:
-    """Create a player movement message with absolute position updates."""
-    return Message(MessageType.PLAYER_MOVE, {
+                             rotation: Tuple[float, float], seq: Optional[int] = None) -> Message:
+    """Create a player movement message with absolute position updates.
+
+    Moves with a sequence number are acknowledged with MOVE_ACK.
+    """
+    data = {
         "position": position,
         "rotation": rotation
-    })
+    }
+    if seq is not None:
+        data["seq"] = seq
+    return Message(MessageType.PLAYER_MOVE, data)
+
+def create_move_ack_message(seq: int, correction: Optional[PlayerState] = None) -> Message:
+    """Acknowledge moves up to seq; with a correction, the move was refused and
+    the client must restart from the player's authoritative state."""
+    data = {"seq": seq}
+    if correction is not None:
+        data.update(position=correction.position, velocity=correction.velocity,
+                    on_ground=correction.on_ground)
+    return Message(MessageType.MOVE_ACK, data)
 
 def create_block_place_message(position: Tuple[int, int, int], block_type: str) -> Message:
     """Create a block placement message."""
@@ -717,6 +1408,21 @@ def create_world_chunk_message(chunk_data: Dict[str, Any]) -> Message:
     """Create a world chunk message for streaming world data."""
     return Message(MessageType.WORLD_CHUNK, chunk_data)
 
+def create_chunk_unload_message(chunks: List[Tuple[int, int]]) -> Message:
+    """Create a message telling a client to drop chunks outside its view radius."""
+    return Message(MessageType.CHUNK_UNLOAD, {"chunks": [[cx, cz] for cx, cz in chunks]})
+
+def create_chunk_delta_message(chunk_x: int, chunk_z: int, version: int,
+                               edits: Sequence[Tuple[Tuple[int, int, int], str]]) -> Message:
+    """Create a message bringing a chunk a client still holds up to `version`.
+
+    Edits are (position, block type) in order, "air" for removed blocks.
+    """
+    return Message(MessageType.CHUNK_DELTA, {
+        "chunk_x": chunk_x, "chunk_z": chunk_z, "version": version,
+        "blocks": [{"position": list(position), "block_type": block_type} for position, block_type in edits]
+    })
+
 def create_world_update_message(blocks: List[BlockUpdate]) -> Message:
     """Create a world update message with multiple block changes."""
     return Message(MessageType.WORLD_UPDATE, {
@@ -727,6 +1433,16 @@ def create_player_update_message(player: PlayerState) -> Message:
     """Create a player update message."""
     return Message(MessageType.PLAYER_UPDATE, player.to_dict())
 
+def create_player_snapshot_message(tick: int, entries: List[Dict[str, Any]], keyframe: bool = False,
+                                   left: Sequence[str] = ()) -> Message:
+    """Create a per-tick player snapshot from quantized entries (see quantize_player_state)."""
+    return Message(MessageType.PLAYER_SNAPSHOT, {
+        "tick": tick,
+        "keyframe": keyframe,
+        "players": entries,
+        "left": list(left)
+    })
+
 def create_player_list_message(players: List[PlayerState]) -> Message:
     """Create a player list message."""
     import logging
@@ -3,20 +3,28 @@ Minecraft Server - Server-side game world and client connections
 """
 
 import asyncio
+import gc
+import json
 import logging
-import random
+import os
 import time
 import uuid
 import websockets
-from typing import Dict, Tuple, Optional, List, Any
+import websockets.exceptions
+from collections import deque
+import numpy as np
+from typing import Dict, Iterable, Iterator, Tuple, Optional, List, Set, Any
 
-from noise_gen import NoiseGen
 from protocol import (
-    MessageType, BlockType, Message, PlayerState, BlockUpdate, Cube,
+    MessageType, BlockType, BlockRecord, Message, PlayerState, BlockUpdate, Cube,
     create_world_init_message, create_world_chunk_message, 
-    create_world_update_message, create_player_list_message,
-    create_player_update_message, create_cameras_list_message,
-    create_users_list_message, create_blocks_list_message
+    create_world_update_message, create_player_list_message, create_chunk_unload_message,
+    create_chunk_delta_message,
+    create_player_update_message, create_move_ack_message,
+    create_cameras_list_message,
+    quantize_player_state, player_state_delta, encode_player_snapshot,
+    create_users_list_message, create_blocks_list_message,
+    CHUNK_ENCODINGS, encode_chunk_frame, compress_frame, MESSAGE_CODECS, encode_message, decode_message
 )
 from minecraft_physics import (
     MinecraftCollisionDetector, MinecraftPhysics,
@@ -24,6 +32,14 @@ from minecraft_physics import (
     unified_check_collision, unified_check_player_collision
 )
 from cube_manager import cube_manager
+from world_storage import (
+    ChunkedVoxelStore, RegionStore, BLOCK_CODES, BLOCK_PALETTE, CHUNK_SIZE, WORLD_HEIGHT, TRANSIENT_CODE,
+    save_snapshot, load_snapshot
+)
+from world_gen import generate_chunk, generate_chunks
+from world_journal import (
+    BlockJournal, FSYNC_POLICIES, DEFAULT_FSYNC_POLICY
+)
 # from user_manager import user_manager, CameraUser  # Removed as per IMPLEMENTATION_SUMMARY.md
 
 # ---------- Constants ----------
@@ -31,14 +47,37 @@ SECTOR_SIZE = 16
 WORLD_SIZE = 128
 DEFAULT_CHUNK_SIZE = 16
 DEFAULT_SPAWN_POSITION = (64, 100, 64)  # High spawn position for gravity testing
-WATER_LEVEL = 15
-GRASS_LEVEL = 18
+STORAGE_BACKENDS = ("dict", "voxel")  # GameWorld block storage engines
+WORLD_SEED = 452692
+WORLD_GENERATOR_VERSION = 2  # Bump whenever generated terrain changes (invalidates world caches)
+SPAWN_CHUNK_RADIUS = 2  # Chunks around spawn generated at startup; voxel worlds generate the rest on demand
+DEFAULT_GENERATION_WORKERS = min(4, os.cpu_count() or 1)  # Processes generating chunks in bulk
+OUTBOX_OVERFLOW_POLICIES = ("disconnect", "drop")  # What happens when a client's outbound queue is full
+DEFAULT_OUTBOX_SIZE = 1024  # Frames queued per client before the overflow policy applies
+DEFAULT_VIEW_RADIUS = 6  # Chunks streamed around each player (square radius); farther ones are unloaded
+JOURNAL_COMPACT_CHECK_INTERVAL = 30.0  # Seconds between checks for block journal compaction
+RESIDENCY_PIN_RADIUS = 2  # Chunks around each player kept resident under a chunk memory budget
+CHUNK_PAYLOAD_CACHE_SIZE = 4096  # Encoded WORLD_CHUNK frames kept by the server (least recently used dropped)
+CHUNK_EDIT_LOG_SIZE = 256  # Recent edits kept per chunk to resync reconnecting clients with a CHUNK_DELTA
+# Large, compressible payloads sent zlib-compressed to clients that support it;
+# frequent small ones (PLAYER_UPDATE at 20 Hz...) are never worth the CPU
+COMPRESSED_MESSAGE_TYPES = frozenset({
+    MessageType.WORLD_CHUNK, MessageType.BLOCKS_LIST, MessageType.PLAYER_LIST,
+    MessageType.CAMERAS_LIST, MessageType.USERS_LIST, MessageType.PLAYER_SNAPSHOT, MessageType.CHUNK_DELTA,
+})
+DEFAULT_COMPRESSION_THRESHOLD = 1024  # Bytes; smaller frames are sent as they are
+DEFAULT_COMPRESSION_LEVEL = 6         # zlib level, 0 disables compression
 
 # Physics constants - use standard Minecraft values
 STANDARD_GRAVITY = GRAVITY
 STANDARD_TERMINAL_VELOCITY = TERMINAL_VELOCITY
 STANDARD_PLAYER_HEIGHT = PLAYER_HEIGHT
 PHYSICS_TICK_RATE = 20  # Updates per second
+SNAPSHOT_KEYFRAME_INTERVAL = 100  # Ticks between full PLAYER_SNAPSHOT keyframes (5 s)
+MOVE_SWEEP_STEP = 0.5   # Blocks between collision samples along a move
+MOVE_SWEEP_START = 1.5  # Blocks from the start of a move before sampling begins
+DEFAULT_INTEREST_RADIUS = 96  # Blocks (the default view radius); players farther apart don't see each other's moves
+INTEREST_HYSTERESIS = 8       # Extra blocks before a player in view is reported as gone
 
 # Water collision configuration
 # When True, water blocks are solid (players walk on top of water)
@@ -97,18 +136,26 @@ def normalize(position: Tuple[float, float, float]) -> Tuple[int, int, int]:
     return int(round(x)), int(round(y)), int(round(z))
 
 
+FACES = ((0, 1, 0), (0, -1, 0), (-1, 0, 0), (1, 0, 0), (0, 0, 1), (0, 0, -1))
+
+
+def _solid(codes: np.ndarray) -> np.ndarray:
+    """Return which palette codes are terrain (not empty, not a player block)."""
+    return (codes != 0) & (codes != TRANSIENT_CODE)
+
+
 def sectorize(position: Tuple[float, float, float]) -> Tuple[int, int, int]:
     """Convert position to sector coordinates for spatial indexing."""
     x, y, z = normalize(position)
     return x // SECTOR_SIZE, 0, z // SECTOR_SIZE
 
 
-def validate_position(position: Tuple[float, float, float]) -> bool:
-    """Validate that position is within world bounds."""
+def validate_position(position: Tuple[float, float, float], world_size: Optional[int] = WORLD_SIZE) -> bool:
+    """Validate that position is within world bounds (world_size None: unbounded in X and Z)."""
     x, y, z = position
-    return (0 <= x < WORLD_SIZE and 
-            y >= 0 and y < 256 and  # Allow Y starting from 0
-            0 <= z < WORLD_SIZE)
+    if not (y >= 0 and y < 256):  # Allow Y starting from 0
+        return False
+    return world_size is None or (0 <= x < world_size and 0 <= z < world_size)
 
 
 def validate_block_type(block_type: str) -> bool:
@@ -136,105 +183,127 @@ def get_block_collision(block_type: str) -> bool:
     return True
 
 
-def create_block_data(block_type: str, block_id: Optional[str] = None, owner: Optional[str] = None) -> Dict[str, Any]:
-    """Create block data dictionary with all required attributes.
+def create_block_data(block_type: str, block_id: Optional[str] = None, owner: Optional[str] = None) -> BlockRecord:
+    """Create the block record for a block with all required attributes.
+    
+    Blocks without block_id/owner share one interned record per type; camera
+    and user blocks get a record of their own.
     
     Args:
         block_type: Type of block (grass, camera, etc.)
         block_id: Unique identifier for camera and user blocks
         owner: Player ID who placed the block (for camera blocks)
     """
-    return {
-        "type": block_type,
-        "collision": get_block_collision(block_type),
-        "block_id": block_id,  # Only populated for camera and user types
-        "owner": owner  # Only populated for camera blocks to track who placed it
-    }
+    if block_id is None and owner is None:
+        return BlockRecord.shared(block_type, get_block_collision(block_type))
+    return BlockRecord(block_type, get_block_collision(block_type), block_id, owner)
+
+
+def world_cache_path(cache_dir: str, seed: int = WORLD_SEED, world_size: Optional[int] = WORLD_SIZE) -> str:
+    """Return the snapshot file for a seed, world size and generator version."""
+    size = world_size if world_size is not None else "inf"
+    return os.path.join(cache_dir, f"world_s{seed}_n{size}_g{WORLD_GENERATOR_VERSION}.npz")
+
+
+def migrate_block_format(world_blocks) -> int:
+    """Convert legacy block values (type strings or dicts) to block records in place.
+    
+    Returns the number of converted blocks. Run once on worlds built outside
+    GameWorld; GameWorld itself only ever stores BlockRecord values.
+    """
+    migrated = 0
+    for position, block_data in list(world_blocks.items()):
+        if isinstance(block_data, BlockRecord):
+            continue
+        if isinstance(block_data, dict):
+            record = create_block_data(block_data.get("type"), block_data.get("block_id"), block_data.get("owner"))
+        else:
+            record = create_block_data(block_data)
+        world_blocks[position] = record
+        migrated += 1
+    return migrated
 
 # ---------- Game World ----------
 
 class GameWorld:
     """Game world management with spatial indexing and validation."""
     
-    def __init__(self, reset_to_natural: bool = False):
-        self.world = {}       # position -> block data dict {type, collision, block_id}
-        self.sectors = {}     # sector -> list of positions
+    def __init__(self, reset_to_natural: bool = False, storage: str = "dict",
+                 world_cache: Optional[str] = None, journal: Optional[BlockJournal] = None,
+                 region_dir: Optional[str] = None, chunk_memory_mb: Optional[float] = None,
+                 world_size: Optional[int] = WORLD_SIZE,
+                 generation_workers: Optional[int] = DEFAULT_GENERATION_WORKERS):
+        if storage not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown world storage backend: {storage}")
+        if not world_size and storage != "voxel":
+            raise ValueError("An unbounded world requires the voxel storage backend")
+        if region_dir and storage != "voxel":
+            raise ValueError("Region files require the voxel storage backend")
+        if chunk_memory_mb is not None and not region_dir:
+            raise ValueError("A chunk memory budget requires region files")
+        if world_cache and storage != "voxel":
+            raise ValueError("A world cache requires the voxel storage backend")
+        self.storage = storage
+        self.world_size = world_size or None  # None: unbounded in X and Z
+        self.generation_workers = generation_workers  # Processes for bulk generation (None/0: all CPUs)
+        if storage == "voxel":
+            # Dense per-chunk arrays; the store doubles as its own chunk index.
+            # Chunks are generated the first time a lookup touches them; with region
+            # files they stay on disk until then, and a memory budget evicts the
+            # least recently used ones.
+            world_key = (WORLD_SEED, WORLD_GENERATOR_VERSION, world_size or 0)
+            regions = RegionStore(region_dir, world_key=world_key) if region_dir else None
+            budget = int(chunk_memory_mb * 1024 * 1024) if chunk_memory_mb is not None else None
+            self.world = ChunkedVoxelStore(create_block_data, regions=regions, memory_budget=budget,
+                                           generator=self._generate_chunk, on_load=self._chunk_loaded)
+            self.sectors = self.world.sectors
+        else:
+            self.world = {}       # position -> BlockRecord {type, collision, block_id, owner}
+            self.sectors = {}     # sector (== chunk) -> set of positions, maintained incrementally
         self.block_id_map = {}  # block_id -> position (for camera and user blocks)
-        self._initialize_world()
+        self.chunk_versions = {}  # (cx, cz) -> version of its last edit
+        self.exposed = {}         # (cx, cz) -> positions with a face open to air, for chunks computed so far
+        self.exposure_waiting = {}  # (cx, cz) not in memory -> chunks whose exposed set counted it as empty
+        self._version_clock = 0   # Source of chunk versions, only ever increases
+        self._base_version = 0    # Version of every chunk since the last bulk load
+        self.epoch = uuid.uuid4().hex  # Versions handed out by another world (or server run) mean nothing here
+        self.chunk_edits = {}     # (cx, cz) -> recent (version, position, block type) edits, oldest first
+        self.chunk_edit_floors = {}  # (cx, cz) -> version of the newest edit dropped from its log
+        self.journal = None     # BlockJournal recording player edits, attached once restored
+        if journal is not None and os.path.exists(journal.snapshot_path):
+            pass  # The journal snapshot already holds the whole world
+        elif len(self.world):
+            self._rebuild_block_id_map()  # Chunks come lazily from the region files
+        elif world_cache:
+            self._load_or_generate_world(world_cache)
+        else:
+            self._initialize_world()
+        if journal is not None:
+            journal.restore(self)
+            self.journal = journal
         
         # Reset to natural terrain if requested
         if reset_to_natural:
             self.reset_to_natural_terrain()
+        self.flush()
 
     def _initialize_world(self):
-        """Initialize world with enhanced terrain generation including water, sand, grass, stone, and trees."""
+        """Initialize world with enhanced terrain generation including water, sand, grass, stone, and trees.
+
+        Chunks come from world_gen.generate_chunk, closest to spawn first and
+        spread over `generation_workers` processes. Voxel storage only generates
+        the spawn area here and every other chunk the first time something
+        touches it; dict storage generates the whole (bounded) world.
+        """
         logging.info("Initializing world with enhanced terrain generation...")
-        gen = NoiseGen(452692)
-        
-        n = WORLD_SIZE  # size of the world
-        s = 1  # step size
-        
-        # Generate height map
-        height_map = []
-        for x in range(0, n, s):
-            for z in range(0, n, s):
-                height_map.append(0)
-        
-        for x in range(0, n, s):
-            for z in range(0, n, s):
-                height_map[z + x * n] = int(gen.getHeight(x, z))
-
-        # Generate the world based on height map
-        blocks_created = 0
-        for x in range(0, n, s):
-            for z in range(0, n, s):
-                h = height_map[z + x * n]
-                
-                # Water level generation (below 15)
-                if h < WATER_LEVEL:
-                    # Add sand at the bottom
-                    if self._add_block_internal((x, h, z), BlockType.SAND):
-                        blocks_created += 1
-                    # Fill with water up to water level
-                    for y in range(h + 1, WATER_LEVEL + 1):
-                        if self._add_block_internal((x, y, z), BlockType.WATER):
-                            blocks_created += 1
-                    continue
-                
-                # Sand at water edges (15-18)
-                if h < GRASS_LEVEL:
-                    if self._add_block_internal((x, h, z), BlockType.SAND):
-                        blocks_created += 1
-                else:
-                    # Grass surface for higher terrain
-                    if self._add_block_internal((x, h, z), BlockType.GRASS):
-                        blocks_created += 1
-                
-                # Underground stone layers
-                for y in range(h - 1, 0, -1):
-                    if self._add_block_internal((x, y, z), BlockType.STONE):
-                        blocks_created += 1
-                
-                # Tree generation for higher terrain
-                if h > 20:
-                    if random.randrange(0, 1000) > 990:  # 1% chance
-                        tree_height = random.randrange(5, 7)
-                        
-                        # Tree trunk
-                        for y in range(h + 1, h + tree_height + 1):
-                            if self._add_block_internal((x, y, z), BlockType.WOOD):
-                                blocks_created += 1
-                        
-                        # Tree leaves
-                        leaf_h = h + tree_height
-                        for lz in range(z - 2, z + 3):
-                            for lx in range(x - 2, x + 3):
-                                for ly in range(3):
-                                    # Check bounds before adding leaves
-                                    if (0 <= lx < WORLD_SIZE and 0 <= lz < WORLD_SIZE and 
-                                        leaf_h + ly < 256):
-                                        if self._add_block_internal((lx, leaf_h + ly, lz), BlockType.LEAF):
-                                            blocks_created += 1
+        if self.storage == "voxel":
+            keys = self.chunks_by_distance(DEFAULT_SPAWN_POSITION, SPAWN_CHUNK_RADIUS)
+            self.generate_chunks(keys)
+        else:
+            keys = self.chunks_by_distance(DEFAULT_SPAWN_POSITION)
+            self._insert_chunk_arrays(generate_chunks(WORLD_SEED, keys, self.world_size,
+                                                      self.generation_workers))
+        blocks_created = len(self.world)
         
         # Add camera blocks at strategic locations for all users to see
         spawn_x, spawn_y, spawn_z = DEFAULT_SPAWN_POSITION
@@ -253,22 +322,422 @@ class GameWorld:
                 blocks_created += 1
                 logging.info(f"Added camera block at position {camera_pos} with block_id {camera_block_id}")
         
-        logging.info(f"Enhanced world initialized with {blocks_created} blocks including water, sand, grass, stone, trees, and {len(camera_locations)} camera blocks")
+        logging.info(f"Enhanced world initialized with {len(keys)} chunks ({blocks_created} blocks) including water, sand, grass, stone, trees, and {len(camera_locations)} camera blocks")
+
+    def _generate_chunk(self, chunk_x: int, chunk_z: int) -> Optional[np.ndarray]:
+        """Generate one chunk of this world's terrain (None outside its bounds)."""
+        return generate_chunk(WORLD_SEED, chunk_x, chunk_z, self.world_size)
+
+    def generate_chunks(self, keys=None) -> int:
+        """Materialize chunks now instead of on first touch (default: the whole bounded world)."""
+        if self.storage != "voxel":
+            return 0
+        if keys is None:
+            keys = self.chunks_by_distance(DEFAULT_SPAWN_POSITION)
+        pending = self.world.ungenerated(keys)
+        for (cx, cz), array in generate_chunks(WORLD_SEED, pending, self.world_size,
+                                               self.generation_workers):
+            self.world.add_generated(cx, cz, array)
+        return len(pending)
+
+    def chunks_by_distance(self, position: Tuple[float, float, float],
+                           radius: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Return chunk keys within `radius` chunks of a position (default: the whole
+        bounded world), restricted to the world bounds and ordered closest first."""
+        x, _y, z = position
+        center_x, center_z = int(x // CHUNK_SIZE), int(z // CHUNK_SIZE)
+        if radius is None:
+            if self.world_size is None:
+                raise ValueError("An unbounded world needs a chunk radius")
+            limit = -(-self.world_size // CHUNK_SIZE)
+            keys = [(cx, cz) for cx in range(limit) for cz in range(limit)]
+        else:
+            keys = [(center_x + dx, center_z + dz)
+                    for dx in range(-radius, radius + 1)
+                    for dz in range(-radius, radius + 1)]
+            if self.world_size is not None:
+                limit = -(-self.world_size // CHUNK_SIZE)
+                keys = [(cx, cz) for cx, cz in keys if 0 <= cx < limit and 0 <= cz < limit]
+        keys.sort(key=lambda key: (key[0] - center_x) ** 2 + (key[1] - center_z) ** 2)
+        return keys
+
+    def _load_or_generate_world(self, cache_dir: str) -> None:
+        """Load the generated world from its seed-keyed snapshot, or generate and save it."""
+        path = world_cache_path(cache_dir, world_size=self.world_size)
+        if os.path.exists(path):
+            try:
+                self.load_snapshot(path)
+                logging.info(f"Loaded world snapshot {path} ({len(self.world)} blocks)")
+                return
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable world snapshot {path}: {e}")
+                self._clear_world()
+
+        self._initialize_world()
+        if self.world_size is not None:
+            self.generate_chunks()  # Cache the whole bounded world, not just the spawn area
+        try:
+            self.save_snapshot(path)
+            logging.info(f"Saved world snapshot {path}")
+        except OSError as e:
+            logging.warning(f"Could not save world snapshot {path}: {e}")
+
+    def _rebuild_block_id_map(self) -> None:
+        """Rebuild block_id_map from the voxel store metadata table."""
+        self.block_id_map = {block_id: position
+                             for position, (block_id, _owner) in self.world.metadata.items() if block_id}
+
+    def flush(self) -> int:
+        """Write changed chunks back to the region files (if any); returns how many were written."""
+        if self.storage == "voxel":
+            return self.world.flush()
+        return 0
+
+    @property
+    def has_memory_budget(self) -> bool:
+        return self.storage == "voxel" and self.world.memory_budget is not None
+
+    def update_residency(self, positions, radius: int = RESIDENCY_PIN_RADIUS) -> None:
+        """Pin the chunks within `radius` chunks of each position (e.g. connected players)."""
+        if not self.has_memory_budget:
+            return
+        keys = set()
+        for x, _y, z in positions:
+            cx, cz = int(x // CHUNK_SIZE), int(z // CHUNK_SIZE)
+            keys.update((cx + dx, cz + dz)
+                        for dx in range(-radius, radius + 1)
+                        for dz in range(-radius, radius + 1))
+        if keys != self.world.pinned:
+            self.world.pin(keys)
+
+    def residency_stats(self) -> Dict[str, int]:
+        """Return chunk residency counters (empty without a memory budget)."""
+        return self.world.residency_stats() if self.has_memory_budget else {}
+
+    def _clear_world(self) -> None:
+        """Drop every block, index entry and block_id mapping."""
+        self.world.clear()
+        if self.storage == "dict":
+            self.sectors.clear()
+        self.block_id_map.clear()
+        self._version_clock += 1
+        self._base_version = self._version_clock
+        self.chunk_versions.clear()
+        self.chunk_edits.clear()
+        self.chunk_edit_floors.clear()
+        self.exposed.clear()
+        self.exposure_waiting.clear()
+
+    def chunk_version(self, chunk_x: int, chunk_z: int) -> int:
+        """Return a number that changes whenever a chunk's blocks (or exposed blocks) change."""
+        return self.chunk_versions.get((chunk_x, chunk_z), self._base_version)
+
+    def _bump_chunk_version(self, key: Tuple[int, int]) -> None:
+        self._version_clock += 1
+        self.chunk_versions[key] = self._version_clock
+
+    def _record_edit(self, position: Tuple[int, int, int], block_type: str) -> None:
+        """Log a block a client holding the chunk must now show (or drop, for "air")."""
+        key = (position[0] // CHUNK_SIZE, position[2] // CHUNK_SIZE)
+        log = self.chunk_edits.get(key)
+        if log is None:
+            log = self.chunk_edits[key] = deque(maxlen=CHUNK_EDIT_LOG_SIZE)
+        elif len(log) == CHUNK_EDIT_LOG_SIZE:
+            self.chunk_edit_floors[key] = log[0][0]
+        log.append((self.chunk_version(*key), position, block_type))
+
+    def chunk_edits_since(self, chunk_x: int, chunk_z: int,
+                          version: int) -> Optional[List[Tuple[Tuple[int, int, int], str]]]:
+        """Return the (position, block type) edits taking a chunk from `version` to its current one.
+
+        Each position appears once, at its latest edit. None when the log no
+        longer covers them all: the version predates the last bulk load or
+        the oldest edit still logged, or was never handed out.
+        """
+        key = (chunk_x, chunk_z)
+        if not self._base_version <= version <= self.chunk_version(chunk_x, chunk_z):
+            return None
+        if version < self.chunk_edit_floors.get(key, version):
+            return None
+        edits = {}
+        for edit_version, position, block_type in self.chunk_edits.get(key, ()):
+            if edit_version > version:
+                edits.pop(position, None)
+                edits[position] = block_type
+        return list(edits.items())
+
+    def is_exposed(self, position: Tuple[int, int, int]) -> bool:
+        """Return True if a block has at least one face next to an empty cell.
+
+        Player (USER) blocks count as empty: they are not part of the terrain
+        clients are sent.
+        """
+        x, y, z = position
+        world = self.world
+        for dx, dy, dz in FACES:
+            data = world.get((x + dx, y + dy, z + dz))
+            if data is None or data.type == BlockType.USER:
+                return True
+        return False
+
+    def exposed_blocks(self, chunk_x: int, chunk_z: int) -> set:
+        """Return the exposed positions of a chunk (computed once, then kept up to date)."""
+        key = (chunk_x, chunk_z)
+        exposed = self.exposed.get(key)
+        if exposed is None:
+            # Solid cells of the chunk, padded with the bordering columns of its
+            # neighbours; cells outside the world height and player blocks count as empty
+            solid = np.zeros((CHUNK_SIZE + 2, WORLD_HEIGHT + 2, CHUNK_SIZE + 2), dtype=bool)
+            solid[1:-1, 1:-1, 1:-1] = _solid(self.get_chunk_array(chunk_x, chunk_z))
+            borders = (((chunk_x - 1, chunk_z), (-1, slice(None), slice(None)), (0, slice(1, -1), slice(1, -1))),
+                       ((chunk_x + 1, chunk_z), (0, slice(None), slice(None)), (-1, slice(1, -1), slice(1, -1))),
+                       ((chunk_x, chunk_z - 1), (slice(None), slice(None), -1), (slice(1, -1), slice(1, -1), 0)),
+                       ((chunk_x, chunk_z + 1), (slice(None), slice(None), 0), (slice(1, -1), slice(1, -1), -1)))
+            for neighbor_key, column, padding in borders:
+                border = self._resident_border(neighbor_key, column)
+                if border is None:
+                    # Not in memory: count it as empty (a few buried blocks are sent
+                    # too) rather than loading it, and recompute once it loads
+                    self.exposure_waiting.setdefault(neighbor_key, set()).add(key)
+                else:
+                    solid[padding] = _solid(border)
+            inner = solid[1:-1, 1:-1, 1:-1]
+            covered = (solid[:-2, 1:-1, 1:-1] & solid[2:, 1:-1, 1:-1] &
+                       solid[1:-1, :-2, 1:-1] & solid[1:-1, 2:, 1:-1] &
+                       solid[1:-1, 1:-1, :-2] & solid[1:-1, 1:-1, 2:])
+            xs, ys, zs = np.nonzero(inner & ~covered)
+            exposed = self.exposed[key] = set(zip((xs + chunk_x * CHUNK_SIZE).tolist(), ys.tolist(),
+                                                  (zs + chunk_z * CHUNK_SIZE).tolist()))
+        return exposed
+
+    def _resident_border(self, key: Tuple[int, int], column) -> Optional[np.ndarray]:
+        """Return the palette codes of one border column plane of a chunk, or None if it is not in memory."""
+        if self.storage == "dict":
+            return self.get_chunk_array(*key)[column]
+        array = self.world.resident_array(*key)
+        if array is not None:
+            return array[column]
+        if self.world.is_known_empty(*key):
+            return np.zeros((WORLD_HEIGHT, CHUNK_SIZE), dtype=np.uint8)
+        return None
+
+    def _chunk_loaded(self, key: Tuple[int, int]) -> None:
+        """Drop the exposed sets computed while a chunk was not in memory."""
+        for waiting in self.exposure_waiting.pop(key, ()):
+            if self.exposed.pop(waiting, None) is not None:
+                self._bump_chunk_version(waiting)  # Its surface payload shrinks
+
+    def hidden_neighbors(self, position: Tuple[int, int, int]) -> List[Tuple[int, int, int]]:
+        """Return the blocks next to a position that are not exposed (a dig there would expose them)."""
+        x, y, z = position
+        neighbors = [(x + dx, y + dy, z + dz) for dx, dy, dz in FACES]
+        return [n for n in neighbors if n in self.world and not self.is_exposed(n)]
+
+    def _update_exposure(self, position: Tuple[int, int, int], removed: bool) -> None:
+        """Keep the computed exposed sets right after a block was placed or removed."""
+        if not self.exposed:
+            return
+        x, y, z = position
+        key = (x // CHUNK_SIZE, z // CHUNK_SIZE)
+        exposed = self.exposed.get(key)
+        if exposed is not None:
+            if removed or not self.is_exposed(position):
+                exposed.discard(position)
+            else:
+                exposed.add(position)
+        for dx, dy, dz in FACES:
+            neighbor = (x + dx, y + dy, z + dz)
+            neighbor_key = (neighbor[0] // CHUNK_SIZE, neighbor[2] // CHUNK_SIZE)
+            exposed = self.exposed.get(neighbor_key)
+            if exposed is None:
+                continue
+            data = self.world.get(neighbor)
+            if data is None or data.type == BlockType.USER:
+                continue
+            now = removed or self.is_exposed(neighbor)
+            if now != (neighbor in exposed):
+                (exposed.add if now else exposed.discard)(neighbor)
+                if neighbor_key != key:
+                    self._bump_chunk_version(neighbor_key)  # Its surface payload changed
+                if now:
+                    self._record_edit(neighbor, self.world[neighbor].type)  # Surface-only clients lack it
+
+    def get_chunk_array(self, chunk_x: int, chunk_z: int) -> np.ndarray:
+        """Return a uint8[x, y, z] array of block palette codes for one chunk."""
+        if self.storage == "voxel":
+            array = self.world.chunk_array(chunk_x, chunk_z)
+            if array is not None:
+                return array.copy()
+        array = np.zeros((CHUNK_SIZE, WORLD_HEIGHT, CHUNK_SIZE), dtype=np.uint8)
+        positions = self.sectors.get((chunk_x, 0, chunk_z)) if self.storage == "dict" else None
+        if positions:
+            coords = np.array(list(positions), dtype=np.int64)
+            world = self.world
+            array[coords[:, 0] - chunk_x * CHUNK_SIZE, coords[:, 1], coords[:, 2] - chunk_z * CHUNK_SIZE] = \
+                [BLOCK_CODES[world[position].type] for position in positions]
+        return array
+
+    def snapshot_header(self) -> Dict[str, Any]:
+        """Return the key a snapshot of this world is saved (and checked on load) under."""
+        return {"seed": WORLD_SEED, "world_size": self.world_size,
+                "generator_version": WORLD_GENERATOR_VERSION}
+
+    def snapshot_chunks(self) -> Iterator[Tuple[Tuple[int, int], np.ndarray, Dict[Tuple[int, int, int], Tuple]]]:
+        """Copy the world chunk by chunk as ((cx, cz), palette codes, metadata) triples.
+
+        The chunk list is fixed by this call, but each chunk is only copied when
+        the iterator reaches it, so callers may yield to the event loop between
+        chunks. Player (USER) blocks only mark where connected players stand and
+        are left out, so a restart never brings them back.
+        """
+        metadata_positions = {}
+        if self.storage == "voxel":
+            # Generated chunks, emptied ones included, so they are not generated again
+            keys = list(self.world.chunk_counts)
+            for position in self.world.metadata:
+                metadata_positions.setdefault((position[0] // CHUNK_SIZE, position[2] // CHUNK_SIZE), []).append(position)
+        else:
+            keys = [(cx, cz) for cx, _, cz in self.sectors]
+        return self._copy_chunks(keys, metadata_positions)
+
+    def _copy_chunks(self, keys, metadata_positions):
+        user_code = BLOCK_CODES[BlockType.USER]
+        for cx, cz in keys:
+            array = self.get_chunk_array(cx, cz)
+            metadata = {}
+            if self.storage == "voxel":
+                for position in metadata_positions.get((cx, cz), ()):
+                    entry = self.world.metadata.get(position)
+                    code = array[position[0] - cx * CHUNK_SIZE, position[1], position[2] - cz * CHUNK_SIZE]
+                    if entry is not None and code and code != user_code:
+                        metadata[position] = entry
+            else:
+                for position in self.sectors.get((cx, 0, cz), ()):
+                    data = self.world[position]
+                    if (data.block_id is not None or data.owner is not None) and data.type != BlockType.USER:
+                        metadata[position] = (data.block_id, data.owner)
+            array[array == user_code] = 0
+            yield (cx, cz), array, metadata
+
+    def snapshot_state(self) -> Tuple[Dict[str, Any], Dict[Tuple[int, int], np.ndarray], Dict[Tuple[int, int, int], Tuple]]:
+        """Copy the world into (header, chunk arrays, metadata) for world_storage.save_snapshot."""
+        chunks, metadata = {}, {}
+        for key, array, chunk_metadata in self.snapshot_chunks():
+            chunks[key] = array
+            metadata.update(chunk_metadata)
+        return self.snapshot_header(), chunks, metadata
+
+    def save_snapshot(self, path: str) -> None:
+        """Write the whole world (chunk arrays and block metadata) to a snapshot file."""
+        save_snapshot(path, *self.snapshot_state())
+
+    def load_snapshot(self, path: str) -> Dict[str, Any]:
+        """Replace the world contents with a snapshot written by save_snapshot; return its header."""
+        header, chunks, metadata = load_snapshot(path)
+        expected = (WORLD_SEED, self.world_size, WORLD_GENERATOR_VERSION)
+        found = (header.get("seed"), header.get("world_size"), header.get("generator_version"))
+        if found != expected:
+            raise ValueError(f"Snapshot key {found} does not match {expected}")
+
+        self._replace_world(chunks, metadata)
+        return header
+
+    def load_blocks(self, blocks: Dict[Tuple[int, int, int], Any]) -> int:
+        """Replace the world contents with a {position: block} mapping; return its block count.
+
+        The values may be in the former formats (type strings or dicts): they
+        are migrated to BlockRecord values in place, once, before loading.
+        """
+        migrate_block_format(blocks)
+        chunks, metadata = {}, {}
+        for (x, y, z), record in blocks.items():
+            key = (x // CHUNK_SIZE, z // CHUNK_SIZE)
+            array = chunks.get(key)
+            if array is None:
+                array = chunks[key] = np.zeros((CHUNK_SIZE, WORLD_HEIGHT, CHUNK_SIZE), dtype=np.uint8)
+            array[x - key[0] * CHUNK_SIZE, y, z - key[1] * CHUNK_SIZE] = BLOCK_CODES[record.type]
+            if record.block_id is not None or record.owner is not None:
+                metadata[(x, y, z)] = (record.block_id, record.owner)
+        self._replace_world(chunks, metadata)
+        return len(blocks)
+
+    def _replace_world(self, chunks: Dict[Tuple[int, int], np.ndarray],
+                       metadata: Dict[Tuple[int, int, int], Tuple]) -> None:
+        """Swap the world for chunk arrays plus their (block_id, owner) metadata table."""
+        self._clear_world()
+        self._insert_chunk_arrays(chunks.items())
+        if self.storage == "voxel":
+            self.world.update_metadata(metadata)
+        else:
+            for position, (block_id, owner) in metadata.items():
+                self.world[position] = create_block_data(self.world[position].type, block_id, owner)
+
+        for position, (block_id, _owner) in metadata.items():
+            if block_id:
+                self.block_id_map[block_id] = position
+
+    def _insert_chunk_arrays(self, chunks: Iterable[Tuple[Tuple[int, int], Optional[np.ndarray]]]) -> None:
+        """Bulk-insert natural blocks from ((cx, cz), uint8[x, y, z] palette codes) pairs."""
+        if self.storage == "voxel":
+            for (cx, cz), array in chunks:
+                if array is not None:
+                    self.world.load_chunk(cx, cz, array)
+            return
+        # One shared record per palette code, bulk-inserted chunk by chunk
+        # (the cyclic GC is paused: it would rescan the fresh position tuples over and over)
+        records = [None] + [create_block_data(block_type) for block_type in BLOCK_PALETTE[1:]]
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for (cx, cz), array in chunks:
+                if array is None:
+                    continue
+                xs, ys, zs = np.nonzero(array)
+                if not len(xs):
+                    continue
+                codes = array[xs, ys, zs].tolist()
+                positions = list(zip((xs + cx * CHUNK_SIZE).tolist(), ys.tolist(),
+                                     (zs + cz * CHUNK_SIZE).tolist()))
+                self.world.update(zip(positions, [records[code] for code in codes]))
+                self.sectors[(cx, 0, cz)] = set(positions)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def apply_edit(self, position: Tuple[int, int, int], block_type: Optional[str],
+                   block_id: Optional[str] = None, owner: Optional[str] = None) -> None:
+        """Force a position to a block (or to empty when block_type is None), without validation.
+
+        Used to replay journaled edits; applying the same edit twice is harmless.
+        """
+        position = tuple(position)
+        previous = self.world.get(position)
+        if previous is not None and previous.block_id and self.block_id_map.get(previous.block_id) == position:
+            del self.block_id_map[previous.block_id]
+        if block_type is None:
+            if previous is not None:
+                del self.world[position]
+                self._unindex_block(position)
+            return
+        self.world[position] = create_block_data(block_type, block_id, owner)
+        # Overwrites too: the chunk version, edit log and exposure must follow
+        self._index_block(position)
+        if block_id:
+            self.block_id_map[block_id] = position
 
     def _add_block_internal(self, position: Tuple[int, int, int], block_type: str, block_id: Optional[str] = None, owner: Optional[str] = None) -> bool:
         """Internal method to add blocks without validation (for world generation)."""
         if position in self.world:
             return False
         
-        x, y, z = position
         # Ensure position is within bounds before adding
-        if not (0 <= x < WORLD_SIZE and y >= 0 and y < 256 and 0 <= z < WORLD_SIZE):
+        if not validate_position(position, self.world_size):
             return False
         
         # Create block data with collision, block_id, and owner attributes
         block_data = create_block_data(block_type, block_id, owner)
         self.world[position] = block_data
-        self.sectors.setdefault(sectorize(position), []).append(position)
+        self._index_block(position)
         
         # Track block_id if provided (for camera and user blocks)
         if block_id:
@@ -276,9 +745,61 @@ class GameWorld:
             
         return True
 
+    def _index_block(self, position: Tuple[int, int, int]) -> None:
+        """Register a position in the chunk index."""
+        self._bump_chunk_version((position[0] // CHUNK_SIZE, position[2] // CHUNK_SIZE))
+        self._record_edit(position, self.world[position].type)
+        self._update_exposure(position, removed=False)
+        self._index_marker(position)
+
+    def _unindex_block(self, position: Tuple[int, int, int]) -> None:
+        """Drop a position from the chunk index."""
+        self._bump_chunk_version((position[0] // CHUNK_SIZE, position[2] // CHUNK_SIZE))
+        self._record_edit(position, BlockType.AIR)
+        self._update_exposure(position, removed=True)
+        self._unindex_marker(position)
+
+    def _index_marker(self, position: Tuple[int, int, int]) -> None:
+        """Register a position in the sector index only.
+
+        Player (USER) blocks go through here directly: they move with every
+        step and are never sent in chunk payloads, so they leave the chunk
+        version, edit log and exposed sets alone.
+        """
+        if self.storage == "voxel":
+            return
+        self.sectors.setdefault(sectorize(position), set()).add(position)
+
+    def _unindex_marker(self, position: Tuple[int, int, int]) -> None:
+        """Drop a position from the sector index only (see _index_marker)."""
+        if self.storage == "voxel":
+            return
+        sector = sectorize(position)
+        positions = self.sectors.get(sector)
+        if positions is not None:
+            positions.discard(position)
+            if not positions:
+                del self.sectors[sector]
+
+    def _sectors_in_range(self, min_x: float, max_x: float,
+                          min_z: float, max_z: float) -> List[Tuple[int, int, int]]:
+        """Return the indexed sectors overlapping an x/z bounding box (inclusive)."""
+        sx0, sx1 = int(min_x // SECTOR_SIZE), int(max_x // SECTOR_SIZE)
+        sz0, sz1 = int(min_z // SECTOR_SIZE), int(max_z // SECTOR_SIZE)
+        return [(sx, 0, sz)
+                for sx in range(sx0, sx1 + 1)
+                for sz in range(sz0, sz1 + 1)
+                if (sx, 0, sz) in self.sectors]
+
+    def _positions_in_range(self, min_x: float, max_x: float,
+                            min_z: float, max_z: float):
+        """Yield indexed block positions from the sectors overlapping an x/z box."""
+        for sector in self._sectors_in_range(min_x, max_x, min_z, max_z):
+            yield from self.sectors[sector]
+
     def add_block(self, position: Tuple[int, int, int], block_type: str, block_id: Optional[str] = None, owner: Optional[str] = None) -> bool:
         """Add a block at the specified position."""
-        if not validate_position(position):
+        if not validate_position(position, self.world_size):
             logging.warning(f"Invalid position for block placement: {position}")
             return False
             
@@ -292,17 +813,20 @@ class GameWorld:
         # Create block data with collision, block_id, and owner attributes
         block_data = create_block_data(block_type, block_id, owner)
         self.world[position] = block_data
-        self.sectors.setdefault(sectorize(position), []).append(position)
+        self._index_block(position)
         
         # Track block_id if provided (for camera and user blocks)
         if block_id:
             self.block_id_map[block_id] = position
+
+        if self.journal is not None:
+            self.journal.record_set(position, block_type, block_id, owner)
             
         return True
 
     def remove_block(self, position: Tuple[int, int, int]) -> bool:
         """Remove a block at the specified position."""
-        if not validate_position(position):
+        if not validate_position(position, self.world_size):
             logging.warning(f"Invalid position for block removal: {position}")
             return False
             
@@ -310,38 +834,30 @@ class GameWorld:
             return False  # No block to remove
         
         block_data = self.world[position]
-        block_type = block_data.get("type") if isinstance(block_data, dict) else block_data
         
         # Prevent removal of stone blocks (bedrock protection)
-        if block_type == BlockType.STONE:
+        if block_data.type == BlockType.STONE:
             return False
         
         # Remove block_id mapping if it exists
-        if isinstance(block_data, dict) and block_data.get("block_id"):
-            block_id = block_data["block_id"]
-            if block_id in self.block_id_map:
-                del self.block_id_map[block_id]
+        if block_data.block_id:
+            self.block_id_map.pop(block_data.block_id, None)
             
         del self.world[position]
-        sector = sectorize(position)
-        if sector in self.sectors and position in self.sectors[sector]:
-            self.sectors[sector].remove(position)
+        self._unindex_block(position)
+        if self.journal is not None:
+            self.journal.record_remove(position)
         return True
 
     def get_block(self, position: Tuple[int, int, int]) -> Optional[str]:
         """Get block type at specified position."""
         block_data = self.world.get(position)
-        if block_data:
-            # Handle both old string format and new dict format for compatibility
-            if isinstance(block_data, dict):
-                return block_data.get("type")
-            return block_data
-        return None
+        return block_data.type if block_data is not None else None
 
     def get_world_data(self) -> Dict[str, Any]:
         """Get basic world information for client initialization."""
         return {
-            "world_size": WORLD_SIZE, 
+            "world_size": self.world_size,  # None: unbounded
             "spawn_position": DEFAULT_SPAWN_POSITION
         }
 
@@ -351,15 +867,17 @@ class GameWorld:
         start_x, start_z = chunk_x * chunk_size, chunk_z * chunk_size
         end_x, end_z = start_x + chunk_size, start_z + chunk_size
         
-        for pos, block_data in self.world.items():
+        # Chunks aligned with sectors map directly onto the index; other sizes
+        # only visit the sectors overlapping the requested area
+        if chunk_size == SECTOR_SIZE:
+            positions = self.sectors.get((chunk_x, 0, chunk_z), ())
+        else:
+            positions = self._positions_in_range(start_x, end_x - 1, start_z, end_z - 1)
+        
+        for pos in positions:
             x, y, z = pos
             if start_x <= x < end_x and start_z <= z < end_z:
-                # Handle both old string format and new dict format
-                if isinstance(block_data, dict):
-                    block_type = block_data.get("type")
-                else:
-                    block_type = block_data
-                blocks[f"{x},{y},{z}"] = block_type
+                blocks[f"{x},{y},{z}"] = self.world[pos].type
                 
         return {
             "chunk_x": chunk_x, 
@@ -368,29 +886,22 @@ class GameWorld:
         }
 
     def get_cameras(self) -> List[Dict[str, Any]]:
-        """Get all camera blocks in the world."""
+        """Get all camera blocks in the world.
+
+        Cameras always carry a block_id, so only the positions in block_id_map
+        are looked at (no scan of the world, which would load every chunk).
+        """
         cameras = []
-        for pos, block_data in self.world.items():
-            # Handle both old string format and new dict format
-            if isinstance(block_data, dict):
-                block_type = block_data.get("type")
-                block_id = block_data.get("block_id")
-                collision = block_data.get("collision", True)
-                owner = block_data.get("owner")
-            else:
-                block_type = block_data
-                block_id = None
-                collision = get_block_collision(block_type)
-                owner = None
-            
-            if block_type == BlockType.CAMERA:
+        for pos in list(self.block_id_map.values()):
+            block_data = self.world.get(pos)
+            if block_data is not None and block_data.type == BlockType.CAMERA:
                 x, y, z = pos
                 cameras.append({
                     "position": [x, y, z],
-                    "block_type": block_type,
-                    "block_id": block_id,
-                    "collision": collision,
-                    "owner": owner
+                    "block_type": block_data.type,
+                    "block_id": block_data.block_id,
+                    "collision": block_data.collision,
+                    "owner": block_data.owner
                 })
         return cameras
 
@@ -399,27 +910,18 @@ class GameWorld:
         blocks = []
         cx, cy, cz = center
         
-        for pos, block_data in self.world.items():
+        for pos in self._positions_in_range(cx - radius, cx + radius, cz - radius, cz + radius):
+            block_data = self.world[pos]
             x, y, z = pos
             # Calculate distance from center
             distance = ((x - cx)**2 + (y - cy)**2 + (z - cz)**2)**0.5
             
             if distance <= radius:
-                # Handle both old string format and new dict format
-                if isinstance(block_data, dict):
-                    block_type = block_data.get("type")
-                    block_id = block_data.get("block_id")
-                    collision = block_data.get("collision", True)
-                else:
-                    block_type = block_data
-                    block_id = None
-                    collision = get_block_collision(block_type)
-                
                 blocks.append({
                     "position": [x, y, z],
-                    "block_type": block_type,
-                    "block_id": block_id,
-                    "collision": collision
+                    "block_type": block_data.type,
+                    "block_id": block_data.block_id,
+                    "collision": block_data.collision
                 })
         
         return blocks
@@ -451,7 +953,9 @@ class GameWorld:
         
         # For simplicity, use a cone-based approximation
         # This is a simplified version - a proper implementation would use a view frustum
-        for pos, block_data in self.world.items():
+        for pos in self._positions_in_range(px - view_distance, px + view_distance,
+                                            pz - view_distance, pz + view_distance):
+            block_data = self.world[pos]
             x, y, z = pos
             
             # Vector from position to block
@@ -461,23 +965,13 @@ class GameWorld:
             if distance > view_distance or distance < 0.1:
                 continue
             
-            # Handle both old string format and new dict format
-            if isinstance(block_data, dict):
-                block_type = block_data.get("type")
-                blk_id = block_data.get("block_id")
-                collision = block_data.get("collision", True)
-            else:
-                block_type = block_data
-                blk_id = None
-                collision = get_block_collision(block_type)
-            
             # Calculate angle to block (simplified)
             # In a real implementation, this would properly check against the view frustum
             blocks.append({
                 "position": [x, y, z],
-                "block_type": block_type,
-                "block_id": blk_id,
-                "collision": collision,
+                "block_type": block_data.type,
+                "block_id": block_data.block_id,
+                "collision": block_data.collision,
                 "distance": distance
             })
         
@@ -494,29 +988,20 @@ class GameWorld:
             if old_pos != block_pos and old_pos in self.world:
                 old_block = self.world[old_pos]
                 # Only remove if it's a user block with this player's ID
-                if (isinstance(old_block, dict) and 
-                    old_block.get("type") == BlockType.USER and 
-                    old_block.get("block_id") == player_id):
+                if old_block.type == BlockType.USER and old_block.block_id == player_id:
                     del self.world[old_pos]
-                    sector = sectorize(old_pos)
-                    if sector in self.sectors and old_pos in self.sectors[sector]:
-                        self.sectors[sector].remove(old_pos)
+                    self._unindex_marker(old_pos)
         
         # Don't overwrite existing solid blocks with user blocks
         if block_pos in self.world:
-            existing = self.world[block_pos]
-            if isinstance(existing, dict):
-                existing_type = existing.get("type")
-            else:
-                existing_type = existing
             # Only overwrite if it's air, water, or another user block
-            if existing_type not in {BlockType.AIR, BlockType.WATER, BlockType.USER}:
+            if self.world[block_pos].type not in {BlockType.AIR, BlockType.WATER, BlockType.USER}:
                 return False
         
         # Add user block
         block_data = create_block_data(BlockType.USER, block_id=player_id)
         self.world[block_pos] = block_data
-        self.sectors.setdefault(sectorize(block_pos), []).append(block_pos)
+        self._index_marker(block_pos)
         self.block_id_map[player_id] = block_pos
         return True
     
@@ -529,13 +1014,9 @@ class GameWorld:
         if position in self.world:
             block_data = self.world[position]
             # Verify it's actually a user block with this player's ID
-            if (isinstance(block_data, dict) and 
-                block_data.get("type") == BlockType.USER and 
-                block_data.get("block_id") == player_id):
+            if block_data.type == BlockType.USER and block_data.block_id == player_id:
                 del self.world[position]
-                sector = sectorize(position)
-                if sector in self.sectors and position in self.sectors[sector]:
-                    self.sectors[sector].remove(position)
+                self._unindex_marker(position)
         
         del self.block_id_map[player_id]
         return True
@@ -559,42 +1040,38 @@ class GameWorld:
         blocks_to_remove = []
         
         # Identify blocks to remove
-        for position, block_data in self.world.items():
-            if isinstance(block_data, dict):
-                block_type = block_data.get("type")
-                block_id = block_data.get("block_id")
-                owner = block_data.get("owner")
-                
+        if self.storage == "voxel":
+            # Blocks with an owner or block_id are in the metadata table; other
+            # types are found chunk by chunk without loading on-disk chunks
+            other_codes = [code for block_type, code in BLOCK_CODES.items() if block_type not in natural_blocks]
+            blocks_to_remove = list(dict.fromkeys([*self.world.metadata,
+                                                   *self.world.positions_with_codes(other_codes)]))
+        else:
+            for position, block_data in self.world.items():
                 # Remove if:
                 # 1. Block has an owner (player-placed camera)
                 # 2. Block has a block_id (camera or user block)
                 # 3. Block type is not in natural terrain
-                if owner is not None or block_id is not None or block_type not in natural_blocks:
-                    blocks_to_remove.append(position)
-            else:
-                # Old format - if it's not in natural blocks, remove it
-                block_type = block_data
-                if block_type not in natural_blocks:
+                if (block_data.owner is not None or block_data.block_id is not None or
+                        block_data.type not in natural_blocks):
                     blocks_to_remove.append(position)
         
         # Remove identified blocks
         removed_count = 0
         for position in blocks_to_remove:
-            block_data = self.world[position]
+            block_data = self.world.get(position)
+            if block_data is None:
+                continue
             
             # Remove from block_id_map if it has a block_id
-            if isinstance(block_data, dict) and block_data.get("block_id"):
-                block_id = block_data["block_id"]
-                if block_id in self.block_id_map:
-                    del self.block_id_map[block_id]
+            if block_data.block_id:
+                self.block_id_map.pop(block_data.block_id, None)
             
-            # Remove from world
+            # Remove from world and chunk index
             del self.world[position]
-            
-            # Remove from sectors
-            sector = sectorize(position)
-            if sector in self.sectors and position in self.sectors[sector]:
-                self.sectors[sector].remove(position)
+            self._unindex_block(position)
+            if self.journal is not None:
+                self.journal.record_remove(position)
             
             removed_count += 1
         
@@ -618,31 +1095,213 @@ class InvalidWorldDataError(ServerError):
     pass
 
 
+# ---------- Spatial Grid ----------
+
+class SpatialGrid:
+    """Uniform grid over (x, z) of player positions, for area-of-interest queries."""
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Set[str]] = {}
+        self.positions: Dict[str, Tuple[float, float, float]] = {}
+        self._cell_of: Dict[str, Tuple[int, int]] = {}
+
+    def _cell(self, position) -> Tuple[int, int]:
+        return int(position[0] // self.cell_size), int(position[2] // self.cell_size)
+
+    def move(self, item_id: str, position) -> None:
+        """Insert an item or update its position."""
+        self.positions[item_id] = position
+        cell = self._cell(position)
+        old = self._cell_of.get(item_id)
+        if old == cell:
+            return
+        if old is not None:
+            self._discard(item_id, old)
+        self._cell_of[item_id] = cell
+        self.cells.setdefault(cell, set()).add(item_id)
+
+    def remove(self, item_id: str) -> None:
+        self.positions.pop(item_id, None)
+        cell = self._cell_of.pop(item_id, None)
+        if cell is not None:
+            self._discard(item_id, cell)
+
+    def _discard(self, item_id: str, cell: Tuple[int, int]) -> None:
+        members = self.cells[cell]
+        members.discard(item_id)
+        if not members:
+            del self.cells[cell]
+
+    def near(self, position, radius: float) -> Iterator[Tuple[str, float]]:
+        """Yield (item id, squared horizontal distance) of the items within radius."""
+        x, _, z = position
+        min_x, min_z = self._cell((x - radius, 0, z - radius))
+        max_x, max_z = self._cell((x + radius, 0, z + radius))
+        limit = radius * radius
+        for cx in range(min_x, max_x + 1):
+            for cz in range(min_z, max_z + 1):
+                for item_id in self.cells.get((cx, cz), ()):
+                    ix, _, iz = self.positions[item_id]
+                    distance = (ix - x) ** 2 + (iz - z) ** 2
+                    if distance <= limit:
+                        yield item_id, distance
+
+
+# ---------- Client Outbox ----------
+
+class ClientOutbox:
+    """Bounded outbound frame queue of one client, drained by its own writer task.
+
+    Producers (handlers, broadcasts, the physics loop) only append to the
+    queue, so nothing but the writer ever waits on the client's socket. A
+    frame queued with a coalescing key replaces the still-pending frame with
+    the same key in place (e.g. only the latest PLAYER_UPDATE per player).
+    """
+
+    def __init__(self, websocket, max_size: int = DEFAULT_OUTBOX_SIZE):
+        self.websocket = websocket
+        self.max_size = max_size
+        self._queue = deque()  # [key, frame] entries, oldest first
+        self._pending = {}     # coalescing key -> its queued entry
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, frame, key: Any = None) -> bool:
+        """Queue a frame; returns False (and queues nothing) if the queue is full."""
+        if key is not None:
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry[1] = frame
+                self.coalesced += 1
+                return True
+        if len(self._queue) >= self.max_size:
+            self.dropped += 1
+            return False
+        entry = [key, frame]
+        self._queue.append(entry)
+        if key is not None:
+            self._pending[key] = entry
+        if len(self._queue) > self.max_depth:
+            self.max_depth = len(self._queue)
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    async def run(self) -> None:
+        """Send queued frames in order until cancelled or the socket fails."""
+        try:
+            while True:
+                if not self._queue:
+                    self._idle.set()
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                key, frame = entry = self._queue.popleft()
+                if key is not None and self._pending.get(key) is entry:
+                    del self._pending[key]
+                await self.websocket.send(frame)
+                self.sent += 1
+        finally:
+            self._idle.set()  # Nothing more will be written: release drain() callers
+
+    async def drain(self) -> None:
+        """Wait until every queued frame has been handed to the socket."""
+        await self._idle.wait()
+
+
 # ---------- Minecraft Server ----------
 
 class MinecraftServer:
     """WebSocket-based Minecraft server handling multiple clients."""
     
-    def __init__(self, host: str = 'localhost', port: int = 8765, reset_world: bool = False):
+    def __init__(self, host: str = 'localhost', port: int = 8765, reset_world: bool = False,
+                 world_storage: str = "dict", world_cache: Optional[str] = None,
+                 journal_dir: Optional[str] = None, journal_fsync: str = DEFAULT_FSYNC_POLICY,
+                 region_dir: Optional[str] = None, chunk_memory_mb: Optional[float] = None,
+                 world_size: Optional[int] = WORLD_SIZE,
+                 generation_workers: Optional[int] = DEFAULT_GENERATION_WORKERS,
+                 compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+                 compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+                 view_radius: int = DEFAULT_VIEW_RADIUS, stream_interior: bool = False,
+                 outbox_size: int = DEFAULT_OUTBOX_SIZE, outbox_policy: str = "disconnect",
+                 interest_radius: float = DEFAULT_INTEREST_RADIUS):
+        if outbox_policy not in OUTBOX_OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown outbox overflow policy: {outbox_policy}")
         self.host = host
         self.port = port
-        self.world = GameWorld(reset_to_natural=reset_world)
+        self.journal = BlockJournal(journal_dir, fsync_policy=journal_fsync) if journal_dir else None
+        self.world = GameWorld(reset_to_natural=reset_world, storage=world_storage,
+                               world_cache=world_cache, journal=self.journal, region_dir=region_dir,
+                               chunk_memory_mb=chunk_memory_mb, world_size=world_size,
+                               generation_workers=generation_workers)
         self.clients: Dict[str, websockets.WebSocketServerProtocol] = {}
+        self.snapshot_tick = 0
+        self.snapshot_states: Dict[str, Dict[str, Any]] = {}  # Player ID -> entry as of the last PLAYER_SNAPSHOT
+        self.snapshot_drops: Dict[str, int] = {}  # Client ID -> outbox drops seen (missing: needs a keyframe)
+        self.interest_radius = interest_radius or None  # None: everyone sees everyone
+        self.player_grid = SpatialGrid((interest_radius or DEFAULT_INTEREST_RADIUS) + INTEREST_HYSTERESIS)
+        self.interest: Dict[str, Set[str]] = {}  # Client ID -> players in its last PLAYER_SNAPSHOT
+        self.pending_moves: Dict[str, Tuple[tuple, tuple]] = {}  # Player ID -> latest (position, rotation)
+        self.move_stats = {"applied": 0, "coalesced": 0, "rejected": 0}
+        self.outboxes: Dict[str, ClientOutbox] = {}  # Player ID -> outbound queue and writer task
+        self.outbox_size = outbox_size
+        self.outbox_policy = outbox_policy
+        self.overflow_disconnects = 0
+        self.pending_disconnects: Dict[str, bool] = {}  # Player ID -> close the socket first
+        self._disconnect_task: Optional[asyncio.Task] = None
         self.players: Dict[str, PlayerState] = {}
         self.user_cubes: Dict[str, Cube] = {}  # Player ID -> Cube mapping
         self.camera_cubes: Dict[str, Cube] = {}  # Camera block_id -> Cube mapping
         self.rtsp_users: Dict[str, Any] = {}  # Kept for compatibility but unused
+        # (cx, cz, encoding, compressed, part) -> (chunk version, encoded WORLD_CHUNK frame or None when empty)
+        self.chunk_payloads: Dict[Tuple[int, int, str, bool, str], Tuple[int, Any]] = {}
+        self.chunk_encodings: Dict[str, str] = {}  # Player ID -> chunk encoding negotiated at join
+        self.message_codecs: Dict[str, str] = {}  # Player ID -> message codec negotiated at join
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self.compression_clients = set()  # Player IDs that accept zlib envelopes
+        self.view_radius = view_radius
+        self.streamed_chunks: Dict[str, set] = {}  # Player ID -> chunks the client holds
+        self.stream_centers: Dict[str, Tuple[int, int]] = {}  # Player ID -> chunk streamed around
+        self.stream_interior = stream_interior  # Also send buried blocks once the surfaces are out
+        self.compression_stats = {"compressed": 0, "skipped": 0, "bytes_in": 0,
+                                  "bytes_out": 0, "cpu_seconds": 0.0}
+        self.chunk_payload_hits = 0
+        self.chunk_payload_misses = 0
+        self.resync_stats = {"kept": 0, "delta": 0, "unloaded": 0}  # Chunks reported by reconnecting clients
         self.running = False
         self.logger = logging.getLogger(__name__)
         # Physics tick timing
         self.last_physics_update = time.time()
         # Camera counter for auto-generating camera block_ids (starts at 5 since 0-4 are used in world init)
         self._camera_counter = 5
+        self._restore_camera_cubes()
+
+    def _restore_camera_cubes(self) -> None:
+        """Recreate cubes for player-placed cameras restored from disk and skip their ids."""
+        for block_id, position in self.world.block_id_map.items():
+            if not block_id.startswith("camera_") or not block_id[7:].isdigit():
+                continue
+            self._camera_counter = max(self._camera_counter, int(block_id[7:]) + 1)
+            owner = self.world.world[position].owner
+            if owner is not None:
+                self.camera_cubes[block_id] = Cube(cube_id=block_id, position=position,
+                                                   cube_type="camera", owner=owner)
         
         
     def _check_ground_collision(self, position: Tuple[float, float, float]) -> bool:
         """Check ground collision using unified collision system."""
-        return unified_check_collision(position, self.world.world)
+        return unified_check_collision(position, self.world.world, world_size=self.world.world_size)
 
     def _check_player_collision(self, player_id: str, position: Tuple[float, float, float]) -> bool:
         """Check player collision using unified collision system."""
@@ -662,7 +1321,7 @@ class MinecraftServer:
         
         # Initialize physics system if needed
         if not hasattr(self, '_collision_detector'):
-            self._collision_detector = MinecraftCollisionDetector(self.world.world)
+            self._collision_detector = MinecraftCollisionDetector(self.world.world, self.world.world_size)
             self._physics = MinecraftPhysics(self._collision_detector)
         
         # Update collision detector with current world
@@ -707,9 +1366,16 @@ class MinecraftServer:
             current_time = time.time()
             dt = current_time - self.last_physics_update
             
+            # Apply the moves received since the last tick
+            await self._apply_pending_moves()
+
+            # Keep the chunks around players resident before physics touches them
+            self.world.update_residency([player.position for player in self.players.values()])
+
             # Update physics for all players
             for player in self.players.values():
                 self._apply_physics(player, dt)
+                self.player_grid.move(player.id, player.position)
             
             # Broadcast player updates
             await self._broadcast_physics_updates()
@@ -726,6 +1392,35 @@ class MinecraftServer:
 
     def _log_player_debug_summary(self):
         """Log a summary of all connected players and their positions."""
+        residency = self.world.residency_stats()
+        if residency:
+            self.logger.info(f"📦 CHUNK RESIDENCY: {residency['resident']} resident "
+                             f"({residency['resident_bytes'] // 1024} KiB), {residency['pinned']} pinned, "
+                             f"hits={residency['hits']} misses={residency['misses']} "
+                             f"evictions={residency['evictions']}")
+        if self.chunk_payload_hits or self.chunk_payload_misses:
+            self.logger.info(f"📦 CHUNK PAYLOADS: {len(self.chunk_payloads)} cached, "
+                             f"hits={self.chunk_payload_hits} misses={self.chunk_payload_misses}")
+        outboxes = self.outbox_stats()
+        if outboxes["clients"]:
+            self.logger.info(f"📤 OUTBOXES: {outboxes['queued']} frames queued (deepest {outboxes['deepest']}, "
+                             f"peak {outboxes['max_depth']}), sent={outboxes['sent']} "
+                             f"coalesced={outboxes['coalesced']} dropped={outboxes['dropped']} "
+                             f"overflow_disconnects={outboxes['overflow_disconnects']}")
+        resync = self.resync_stats
+        if any(resync.values()):
+            self.logger.info(f"🔁 RESYNC: kept={resync['kept']} delta={resync['delta']} "
+                             f"unloaded={resync['unloaded']}")
+        moves = self.move_stats
+        if any(moves.values()):
+            self.logger.info(f"🚶 MOVES: applied={moves['applied']} coalesced={moves['coalesced']} "
+                             f"rejected={moves['rejected']}")
+        stats = self.compression_stats
+        if stats["compressed"]:
+            self.logger.info(f"🗜️ COMPRESSION: {stats['compressed']} frames, "
+                             f"{(stats['bytes_in'] - stats['bytes_out']) // 1024} KiB saved "
+                             f"({stats['bytes_out'] / stats['bytes_in']:.0%} of original), "
+                             f"{stats['cpu_seconds'] * 1000:.0f} ms CPU, {stats['skipped']} skipped")
         if not self.players:
             self.logger.info("📊 PLAYER DEBUG SUMMARY: No players connected")
             return
@@ -737,21 +1432,87 @@ class MinecraftServer:
                            f"vel={player.velocity}, on_ground={player.on_ground}, "
                            f"last_move={last_move_ago:.1f}s ago")
 
+    def players_in_interest(self, player_id: str) -> Set[str]:
+        """Connected players whose moves the client of player_id receives (itself included).
+
+        Players enter the area of interest within interest_radius blocks
+        (horizontally) and leave it beyond interest_radius + INTEREST_HYSTERESIS.
+        """
+        if self.interest_radius is None:
+            return set(self.clients)
+        player = self.players.get(player_id)
+        if player is None:
+            return set()
+        current = self.interest.get(player_id, ())
+        enter = self.interest_radius ** 2
+        return {pid for pid, distance in self.player_grid.near(player.position,
+                                                                self.interest_radius + INTEREST_HYSTERESIS)
+                if pid in self.clients and (distance <= enter or pid in current)}
+
     async def _broadcast_physics_updates(self):
-        """Broadcast physics updates for all players."""
-        for player in self.players.values():
-            if player.id in self.clients:
-                update_msg = create_player_update_message(player)
-                # Send this player's position to all OTHER players (not to themselves)
-                await self.broadcast_message(update_msg, exclude_player=player.id)
+        """Send this tick's PLAYER_SNAPSHOT to every client.
+
+        Each client only hears about the players in its area of interest: the
+        quantized fields that changed since the last tick, full entries for
+        players that just came into range, and the ids of those that left.
+        Clients without a valid baseline, because they just joined or lost
+        frames to a full outbox, get a keyframe instead, and so does everyone
+        every SNAPSHOT_KEYFRAME_INTERVAL ticks. Entries are JSON-encoded once
+        per tick and clients with the same view share one frame.
+        """
+        self.snapshot_tick += 1
+        tick = self.snapshot_tick
+        states = {player.id: quantize_player_state(player)
+                  for player in self.players.values() if player.id in self.clients}
+        deltas = {}
+        for player_id, state in states.items():
+            delta = player_state_delta(state, self.snapshot_states.get(player_id))
+            if delta is not None:
+                deltas[player_id] = json.dumps(delta)
+        self.snapshot_states = states
+        full = {}
+
+        def full_entry(player_id):
+            if player_id not in full:
+                full[player_id] = json.dumps(states[player_id])
+            return full[player_id]
+
+        keyframe_tick = tick % SNAPSHOT_KEYFRAME_INTERVAL == 0
+        built: Dict[tuple, Optional[str]] = {}  # View -> frame, shared by clients with the same view
+        recipients: Dict[str, List[str]] = {}
+        for client_id, outbox in self.outboxes.items():
+            resync = keyframe_tick or client_id not in self.interest
+            if self.snapshot_drops.get(client_id) != outbox.dropped:
+                self.snapshot_drops[client_id] = outbox.dropped
+                resync = True
+            visible = frozenset(self.players_in_interest(client_id))
+            old = None if resync else frozenset(self.interest[client_id])
+            self.interest[client_id] = visible
+            view = (visible, old)
+            if view not in built:
+                if resync:
+                    built[view] = encode_player_snapshot(tick, [full_entry(pid) for pid in sorted(visible)], True)
+                else:
+                    parts = [full_entry(pid) if pid not in old else deltas[pid]
+                             for pid in sorted(visible) if pid not in old or pid in deltas]
+                    left = sorted(old - visible)
+                    built[view] = encode_player_snapshot(tick, parts, False, left) if parts or left else None
+            if built[view] is not None:
+                recipients.setdefault(built[view], []).append(client_id)
+        for frame, client_ids in recipients.items():
+            self.fan_out(MessageType.PLAYER_SNAPSHOT, frame, client_ids)
 
     async def register_client(self, websocket) -> str:
         """Register a new client connection and create a user cube."""
         player_id = str(uuid.uuid4())
         self.clients[player_id] = websocket
+        outbox = ClientOutbox(websocket, self.outbox_size)
+        outbox.task = asyncio.create_task(self._run_outbox(player_id, outbox))
+        self.outboxes[player_id] = outbox
         
         # Create a new connected player
         self.players[player_id] = PlayerState(player_id, DEFAULT_SPAWN_POSITION, (0, 0), is_connected=True, is_rtsp_user=False)
+        self.player_grid.move(player_id, DEFAULT_SPAWN_POSITION)
         
         # Create a cube for this user with dedicated port
         user_cube = Cube(
@@ -770,6 +1531,18 @@ class MinecraftServer:
         """Unregister a client connection and clean up cube."""
         if player_id in self.clients:
             self.clients.pop(player_id, None)
+            outbox = self.outboxes.pop(player_id, None)
+            if outbox is not None and outbox.task is not asyncio.current_task():
+                outbox.task.cancel()
+            self.chunk_encodings.pop(player_id, None)
+            self.message_codecs.pop(player_id, None)
+            self.compression_clients.discard(player_id)
+            self.streamed_chunks.pop(player_id, None)
+            self.stream_centers.pop(player_id, None)
+            self.snapshot_drops.pop(player_id, None)
+            self.interest.pop(player_id, None)
+            self.pending_moves.pop(player_id, None)
+            self.player_grid.remove(player_id)
             
             # Clean up user cube
             if player_id in self.user_cubes:
@@ -791,63 +1564,282 @@ class MinecraftServer:
                 self.logger.info(f"Player {player.name} ({player_id}) disconnected")
                 await self.broadcast_player_list()
 
-    async def broadcast_message(self, message: Message, exclude_player: Optional[str] = None):
-        """Broadcast a message to all connected clients with enhanced debugging."""
+    async def broadcast_message(self, message: Message, exclude_player: Optional[str] = None,
+                                recipients: Optional[Iterable[str]] = None):
+        """Queue a message for all connected clients, or only `recipients` (encoded once per
+        codec, never waits on a socket)."""
         if not self.clients:
             self.logger.debug("📡 No clients connected for broadcast")
             return
-            
-        json_msg = message.to_json()
-        disconnected = []
-        sent_count = 0
-        
-        # Debug log for player updates specifically
-        if message.type == MessageType.PLAYER_UPDATE:
-            player_data = message.data
-            sender_name = self.players.get(player_data.get("id", ""), type('obj', (object,), {'name': 'Unknown'})).name
-            self.logger.debug(f"📡 Broadcasting player update from {sender_name or 'Unknown'}")
-        
-        for pid, ws in list(self.clients.items()):
-            if exclude_player == pid:
-                continue
-                
-            try:
-                await ws.send(json_msg)
-                sent_count += 1
-                
-                # Debug log successful sends for player updates
-                if message.type == MessageType.PLAYER_UPDATE:
-                    receiver_name = self.players.get(pid, type('obj', (object,), {'name': 'Unknown'})).name
-                    self.logger.debug(f"   ✅ Sent to {receiver_name or pid[:8]}")
-                    
-            except websockets.exceptions.ConnectionClosed:
-                disconnected.append(pid)
-                self.logger.warning(f"   ❌ Connection closed for {pid[:8]}")
-            except Exception as e:
-                self.logger.error(f"   ❌ Error sending message to {pid[:8]}: {e}")
-                disconnected.append(pid)
-        
-        # Log broadcast summary
-        if message.type == MessageType.PLAYER_UPDATE:
-            self.logger.info(f"📡 Broadcast complete: {sent_count} players notified, {len(disconnected)} disconnected")
-        
-        # Clean up disconnected clients
-        for pid in disconnected:
-            await self.unregister_client(pid)
+        if recipients is None:
+            recipients = self.outboxes
+        recipients = [pid for pid in recipients if pid != exclude_player and pid in self.outboxes]
+        by_codec: Dict[str, List[str]] = {}
+        for pid in recipients:
+            by_codec.setdefault(self.message_codecs.get(pid, "json"), []).append(pid)
+        key = self._coalescing_key(message)
+        queued = sum(self.fan_out(message.type, encode_message(message, codec), pids, key)
+                     for codec, pids in by_codec.items())
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"📡 Broadcast {message.type.value}: {queued}/{len(recipients)} clients")
+
+    async def broadcast_block_updates(self, updates: List[BlockUpdate]) -> None:
+        """Send a WORLD_UPDATE to the clients holding the chunks it touches.
+
+        Each client only gets the blocks of the chunks it holds: clients that
+        unloaded a chunk (CHUNK_UNLOAD) would otherwise re-create stray blocks
+        of it.
+        """
+        chunk_of = [(update.position[0] // CHUNK_SIZE, update.position[2] // CHUNK_SIZE) for update in updates]
+        touched = set(chunk_of)
+        groups: Dict[frozenset, List[str]] = {}
+        for pid in self.outboxes:
+            held = frozenset(touched.intersection(self.streamed_chunks.get(pid, ())))
+            if held:
+                groups.setdefault(held, []).append(pid)
+        for held, pids in groups.items():
+            message = create_world_update_message([update for update, key in zip(updates, chunk_of) if key in held])
+            await self.broadcast_message(message, recipients=pids)
+
+    def fan_out(self, message_type: MessageType, frame, recipients: Iterable[str], key: Any = None) -> int:
+        """Queue one encoded frame for many clients; returns how many accepted it.
+
+        The frame is compressed at most once, for the first recipient that
+        negotiated compression. Clients that overflow are disconnected in bulk
+        after the fan-out (see _schedule_disconnect).
+        """
+        compressed = None
+        queued = 0
+        for pid in recipients:
+            if pid in self.compression_clients:
+                if compressed is None:
+                    compressed = self.compress(message_type, frame)
+                queued += self._enqueue(pid, compressed, key)
+            else:
+                queued += self._enqueue(pid, frame, key)
+        return queued
+
+    def get_chunk_payload(self, chunk_x: int, chunk_z: int, encoding: str = "json",
+                          compressed: bool = False, part: str = "all") -> Any:
+        """Return the encoded WORLD_CHUNK frame for a chunk (None if it has no blocks).
+
+        "json" frames are text messages, "binary" frames are bytes from
+        protocol.encode_chunk_frame; `compressed` wraps them per the
+        compression settings. `part` selects the blocks: "all", "surface"
+        (exposed blocks only) or "interior" (the rest); player (USER) blocks
+        are never included, players are replicated on their own. Frames are
+        cached per chunk and variant and reused until a block edit bumps the
+        chunk version, so joining players mostly get already encoded frames.
+        The version travels in the frame for clients to report on reconnect.
+        """
+        key = (chunk_x, chunk_z, encoding, compressed, part)
+        version = self.world.chunk_version(chunk_x, chunk_z)
+        cached = self.chunk_payloads.pop(key, None)
+        if cached is not None and cached[0] == version:
+            self.chunk_payload_hits += 1
+            frame = cached[1]
+        else:
+            self.chunk_payload_misses += 1
+            if compressed:
+                frame = self.get_chunk_payload(chunk_x, chunk_z, encoding, part=part)
+                if frame is not None:
+                    frame = self.compress(MessageType.WORLD_CHUNK, frame)
+            elif part != "all" or encoding == "binary":
+                codes = self.world.get_chunk_array(chunk_x, chunk_z)
+                codes[codes == TRANSIENT_CODE] = 0
+                if part != "all":
+                    surface = np.zeros(codes.shape, dtype=bool)
+                    exposed = self.world.exposed_blocks(chunk_x, chunk_z)
+                    if exposed:
+                        xs, ys, zs = np.array(list(exposed)).T
+                        surface[xs - chunk_x * CHUNK_SIZE, ys, zs - chunk_z * CHUNK_SIZE] = True
+                    codes[~surface if part == "surface" else surface] = 0
+                if not codes.any():
+                    frame = None
+                elif encoding == "binary":
+                    frame = encode_chunk_frame(chunk_x, chunk_z, codes, BLOCK_PALETTE, version)
+                else:
+                    xs, ys, zs = np.nonzero(codes)
+                    blocks = {f"{x},{y},{z}": BLOCK_PALETTE[code] for x, y, z, code in zip(
+                        (xs + chunk_x * CHUNK_SIZE).tolist(), ys.tolist(),
+                        (zs + chunk_z * CHUNK_SIZE).tolist(), codes[xs, ys, zs].tolist())}
+                    frame = create_world_chunk_message(
+                        {"chunk_x": chunk_x, "chunk_z": chunk_z, "version": version, "blocks": blocks}).to_json()
+            else:
+                chunk = self.world.get_world_chunk(chunk_x, chunk_z, DEFAULT_CHUNK_SIZE)
+                chunk["blocks"] = {key: block_type for key, block_type in chunk["blocks"].items()
+                                   if block_type != BlockType.USER}
+                chunk["version"] = version
+                frame = create_world_chunk_message(chunk).to_json() if chunk["blocks"] else None
+            if len(self.chunk_payloads) >= CHUNK_PAYLOAD_CACHE_SIZE:
+                del self.chunk_payloads[next(iter(self.chunk_payloads))]
+        self.chunk_payloads[key] = (version, frame)  # Reinserted: most recently used last
+        return frame
+
+    def compress(self, message_type: MessageType, frame):
+        """Return the frame to send to a client accepting compression.
+
+        Only COMPRESSED_MESSAGE_TYPES frames of at least compression_threshold
+        bytes are compressed (and only if that makes them smaller); bytes
+        saved and CPU time are counted in compression_stats.
+        """
+        if self.compression_level <= 0 or message_type not in COMPRESSED_MESSAGE_TYPES:
+            return frame
+        stats = self.compression_stats
+        if len(frame) < self.compression_threshold:
+            stats["skipped"] += 1
+            return frame
+        start = time.perf_counter()
+        compressed = compress_frame(frame, self.compression_level)
+        stats["cpu_seconds"] += time.perf_counter() - start
+        size = len(frame.encode()) if isinstance(frame, str) else len(frame)
+        if len(compressed) >= size:
+            stats["skipped"] += 1
+            return frame
+        stats["compressed"] += 1
+        stats["bytes_in"] += size
+        stats["bytes_out"] += len(compressed)
+        return compressed
+
+    async def stream_chunks(self, player_id: str) -> int:
+        """Bring a client's chunks up to date with its player's position.
+
+        Runs whenever the player enters another chunk: chunks within
+        view_radius it does not hold yet are sent nearest first, and chunks
+        more than view_radius + 1 away are unloaded with one CHUNK_UNLOAD
+        (the extra chunk avoids churn when walking along a border).
+
+        Only the surface shell (exposed blocks, all a client renders) of each
+        chunk is sent; buried blocks follow once every surface is out when
+        stream_interior is set, and otherwise reach clients as a dig exposes
+        them. Returns the number of chunk frames sent.
+        """
+        player = self.players.get(player_id)
+        if player is None or player_id not in self.clients:
+            return 0
+        x, _y, z = player.position
+        center = (int(x // CHUNK_SIZE), int(z // CHUNK_SIZE))
+        if self.stream_centers.get(player_id) == center:
+            return 0
+        self.stream_centers[player_id] = center
+        streamed = self.streamed_chunks.setdefault(player_id, set())
+
+        far = [key for key in streamed
+               if max(abs(key[0] - center[0]), abs(key[1] - center[1])) > self.view_radius + 1]
+        if far:
+            streamed.difference_update(far)
+            await self.send_to_client(player_id, create_chunk_unload_message(far))
+
+        encoding = self.chunk_encodings.get(player_id, "json")
+        compressed = player_id in self.compression_clients
+        new = [key for key in self.world.chunks_by_distance(player.position, self.view_radius)
+               if key not in streamed]
+        streamed.update(new)
+        sent = 0
+        for part in ("surface", "interior") if self.stream_interior else ("surface",):
+            for cx, cz in new:
+                frame = self.get_chunk_payload(cx, cz, encoding, compressed, part)
+                if frame is not None:
+                    await self.send_frame_to_client(player_id, frame)
+                    sent += 1
+                if player_id not in self.clients:
+                    return sent
+        return sent
 
     async def send_to_client(self, player_id: str, message: Message):
-        """Send a message to a specific client."""
-        if player_id not in self.clients:
+        """Queue a message for a specific client, in the codec it negotiated."""
+        frame = encode_message(message, self.message_codecs.get(player_id, "json"))
+        if player_id in self.compression_clients:
+            frame = self.compress(message.type, frame)
+        self._enqueue(player_id, frame, self._coalescing_key(message))
+
+    async def send_frame_to_client(self, player_id: str, frame):
+        """Queue an already encoded message (text or binary frame) for a specific client."""
+        self._enqueue(player_id, frame)
+
+    @staticmethod
+    def _coalescing_key(message: Message) -> Any:
+        """Messages with the same key supersede each other while still queued."""
+        if message.type == MessageType.PLAYER_UPDATE:
+            return (MessageType.PLAYER_UPDATE.value, message.data.get("id"))
+        if message.type == MessageType.MOVE_ACK:
+            # A later ack supersedes a queued correction: the move it acks was
+            # accepted from the server's position, so the client is back in sync
+            return MessageType.MOVE_ACK.value
+        return None
+
+    def _enqueue(self, player_id: str, frame, key: Any = None) -> bool:
+        """Put a frame in a client's outbox, applying the overflow policy if it is full."""
+        outbox = self.outboxes.get(player_id)
+        if outbox is None:
             self.logger.warning(f"Attempted to send message to non-existent client: {player_id}")
-            return
-            
+            return False
+        if player_id in self.pending_disconnects:
+            return False
+        if outbox.put(frame, key):
+            return True
+        if self.outbox_policy == "disconnect":
+            self.logger.warning(f"Outbound queue of {player_id} full ({outbox.max_size} frames); disconnecting")
+            self.overflow_disconnects += 1
+            self._schedule_disconnect(player_id, close=True)
+        return False
+
+    async def _run_outbox(self, player_id: str, outbox: ClientOutbox) -> None:
+        """Writer task of one client."""
         try:
-            await self.clients[player_id].send(message.to_json())
+            await outbox.run()
         except websockets.exceptions.ConnectionClosed:
-            await self.unregister_client(player_id)
+            self._schedule_disconnect(player_id)
         except Exception as e:
             self.logger.error(f"Error sending message to {player_id}: {e}")
-            await self.unregister_client(player_id)
+            self._schedule_disconnect(player_id)
+
+    def _schedule_disconnect(self, player_id: str, close: bool = False) -> None:
+        """Mark a client as gone; all marked clients are cleaned up together by one task."""
+        if player_id in self.pending_disconnects:
+            return
+        self.pending_disconnects[player_id] = close
+        if self._disconnect_task is None or self._disconnect_task.done():
+            self._disconnect_task = asyncio.create_task(self._reap_disconnects())
+
+    async def _reap_disconnects(self) -> None:
+        """Close and unregister every client marked since the last pass."""
+        await asyncio.sleep(0)  # Let the current fan-out finish first
+        while self.pending_disconnects:
+            doomed = dict(self.pending_disconnects)
+            closing = [self.outboxes[pid] for pid, close in doomed.items() if close and pid in self.outboxes]
+            for outbox in closing:
+                outbox.task.cancel()
+            await asyncio.gather(*(outbox.websocket.close(code=1008, reason="Outbound queue overflow")
+                                   for outbox in closing), return_exceptions=True)
+            for pid in list(doomed):
+                await self.unregister_client(pid)
+            for pid in doomed:
+                self.pending_disconnects.pop(pid, None)
+
+    async def flush_outboxes(self, player_ids: Optional[Iterable[str]] = None) -> None:
+        """Wait until the clients' queues are written out and failed clients are cleaned up."""
+        while True:
+            if self._disconnect_task is not None:
+                await self._disconnect_task
+            ids = list(self.outboxes) if player_ids is None else player_ids
+            await asyncio.gather(*(self.outboxes[pid].drain() for pid in ids if pid in self.outboxes))
+            if not self.pending_disconnects:
+                return
+
+    def outbox_stats(self) -> Dict[str, int]:
+        """Aggregate outbound queue metrics over the connected clients."""
+        outboxes = list(self.outboxes.values())
+        return {
+            "clients": len(outboxes),
+            "queued": sum(len(outbox) for outbox in outboxes),
+            "deepest": max((len(outbox) for outbox in outboxes), default=0),
+            "max_depth": max((outbox.max_depth for outbox in outboxes), default=0),
+            "sent": sum(outbox.sent for outbox in outboxes),
+            "coalesced": sum(outbox.coalesced for outbox in outboxes),
+            "dropped": sum(outbox.dropped for outbox in outboxes),
+            "overflow_disconnects": self.overflow_disconnects,
+        }
 
     async def broadcast_player_list(self):
         """Broadcast updated player list to all clients."""
@@ -906,8 +1898,22 @@ class MinecraftServer:
             
         if len(player_name) > 32:  # Reasonable limit
             player_name = player_name[:32]
+
+        known_chunks = self._parse_known_chunks(message.data.get("known_chunks"))
             
         self.players[player_id].name = player_name.strip()
+
+        # Chunk encoding: the first one the client lists that the server supports
+        offered = message.data.get("chunk_encodings") or ["json"]
+        encoding = next((e for e in offered if e in CHUNK_ENCODINGS), "json")
+        self.chunk_encodings[player_id] = encoding
+        compression = "zlib" if ("zlib" in (message.data.get("compression") or [])
+                                 and self.compression_level > 0) else None
+        if compression:
+            self.compression_clients.add(player_id)
+        offered = message.data.get("message_codecs") or ["json"]
+        codec = next((c for c in offered if c in MESSAGE_CODECS), "json")
+        self.message_codecs[player_id] = codec
         
         # Add user block for this player
         player = self.players[player_id]
@@ -916,100 +1922,170 @@ class MinecraftServer:
         # Send world initialization with player ID
         world_data = self.world.get_world_data()
         world_data["player_id"] = player_id  # Include player ID so client knows its own ID
+        world_data["chunk_encoding"] = encoding
+        world_data["compression"] = compression
+        world_data["message_codec"] = codec
+        world_data["world_epoch"] = self.world.epoch
         await self.send_to_client(player_id, create_world_init_message(world_data))
+        if known_chunks:
+            await self._resync_known_chunks(player_id, known_chunks)
         
-        # Send world chunks
-        chunks_sent = 0
-        for cx in range(WORLD_SIZE // DEFAULT_CHUNK_SIZE):
-            for cz in range(WORLD_SIZE // DEFAULT_CHUNK_SIZE):
-                chunk = self.world.get_world_chunk(cx, cz, DEFAULT_CHUNK_SIZE)
-                if chunk["blocks"]:
-                    await self.send_to_client(player_id, create_world_chunk_message(chunk))
-                    chunks_sent += 1
-                    
+        # Send the chunks within the view radius, closest to the player first
+        chunks_sent = await self.stream_chunks(player_id)
         self.logger.info(f"Sent {chunks_sent} chunks to player {player_name}")
         await self.broadcast_player_list()
 
+    def _parse_known_chunks(self, known: Any) -> Dict[Tuple[int, int], int]:
+        """Return the chunk versions a reconnecting client reported (empty if from another world)."""
+        if known is None:
+            return {}
+        if not isinstance(known, dict) or not isinstance(known.get("chunks"), list):
+            raise InvalidPlayerDataError("Invalid known_chunks format")
+        chunks = {}
+        for entry in known["chunks"]:
+            if not isinstance(entry, list) or len(entry) != 3 or not all(type(value) is int for value in entry):
+                raise InvalidPlayerDataError("Known chunks must be [chunk_x, chunk_z, version] integers")
+            chunks[(entry[0], entry[1])] = entry[2]
+        if known.get("epoch") != self.world.epoch:
+            # Versions from another world or server run: drop everything the client holds
+            return {key: -1 for key in chunks}
+        return chunks
+
+    async def _resync_known_chunks(self, player_id: str, known_chunks: Dict[Tuple[int, int], int]):
+        """Bring the chunks a reconnecting client still holds up to date without resending them.
+
+        Chunks in view at an unchanged version are kept as they are. Changed
+        ones get a CHUNK_DELTA with their logged edits when it is smaller
+        than the chunk's surface frame. The rest are unloaded, and
+        stream_chunks sends them again if they are in view.
+        """
+        player = self.players[player_id]
+        in_view = set(self.world.chunks_by_distance(player.position, self.view_radius))
+        encoding = self.chunk_encodings.get(player_id, "json")
+        codec = self.message_codecs.get(player_id, "json")
+        streamed = self.streamed_chunks.setdefault(player_id, set())
+        stats = self.resync_stats
+        stale = []
+        for (chunk_x, chunk_z), version in known_chunks.items():
+            edits = self.world.chunk_edits_since(chunk_x, chunk_z, version) if (chunk_x, chunk_z) in in_view else None
+            if edits:
+                delta = create_chunk_delta_message(chunk_x, chunk_z, self.world.chunk_version(chunk_x, chunk_z), edits)
+                frame = self.get_chunk_payload(chunk_x, chunk_z, encoding, part="surface")
+                if frame is not None and len(encode_message(delta, codec)) >= len(frame):
+                    edits = None
+                else:
+                    await self.send_to_client(player_id, delta)
+                    stats["delta"] += 1
+            elif edits is not None:
+                stats["kept"] += 1
+            if edits is None:
+                stale.append((chunk_x, chunk_z))
+                stats["unloaded"] += 1
+            else:
+                streamed.add((chunk_x, chunk_z))
+        if stale:
+            await self.send_to_client(player_id, create_chunk_unload_message(stale))
+        self.logger.info(f"🔁 Resync for {player.name}: {len(known_chunks) - len(stale)} of "
+                         f"{len(known_chunks)} held chunks reused")
+
     async def _handle_player_move(self, player_id: str, message: Message):
-        """Handle player movement with absolute position updates only."""
+        """Buffer a movement; the latest one per player is applied at the next tick.
+
+        Only the message format is checked here. Validation, collision checks
+        and the broadcast happen once per tick in _apply_pending_moves, so a
+        client sending faster than the tick rate costs no extra work.
+        """
         if player_id not in self.players:
             raise InvalidPlayerDataError(f"Player {player_id} not found")
             
         try:
             rotation = message.data["rotation"]
-            
             if not isinstance(rotation, (list, tuple)) or len(rotation) != 2:
                 raise InvalidPlayerDataError("Invalid rotation format")
-            
-            player = self.players[player_id]
+            if not all(isinstance(angle, (int, float)) for angle in rotation):
+                raise InvalidPlayerDataError("Rotation angles must be numeric")
             
             # Only handle absolute position-based movement
             if "position" not in message.data:
                 raise InvalidPlayerDataError("Missing required field: 'position' must be provided")
-                
             position = message.data["position"]
-            
             if not isinstance(position, (list, tuple)) or len(position) != 3:
                 raise InvalidPlayerDataError("Invalid position format")
-                
-            new_position = tuple(position)
-            
-            # ENHANCED DEBUG: Log detailed movement information
-            old_position = player.position
-            old_x, old_y, old_z = old_position
-            new_x, new_y, new_z = new_position
-            dx, dy, dz = new_x - old_x, new_y - old_y, new_z - old_z
-            movement_distance = (dx**2 + dy**2 + dz**2)**0.5
-            
-            self.logger.info(f"🚶 PLAYER_MOVE DEBUG - Player {player.name or player_id[:8]}")
-            self.logger.info(f"   Old position: {old_position}")
-            self.logger.info(f"   New position: {new_position}")
-            self.logger.info(f"   Delta: dx={dx:.2f}, dy={dy:.2f}, dz={dz:.2f}")
-            self.logger.info(f"   Distance: {movement_distance:.2f}")
-            self.logger.info(f"   Rotation: {rotation}")
-            
-            # Anti-cheat: validate reasonable movement distance from current position
-            if abs(dx) > 50 or abs(dy) > 50 or abs(dz) > 50:
-                self.logger.warning(f"❌ ANTI-CHEAT: Movement distance too large for {player.name}")
-                raise InvalidPlayerDataError("Movement distance too large")
-            
-            if not validate_position(new_position):
-                self.logger.warning(f"❌ ANTI-CHEAT: Invalid position {new_position} for {player.name}")
-                raise InvalidPlayerDataError("Invalid target position")
-            
-            # Check for collision with blocks
-            if self._check_ground_collision(new_position):
-                self.logger.warning(f"🚫 COLLISION: Player {player.name or player_id[:8]} blocked by blocks at {new_position}")
-                raise InvalidPlayerDataError("Movement blocked by blocks")
-            
-            # Check for player-to-player collision
-            if self._check_player_collision(player_id, new_position):
-                self.logger.warning(f"🚫 COLLISION: Player {player.name or player_id[:8]} blocked by other player at {new_position}")
-                raise InvalidPlayerDataError("Movement blocked by another player")
-                
-            # Enhanced position validation
-            if not isinstance(new_position, (tuple, list)) or len(new_position) != 3:
-                self.logger.warning(f"❌ VALIDATION: Invalid position format {new_position} for {player.name}")
-                raise InvalidPlayerDataError("Position must be a 3-element array")
-            
-            # Validate position coordinates are numeric
-            x, y, z = new_position
-            if not all(isinstance(coord, (int, float)) for coord in [x, y, z]):
-                self.logger.warning(f"❌ VALIDATION: Non-numeric position coordinates {new_position} for {player.name}")
+            if not all(isinstance(coord, (int, float)) for coord in position):
                 raise InvalidPlayerDataError("Position coordinates must be numeric")
+            seq = message.data.get("seq")
+            if seq is not None and not isinstance(seq, int):
+                raise InvalidPlayerDataError("Move sequence number must be an integer")
+        except KeyError as e:
+            raise InvalidPlayerDataError(f"Missing required field: {e}")
+
+        if player_id in self.pending_moves:
+            self.move_stats["coalesced"] += 1
+        self.pending_moves[player_id] = (tuple(position), tuple(rotation), seq)
+
+    def _validate_move(self, player: PlayerState, new_position: Tuple[float, float, float]) -> Optional[str]:
+        """Return why a move from the player's last accepted position is refused (None if valid)."""
+        old_x, old_y, old_z = player.position
+        new_x, new_y, new_z = new_position
+        dx, dy, dz = new_x - old_x, new_y - old_y, new_z - old_z
+        
+        # Anti-cheat: validate reasonable movement distance from current position
+        if abs(dx) > 50 or abs(dy) > 50 or abs(dz) > 50:
+            return "Movement distance too large"
+        if not validate_position(new_position, self.world.world_size):
+            return "Invalid target position"
+        
+        # Swept check: the straight path from the last accepted position must
+        # not go through blocks. Samples every MOVE_SWEEP_STEP blocks catch any
+        # wall thick enough to stop the player box. The first MOVE_SWEEP_START
+        # blocks are what the player already occupies (its own user block).
+        distance = (dx * dx + dy * dy + dz * dz) ** 0.5
+        step = MOVE_SWEEP_START
+        while step < distance:
+            t = step / distance
+            if self._check_ground_collision((old_x + dx * t, old_y + dy * t, old_z + dz * t)):
+                return "Movement blocked by blocks"
+            step += MOVE_SWEEP_STEP
+        if self._check_ground_collision(new_position):
+            return "Movement blocked by blocks"
+        
+        # Check for player-to-player collision
+        if self._check_player_collision(player.id, new_position):
+            return "Movement blocked by another player"
+        return None
+
+    async def _apply_pending_moves(self):
+        """Validate and apply the latest buffered move of each player (once per tick).
+
+        Accepted moves go out with this tick's PLAYER_SNAPSHOT and are not
+        echoed to the sender: sequenced moves only get a MOVE_ACK. A refused
+        move gets the authoritative state back so the client can correct
+        itself (in the MOVE_ACK, or as an error and a PLAYER_UPDATE for
+        clients that don't number their moves).
+        """
+        moves, self.pending_moves = self.pending_moves, {}
+        for player_id, (new_position, rotation, seq) in moves.items():
+            player = self.players.get(player_id)
+            if player is None or player_id not in self.clients:
+                continue
             
-            # Validate rotation
-            if not isinstance(rotation, (tuple, list)) or len(rotation) != 2:
-                self.logger.warning(f"❌ VALIDATION: Invalid rotation format {rotation} for {player.name}")
-                raise InvalidPlayerDataError("Rotation must be a 2-element array")
-            
-            h, v = rotation
-            if not all(isinstance(angle, (int, float)) for angle in [h, v]):
-                self.logger.warning(f"❌ VALIDATION: Non-numeric rotation angles {rotation} for {player.name}")
-                raise InvalidPlayerDataError("Rotation angles must be numeric")
+            reason = self._validate_move(player, new_position)
+            if reason is not None:
+                self.move_stats["rejected"] += 1
+                self.logger.warning(f"❌ PLAYER_MOVE refused for {player.name or player_id[:8]}: "
+                                    f"{player.position} -> {new_position} ({reason})")
+                if seq is not None:
+                    await self.send_to_client(player_id, create_move_ack_message(seq, correction=player))
+                else:
+                    await self.send_to_client(player_id, Message(MessageType.ERROR, {"message": reason}))
+                    await self.send_to_client(player_id, create_player_update_message(player))
+                continue
             
+            self.logger.debug(f"🚶 PLAYER_MOVE {player.name or player_id[:8]}: {player.position} -> {new_position}, "
+                              f"rotation {rotation}")
             player.position = new_position
-            player.rotation = tuple(rotation)
+            player.rotation = rotation
+            self.player_grid.move(player_id, new_position)
             
             # Update user block position
             self.world.add_user_block(player_id, new_position)
@@ -1019,20 +2095,12 @@ class MinecraftServer:
             player.velocity = [0.0, 0.0, 0.0]
             player.on_ground = True  # Assume player is on ground after movement
             player.last_move_time = time.time()  # Mark when player last moved voluntarily
+            self.move_stats["applied"] += 1
+            if seq is not None:
+                await self.send_to_client(player_id, create_move_ack_message(seq))
 
-            # ENHANCED BROADCAST: Send to other players with debug logging
-            other_players_count = len([p for p in self.clients.keys() if p != player_id])
-            self.logger.info(f"📡 Broadcasting position update to {other_players_count} other players")
-            
-            update_message = create_player_update_message(player)
-            await self.broadcast_message(update_message, exclude_player=player_id)
-
-            # Send updated position back to player (confirmation)
-            self.logger.debug(f"✅ Sending position confirmation to {player.name}")
-            await self.send_to_client(player_id, update_message)
-            
-        except KeyError as e:
-            raise InvalidPlayerDataError(f"Missing required field: {e}")
+            # Stream chunks entering the view radius (and unload far ones) on chunk changes
+            await self.stream_chunks(player_id)
 
     async def _handle_block_place(self, player_id: str, message: Message):
         """Handle block placement with validation."""
@@ -1066,10 +2134,7 @@ class MinecraftServer:
                 self.logger.info(f"Created camera cube '{block_id}' owned by player {player_id}")
                 
             if self.world.add_block(position, block_type, block_id=block_id, owner=owner):
-                update_message = create_world_update_message([
-                    BlockUpdate(position, block_type, player_id)
-                ])
-                await self.broadcast_message(update_message)
+                await self.broadcast_block_updates([BlockUpdate(position, block_type, player_id)])
                 self.logger.info(f"Player {player_id} placed {block_type} at {position}" + 
                                (f" with block_id {block_id}" if block_id else ""))
             else:
@@ -1089,12 +2154,13 @@ class MinecraftServer:
             if not isinstance(position, (list, tuple)) or len(position) != 3:
                 raise InvalidWorldDataError("Invalid position format")
             
-            # Get block data before removing to check if it's a camera
+            # Get block data before removing to check if it's a camera, and the
+            # buried neighbours the dig exposes (clients only hold the surface)
             block_data = self.world.world.get(position)
+            hidden = self.world.hidden_neighbors(position) if block_data is not None else []
             camera_block_id = None
-            if isinstance(block_data, dict):
-                if block_data.get("type") == BlockType.CAMERA:
-                    camera_block_id = block_data.get("block_id")
+            if block_data is not None and block_data.type == BlockType.CAMERA:
+                camera_block_id = block_data.block_id
                 
             if self.world.remove_block(position):
                 # Clean up camera cube if this was a camera block
@@ -1107,10 +2173,9 @@ class MinecraftServer:
                     del self.camera_cubes[camera_block_id]
                     self.logger.info(f"Cleaned up camera cube '{camera_block_id}'")
                     
-                update_message = create_world_update_message([
-                    BlockUpdate(position, BlockType.AIR, player_id)
-                ])
-                await self.broadcast_message(update_message)
+                await self.broadcast_block_updates(
+                    [BlockUpdate(position, BlockType.AIR, player_id)] +
+                    [BlockUpdate(neighbor, self.world.world[neighbor].type) for neighbor in hidden])
                 self.logger.info(f"Player {player_id} destroyed block at {position}")
             else:
                 await self.send_to_client(player_id, Message(
@@ -1257,7 +2322,7 @@ class MinecraftServer:
         try:
             async for msg_str in websocket:
                 try:
-                    message = Message.from_json(msg_str)
+                    message = decode_message(msg_str)
                     message.player_id = player_id
                     await self.handle_client_message(player_id, message)
                 except Exception as e:
@@ -1278,9 +2343,12 @@ class MinecraftServer:
         self.running = True
         self.logger.info(f"Starting Minecraft server on {self.host}:{self.port}")
         
+        compaction_task = None
         try:
             # Start physics update loop
             physics_task = asyncio.create_task(self._physics_update_loop())
+            if self.journal is not None:
+                compaction_task = asyncio.create_task(self._journal_compaction_loop())
             
             server = await websockets.serve(self.handle_client, self.host, self.port)
             self.logger.info(f"Server started! Connect clients to ws://{self.host}:{self.port}")
@@ -1292,8 +2360,30 @@ class MinecraftServer:
             self.logger.error(f"Server error: {e}")
         finally:
             self.running = False
+            if compaction_task is not None:
+                # A snapshot write already under way still lands (see compact_async)
+                compaction_task.cancel()
+                try:
+                    await compaction_task
+                except asyncio.CancelledError:
+                    pass
+            self.world.flush()
+            if self.journal is not None:
+                if self.journal.edits_since_compaction:
+                    self.journal.compact(self.world)  # The next start replays no journal tail
+                self.journal.close()
             raise
 
+    async def _journal_compaction_loop(self):
+        """Fold the block journal into a snapshot once enough edits have accumulated."""
+        while self.running:
+            await asyncio.sleep(JOURNAL_COMPACT_CHECK_INTERVAL)
+            if self.journal.needs_compaction:
+                try:
+                    await self.journal.compact_async(self.world)
+                except Exception as e:
+                    self.logger.error(f"Block journal compaction failed: {e}")
+
     def stop_server(self):
         """Stop the server."""
         self.running = False
@@ -1311,13 +2401,72 @@ def main():
                         help='Port du serveur (défaut: 8765)')
     parser.add_argument('--reset-world', action='store_true',
                         help='Réinitialiser le monde au terrain naturel (supprime tous les blocs avec propriétaire, caméras, utilisateurs et blocs ajoutés)')
+    parser.add_argument('--world-storage', choices=STORAGE_BACKENDS, default=None,
+                        help='Moteur de stockage des blocs: dict ou voxel (tableaux NumPy par chunk) (défaut: dict, voxel avec --world-cache)')
+    parser.add_argument('--world-size', type=int, default=WORLD_SIZE, metavar='N',
+                        help=f'Taille du monde en blocs (X et Z); 0 = illimité, les chunks sont générés à la demande (nécessite --world-storage voxel) (défaut: {WORLD_SIZE})')
+    parser.add_argument('--gen-workers', type=int, default=DEFAULT_GENERATION_WORKERS, metavar='N',
+                        help=f'Nombre de processus pour générer le terrain; 0 = un par cœur (défaut: {DEFAULT_GENERATION_WORKERS}, au plus 4)')
+    parser.add_argument('--compression-threshold', type=int, default=DEFAULT_COMPRESSION_THRESHOLD, metavar='BYTES',
+                        help=f'Taille minimale des messages volumineux (chunks, listes) compressés avec zlib (défaut: {DEFAULT_COMPRESSION_THRESHOLD})')
+    parser.add_argument('--compression-level', type=int, default=DEFAULT_COMPRESSION_LEVEL, choices=range(10), metavar='0-9',
+                        help=f'Niveau de compression zlib; 0 = désactivée (défaut: {DEFAULT_COMPRESSION_LEVEL})')
+    parser.add_argument('--view-radius', type=int, default=DEFAULT_VIEW_RADIUS, metavar='CHUNKS',
+                        help=f'Rayon (en chunks) des chunks envoyés autour de chaque joueur (défaut: {DEFAULT_VIEW_RADIUS})')
+    parser.add_argument('--stream-interior', action='store_true',
+                        help="Envoyer aussi les blocs enfouis après la surface (par défaut, seulement quand un creusage les expose)")
+    parser.add_argument('--outbox-size', type=int, default=DEFAULT_OUTBOX_SIZE, metavar='FRAMES',
+                        help=f"Taille de la file d'envoi de chaque client (défaut: {DEFAULT_OUTBOX_SIZE})")
+    parser.add_argument('--outbox-policy', choices=OUTBOX_OVERFLOW_POLICIES, default='disconnect',
+                        help="Quand la file d'un client est pleine: le déconnecter ou ignorer les nouveaux messages (défaut: disconnect)")
+    parser.add_argument('--interest-radius', type=float, default=DEFAULT_INTEREST_RADIUS, metavar='BLOCKS',
+                        help=f"Distance à laquelle un joueur reçoit les mouvements des autres, 0 = tous (défaut: {DEFAULT_INTEREST_RADIUS})")
+    parser.add_argument('--world-cache', type=str, default=None, metavar='DIR',
+                        help='Répertoire du cache de monde: charge le monde généré depuis un instantané .npz (clé: graine, taille, version du générateur) au lieu de le régénérer (nécessite --world-storage voxel, choisi par défaut)')
+    parser.add_argument('--world-regions', type=str, default=None, metavar='DIR',
+                        help='Répertoire des fichiers de région: les chunks restent sur disque et sont chargés (mmap) au premier accès (nécessite --world-storage voxel)')
+    parser.add_argument('--chunk-memory', type=float, default=None, metavar='MB',
+                        help='Budget mémoire des chunks en Mo: les chunks froids sont écrits sur disque et déchargés (LRU), ceux proches des joueurs restent en mémoire (nécessite --world-regions)')
+    parser.add_argument('--journal', type=str, default=None, metavar='DIR',
+                        help='Répertoire du journal des modifications de blocs: les blocs posés/détruits survivent à un redémarrage ou un crash')
+    parser.add_argument('--journal-fsync', choices=FSYNC_POLICIES, default=DEFAULT_FSYNC_POLICY,
+                        help=f'Politique fsync du journal: always (chaque lot), interval (au plus une fois par seconde) ou never (défaut: {DEFAULT_FSYNC_POLICY})')
     
     args = parser.parse_args()
+    if args.world_storage is None:
+        args.world_storage = 'voxel' if args.world_cache else 'dict'
+    if args.interest_radius < 0:
+        parser.error('--interest-radius doit être positif ou nul')
+    if args.outbox_size < 1:
+        parser.error('--outbox-size doit être au moins 1')
+    if args.view_radius < 0:
+        parser.error('--view-radius doit être positif ou nul')
+    if args.gen_workers < 0:
+        parser.error('--gen-workers doit être positif ou nul')
+    if args.world_size < 0:
+        parser.error('--world-size doit être positif ou nul')
+    if args.world_size == 0 and args.world_storage != 'voxel':
+        parser.error('--world-size 0 (monde illimité) nécessite --world-storage voxel')
+    if args.world_regions and args.world_storage != 'voxel':
+        parser.error('--world-regions nécessite --world-storage voxel')
+    if args.world_cache and args.world_storage != 'voxel':
+        parser.error('--world-cache nécessite --world-storage voxel')
+    if args.chunk_memory is not None and not args.world_regions:
+        parser.error('--chunk-memory nécessite --world-regions')
     
     if args.reset_world:
         logging.info("🔄 Mode réinitialisation du monde activé - suppression des blocs non-naturels au démarrage")
     
-    server = MinecraftServer(host=args.host, port=args.port, reset_world=args.reset_world)
+    server = MinecraftServer(host=args.host, port=args.port, reset_world=args.reset_world,
+                             world_storage=args.world_storage, world_cache=args.world_cache,
+                             journal_dir=args.journal, journal_fsync=args.journal_fsync,
+                             region_dir=args.world_regions, chunk_memory_mb=args.chunk_memory,
+                             world_size=args.world_size, generation_workers=args.gen_workers,
+                             compression_threshold=args.compression_threshold,
+                             compression_level=args.compression_level, view_radius=args.view_radius,
+                             stream_interior=args.stream_interior,
+                             outbox_size=args.outbox_size, outbox_policy=args.outbox_policy,
+                             interest_radius=args.interest_radius)
     try:
         asyncio.run(server.start_server())
     except KeyboardInterrupt:
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for tests that drive a MinecraftServer without a network:
+a fake websocket collecting what the server sends to one client, and
+coroutines joining players and running server ticks.
+"""
+
+import sys
+import os
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from protocol import (
+    Message, MessageType, decode_message, is_chunk_frame, decode_chunk_frame,
+    is_compressed_frame, decompress_frame,
+)
+
+
+class FakeWebSocket:
+    """Collects the frames a server sends to one client, optionally stalling.
+
+    Clear `stalled` to make send() wait (a slow connection) until it is set
+    again.
+    """
+
+    remote_address = ("test", 0)
+
+    def __init__(self):
+        self.frames = []
+        self.stalled = asyncio.Event()
+        self.stalled.set()
+        self.closed = False
+
+    async def send(self, frame):
+        await self.stalled.wait()
+        self.frames.append(frame)
+
+    async def close(self, code=1000, reason=""):
+        self.closed = True
+
+    def messages(self, message_type=None):
+        """Decoded messages (compressed and binary frames included), optionally of one type."""
+        messages = []
+        for frame in self.frames:
+            if is_compressed_frame(frame):
+                frame = decompress_frame(frame)
+            if is_chunk_frame(frame):
+                messages.append(Message(MessageType.WORLD_CHUNK, decode_chunk_frame(frame)))
+            else:
+                messages.append(decode_message(frame))
+        if message_type is None:
+            return messages
+        message_type = MessageType(message_type)
+        return [message for message in messages if message.type == message_type]
+
+    def data(self, message_type):
+        """The data of every message of one type (a MessageType or its value)."""
+        return [message.data for message in self.messages(message_type)]
+
+    def types(self):
+        return [message.type for message in self.messages()]
+
+    def size(self):
+        return sum(len(frame) for frame in self.frames)
+
+
+async def join_player(server, join=None, websocket=None):
+    """Connect a fake client, send its PLAYER_JOIN and deliver what was queued for it.
+
+    `join` is a PLAYER_JOIN Message or its data (default: a plain named
+    player). Returns (player_id, websocket).
+    """
+    websocket = websocket or FakeWebSocket()
+    player_id = await server.register_client(websocket)
+    if not isinstance(join, Message):
+        join = Message(MessageType.PLAYER_JOIN, join or {"name": "player"})
+    await server.handle_client_message(player_id, join)
+    await server.flush_outboxes()
+    return player_id, websocket
+
+
+async def run_tick(server):
+    """Run one server tick: buffered moves, the PLAYER_SNAPSHOT broadcast, then delivery."""
+    await server._apply_pending_moves()
+    await server._broadcast_physics_updates()
+    await server.flush_outboxes()
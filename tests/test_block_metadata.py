@@ -11,7 +11,7 @@ import asyncio
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from server import GameWorld, create_block_data, get_block_collision
-from protocol import BlockType
+from protocol import BlockType, BlockRecord
 
 def test_block_data_creation():
     """Test that create_block_data creates correct structure."""
@@ -19,42 +19,42 @@ def test_block_data_creation():
     
     # Test without block_id
     block_data = create_block_data(BlockType.GRASS)
-    assert block_data["type"] == BlockType.GRASS
-    assert block_data["collision"] == True
-    assert block_data["block_id"] is None
-    assert block_data["owner"] is None
+    assert block_data.type == BlockType.GRASS
+    assert block_data.collision == True
+    assert block_data.block_id is None
+    assert block_data.owner is None
     print("  ✅ Grass block without block_id: OK")
     
     # Test with block_id (camera)
     block_data = create_block_data(BlockType.CAMERA, block_id="camera_1")
-    assert block_data["type"] == BlockType.CAMERA
-    assert block_data["collision"] == True
-    assert block_data["block_id"] == "camera_1"
-    assert block_data["owner"] is None  # No owner specified
+    assert block_data.type == BlockType.CAMERA
+    assert block_data.collision == True
+    assert block_data.block_id == "camera_1"
+    assert block_data.owner is None  # No owner specified
     print("  ✅ Camera block with block_id: OK")
     
     # Test camera with owner
     block_data = create_block_data(BlockType.CAMERA, block_id="camera_2", owner="player_789")
-    assert block_data["type"] == BlockType.CAMERA
-    assert block_data["collision"] == True
-    assert block_data["block_id"] == "camera_2"
-    assert block_data["owner"] == "player_789"
+    assert block_data.type == BlockType.CAMERA
+    assert block_data.collision == True
+    assert block_data.block_id == "camera_2"
+    assert block_data.owner == "player_789"
     print("  ✅ Camera block with owner: OK")
     
     # Test water (with collision - behaves like solid block)
     block_data = create_block_data(BlockType.WATER)
-    assert block_data["type"] == BlockType.WATER
-    assert block_data["collision"] == True
-    assert block_data["block_id"] is None
-    assert block_data["owner"] is None
+    assert block_data.type == BlockType.WATER
+    assert block_data.collision == True
+    assert block_data.block_id is None
+    assert block_data.owner is None
     print("  ✅ Water block (with collision): OK")
     
     # Test user block
     block_data = create_block_data(BlockType.USER, block_id="player_123")
-    assert block_data["type"] == BlockType.USER
-    assert block_data["collision"] == True
-    assert block_data["block_id"] == "player_123"
-    assert block_data["owner"] is None  # User blocks don't have owners
+    assert block_data.type == BlockType.USER
+    assert block_data.collision == True
+    assert block_data.block_id == "player_123"
+    assert block_data.owner is None  # User blocks don't have owners
     print("  ✅ User block with block_id: OK")
     
     print("✅ Block data creation tests passed\n")
@@ -93,10 +93,10 @@ def test_world_block_management():
     
     # Verify block data
     block_data = world.world[test_pos]
-    assert isinstance(block_data, dict)
-    assert block_data["type"] == BlockType.CAMERA
-    assert block_data["collision"] == True
-    assert block_data["block_id"] == "cam_test"
+    assert isinstance(block_data, BlockRecord)
+    assert block_data.type == BlockType.CAMERA
+    assert block_data.collision == True
+    assert block_data.block_id == "cam_test"
     print("  ✅ Block data stored correctly")
     
     # Test get_block (should return type string)
@@ -130,9 +130,9 @@ def test_user_blocks():
     
     # Verify block data
     block_data = world.world[block_pos]
-    assert block_data["type"] == BlockType.USER
-    assert block_data["collision"] == True
-    assert block_data["block_id"] == "player_1"
+    assert block_data.type == BlockType.USER
+    assert block_data.collision == True
+    assert block_data.block_id == "player_1"
     print("  ✅ User block data correct")
     
     # Move user to different position
@@ -143,7 +143,7 @@ def test_user_blocks():
     print(f"  ✅ User block moved to: {new_pos}")
     
     # Old position should be cleaned up
-    assert block_pos not in world.world or world.world[block_pos]["type"] != BlockType.USER
+    assert block_pos not in world.world or world.world[block_pos].type != BlockType.USER
     print("  ✅ Old user block position cleaned up")
     
     # Remove user block
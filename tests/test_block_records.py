@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test flyweight block records and the legacy block format migration.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+from server import GameWorld, create_block_data, migrate_block_format
+from protocol import BlockType, BlockRecord
+from minecraft_physics import get_block_type_from_data, has_block_collision
+
+
+def test_natural_blocks_share_one_record():
+    """Test that natural blocks are interned and camera/user blocks are not."""
+    print("🧪 Testing block record interning...")
+    assert create_block_data(BlockType.STONE) is create_block_data(BlockType.STONE)
+    assert create_block_data(BlockType.GRASS) is not create_block_data(BlockType.STONE)
+
+    camera_a = create_block_data(BlockType.CAMERA, block_id="camera_a", owner="p1")
+    camera_b = create_block_data(BlockType.CAMERA, block_id="camera_b", owner="p1")
+    assert camera_a is not camera_b
+    assert camera_a.block_id == "camera_a" and camera_a.owner == "p1"
+
+    # A generated world only holds a handful of distinct natural records
+    world = GameWorld()
+    natural = {id(data) for data in world.world.values() if data.block_id is None}
+    assert len(natural) <= len(BlockRecord._interned)
+    print(f"  ✅ {len(world.world)} blocks share {len(natural)} natural records")
+
+
+def test_records_are_immutable():
+    """Test that shared records cannot be modified through one block."""
+    print("🧪 Testing block record immutability...")
+    record = create_block_data(BlockType.SAND)
+    for attempt in (lambda: setattr(record, "type", BlockType.STONE),
+                    lambda: setattr(record, "extra", 1),
+                    lambda: delattr(record, "owner")):
+        try:
+            attempt()
+            assert False, "BlockRecord should be immutable"
+        except AttributeError:
+            pass
+    assert record.type == BlockType.SAND and record.owner is None
+    assert record.to_dict() == {"type": BlockType.SAND, "collision": True, "block_id": None, "owner": None}
+    print("  ✅ Block records are immutable")
+
+
+def test_water_records_follow_collision_config():
+    """Test that interning keys on collision so the water setting is honoured."""
+    print("🧪 Testing water records with collision config...")
+    original = server.WATER_COLLISION_ENABLED
+    try:
+        server.WATER_COLLISION_ENABLED = False
+        assert create_block_data(BlockType.WATER).collision is False
+        server.WATER_COLLISION_ENABLED = True
+        assert create_block_data(BlockType.WATER).collision is True
+    finally:
+        server.WATER_COLLISION_ENABLED = original
+    print("  ✅ Water records honour WATER_COLLISION_ENABLED")
+
+
+def test_legacy_format_migration():
+    """Test the one-time migration of string and dict block values."""
+    print("🧪 Testing legacy block migration...")
+    blocks = {
+        (0, 0, 0): BlockType.STONE,
+        (1, 0, 0): {"type": BlockType.CAMERA, "collision": True, "block_id": "cam", "owner": "p"},
+        (2, 0, 0): create_block_data(BlockType.GRASS),
+    }
+    assert migrate_block_format(blocks) == 2
+    assert blocks[(0, 0, 0)] is create_block_data(BlockType.STONE)
+    assert blocks[(1, 0, 0)] == create_block_data(BlockType.CAMERA, block_id="cam", owner="p")
+    assert migrate_block_format(blocks) == 0
+    print("  ✅ Legacy blocks migrated once")
+
+
+def test_legacy_world_loads_as_records():
+    """Test that a world saved in the former str/dict format loads as block records."""
+    print("🧪 Testing legacy world loading...")
+    legacy = {
+        (10, 5, 10): "stone",
+        (10, 6, 10): {"type": BlockType.GRASS, "collision": True},
+        (30, 6, 12): {"type": BlockType.CAMERA, "collision": True, "block_id": "cam_old", "owner": "p"},
+    }
+    for storage in ("dict", "voxel"):
+        world = GameWorld(storage=storage)
+        assert world.load_blocks(dict(legacy)) == 3
+        assert len(world.world) == 3
+        assert all(isinstance(record, BlockRecord) for _position, record in world.world.items())
+        assert world.world[(10, 5, 10)] is create_block_data(BlockType.STONE)
+        assert world.world[(30, 6, 12)] == create_block_data(BlockType.CAMERA, block_id="cam_old", owner="p")
+        assert world.block_id_map == {"cam_old": (30, 6, 12)}
+        assert world.get_block((10, 6, 10)) == BlockType.GRASS
+    print("  ✅ Legacy worlds load as BlockRecord values")
+
+
+def test_physics_helpers_accept_records_and_client_strings():
+    """Test the physics helpers on records and client-side type strings."""
+    print("🧪 Testing physics block helpers...")
+    record = create_block_data(BlockType.BRICK)
+    assert get_block_type_from_data(record) == BlockType.BRICK
+    assert has_block_collision(record) is True
+    assert get_block_type_from_data(BlockType.STONE) == BlockType.STONE
+    assert has_block_collision(BlockType.STONE) is True
+    assert has_block_collision(BlockType.AIR) is False
+    print("  ✅ Physics helpers handle both formats")
+
+
+if __name__ == "__main__":
+    test_natural_blocks_share_one_record()
+    test_records_are_immutable()
+    test_water_records_follow_collision_config()
+    test_legacy_format_migration()
+    test_legacy_world_loads_as_records()
+    test_physics_helpers_accept_records_and_client_strings()
+    print("✅ ALL TESTS PASSED")
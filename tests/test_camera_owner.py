@@ -13,7 +13,7 @@ os.environ['DISPLAY'] = ':99'
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from server import GameWorld, create_block_data
-from protocol import BlockType
+from protocol import BlockType, BlockRecord
 
 def test_camera_block_with_owner():
     """Test that camera blocks can have owner metadata."""
@@ -21,16 +21,16 @@ def test_camera_block_with_owner():
     
     # Test camera block with owner
     block_data = create_block_data(BlockType.CAMERA, block_id="camera_5", owner="player_123")
-    assert block_data["type"] == BlockType.CAMERA
-    assert block_data["collision"] == True
-    assert block_data["block_id"] == "camera_5"
-    assert block_data["owner"] == "player_123"
+    assert block_data.type == BlockType.CAMERA
+    assert block_data.collision == True
+    assert block_data.block_id == "camera_5"
+    assert block_data.owner == "player_123"
     print("  ✅ Camera block with owner: OK")
     
     # Test camera block without owner (backward compatibility)
     block_data = create_block_data(BlockType.CAMERA, block_id="camera_6")
-    assert block_data["type"] == BlockType.CAMERA
-    assert block_data["owner"] is None
+    assert block_data.type == BlockType.CAMERA
+    assert block_data.owner is None
     print("  ✅ Camera block without owner (backward compatible): OK")
     
     print("✅ Camera owner metadata tests passed\n")
@@ -51,10 +51,10 @@ def test_world_camera_management_with_owner():
     
     # Verify block data
     block_data = world.world[test_pos]
-    assert isinstance(block_data, dict)
-    assert block_data["type"] == BlockType.CAMERA
-    assert block_data["block_id"] == "cam_test"
-    assert block_data["owner"] == "player_456"
+    assert isinstance(block_data, BlockRecord)
+    assert block_data.type == BlockType.CAMERA
+    assert block_data.block_id == "cam_test"
+    assert block_data.owner == "player_456"
     print("  ✅ Block data includes owner")
     
     # Verify cameras list includes owner
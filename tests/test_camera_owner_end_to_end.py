@@ -20,7 +20,7 @@ os.environ['DISPLAY'] = ':99'
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from server import GameWorld, create_block_data
-from protocol import BlockType, Message, MessageType, Cube, create_cameras_list_message
+from protocol import BlockType, BlockRecord, Message, MessageType, Cube, create_cameras_list_message
 
 def test_complete_camera_ownership_flow():
     """Test the complete camera ownership flow from placement to client notification."""
@@ -53,11 +53,11 @@ def test_complete_camera_ownership_flow():
     # Step 2: Verify block_data has owner
     print("\n  Step 2: Verify block data")
     block_data = world.world[camera_position]
-    assert isinstance(block_data, dict)
-    assert block_data["type"] == BlockType.CAMERA
-    assert block_data["block_id"] == block_id
-    assert block_data["owner"] == player_id
-    print(f"    ✅ Block data contains owner: {block_data['owner']}")
+    assert isinstance(block_data, BlockRecord)
+    assert block_data.type == BlockType.CAMERA
+    assert block_data.block_id == block_id
+    assert block_data.owner == player_id
+    print(f"    ✅ Block data contains owner: {block_data.owner}")
     
     # Step 3: Server sends CAMERAS_LIST
     print("\n  Step 3: Server prepares CAMERAS_LIST message")
@@ -18,7 +18,7 @@ os.environ['DISPLAY'] = ':99'
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from server import GameWorld, MinecraftServer, create_block_data
-from protocol import BlockType, Message, MessageType, Cube
+from protocol import BlockType, BlockRecord, Message, MessageType, Cube
 from typing import Tuple
 
 def test_camera_placement_creates_owner():
@@ -42,11 +42,11 @@ def test_camera_placement_creates_owner():
     
     # Verify block data has owner
     block_data = world.world[camera_position]
-    assert isinstance(block_data, dict)
-    assert block_data["type"] == BlockType.CAMERA
-    assert block_data["block_id"] == block_id
-    assert block_data["owner"] == player_id
-    print(f"  ✅ Block data has correct owner: {block_data['owner']}")
+    assert isinstance(block_data, BlockRecord)
+    assert block_data.type == BlockType.CAMERA
+    assert block_data.block_id == block_id
+    assert block_data.owner == player_id
+    print(f"  ✅ Block data has correct owner: {block_data.owner}")
     
     # Verify cameras list includes owner
     cameras = world.get_cameras()
@@ -32,16 +32,16 @@ def test_cat_block_data_creation():
     print("🧪 Testing CAT block data creation...")
     
     block_data = create_block_data(BlockType.CAT)
-    assert block_data["type"] == BlockType.CAT, "Block type should be 'cat'"
-    assert block_data["collision"] == True, "CAT block should have collision"
-    assert block_data["block_id"] is None, "CAT block should not have block_id by default"
+    assert block_data.type == BlockType.CAT, "Block type should be 'cat'"
+    assert block_data.collision == True, "CAT block should have collision"
+    assert block_data.block_id is None, "CAT block should not have block_id by default"
     print("  ✅ CAT block data created correctly")
     
     # Test with block_id
     block_data_with_id = create_block_data(BlockType.CAT, block_id="cat_123")
-    assert block_data_with_id["type"] == BlockType.CAT
-    assert block_data_with_id["collision"] == True
-    assert block_data_with_id["block_id"] == "cat_123"
+    assert block_data_with_id.type == BlockType.CAT
+    assert block_data_with_id.collision == True
+    assert block_data_with_id.block_id == "cat_123"
     print("  ✅ CAT block with block_id created correctly")
     print("✅ CAT block data creation test passed\n")
 
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test binary palette + RLE WORLD_CHUNK frames and their negotiation at join.
+"""
+
+import sys
+import os
+import json
+import asyncio
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer
+from protocol import (
+    BlockType, create_player_join_message,
+    encode_chunk_frame, decode_chunk_frame, is_chunk_frame,
+)
+from world_storage import BLOCK_PALETTE, BLOCK_CODES
+from server_helpers import join_player
+
+
+def _blocks(chunk_data):
+    return {f"{x},{y},{z}": block_type
+            for (x, y, z), block_type in zip(chunk_data["positions"], chunk_data["block_types"])}
+
+
+def test_binary_frames_match_json_chunks():
+    """Test that binary frames decode to the same blocks as JSON chunks."""
+    print("🧪 Testing binary chunk frames...")
+    for storage in ("dict", "voxel"):
+        server = MinecraftServer(world_storage=storage)
+        server.world.add_block((70, 110, 66), BlockType.CAMERA, block_id="cam_b", owner="p")
+        for cx, cz in [(0, 0), (4, 4), (7, 2)]:
+            frame = server.get_chunk_payload(cx, cz, "binary")
+            text = server.get_chunk_payload(cx, cz, "json")
+            assert is_chunk_frame(frame) and not is_chunk_frame(text)
+            decoded = decode_chunk_frame(frame)
+            assert (decoded["chunk_x"], decoded["chunk_z"]) == (cx, cz)
+            assert _blocks(decoded) == json.loads(text)["data"]["blocks"]
+            assert len(frame) * 10 < len(text)
+        assert server.get_chunk_payload(20, 20, "binary") is None
+    print("  ✅ Binary frames carry the same blocks, 10x+ smaller")
+
+
+def test_runs_are_split_per_column_and_length():
+    """Test RLE edge cases: empty columns, full columns, heights above 256."""
+    print("🧪 Testing chunk frame run lengths...")
+    codes = np.zeros((16, 300, 16), dtype=np.uint8)
+    codes[:, :290] = BLOCK_CODES[BlockType.STONE]
+    codes[3, 299, 7] = BLOCK_CODES[BlockType.LEAF]
+    decoded = decode_chunk_frame(encode_chunk_frame(-2, 5, codes, BLOCK_PALETTE))
+    assert len(decoded["positions"]) == 16 * 16 * 290 + 1
+    assert min(x for x, _, _ in decoded["positions"]) == -32
+    assert min(z for _, _, z in decoded["positions"]) == 80
+    assert decoded["block_types"].count(BlockType.LEAF) == 1
+
+    empty = np.zeros((16, 256, 16), dtype=np.uint8)
+    assert decode_chunk_frame(encode_chunk_frame(0, 0, empty, BLOCK_PALETTE))["block_types"] == []
+    print("  ✅ Runs stay within a column and 256 blocks")
+
+
+def test_encoding_is_negotiated_at_join():
+    """Test that clients get binary chunks only when they ask for them."""
+    print("🧪 Testing chunk encoding negotiation...")
+
+    async def join(data):
+        server = MinecraftServer()
+        _, websocket = await join_player(server, data)
+        return server, websocket.frames
+
+    server, frames = asyncio.run(join(create_player_join_message("bin", compression=()).data))
+    init = json.loads(frames[0])
+    assert init["type"] == "world_init" and init["data"]["chunk_encoding"] == "binary"
+    chunks = [frame for frame in frames if is_chunk_frame(frame)]
+    assert len(chunks) == 64
+
+    server, frames = asyncio.run(join({"name": "legacy"}))
+    assert json.loads(frames[0])["data"]["chunk_encoding"] == "json"
+    assert not any(is_chunk_frame(frame) for frame in frames)
+    assert sum(json.loads(frame)["type"] == "world_chunk" for frame in frames) == 64
+    print("  ✅ Binary for capable clients, JSON fallback otherwise")
+
+
+if __name__ == "__main__":
+    test_binary_frames_match_json_chunks()
+    test_runs_are_split_per_column_and_length()
+    test_encoding_is_negotiated_at_join()
+    print("✅ ALL TESTS PASSED")
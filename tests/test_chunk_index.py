@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test the per-chunk block index maintained by GameWorld.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import GameWorld, sectorize, DEFAULT_CHUNK_SIZE
+from protocol import BlockType
+
+
+def _scan_chunk(world, chunk_x, chunk_z, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Reference implementation: full world scan for one chunk."""
+    start_x, start_z = chunk_x * chunk_size, chunk_z * chunk_size
+    return {
+        f"{x},{y},{z}": data.type
+        for (x, y, z), data in world.world.items()
+        if start_x <= x < start_x + chunk_size and start_z <= z < start_z + chunk_size
+    }
+
+
+def _assert_index_consistent(world):
+    """Every block is indexed exactly once, in the sector that contains it."""
+    indexed = set()
+    for sector, positions in world.sectors.items():
+        for position in positions:
+            assert sectorize(position) == sector
+        indexed |= positions
+    assert indexed == set(world.world.keys())
+
+
+def test_chunk_extraction_matches_full_scan():
+    """Test that indexed chunk extraction returns the same blocks as a full scan."""
+    print("🧪 Testing indexed chunk extraction...")
+    world = GameWorld()
+    _assert_index_consistent(world)
+
+    for chunk_x, chunk_z in [(0, 0), (3, 4), (7, 7)]:
+        chunk = world.get_world_chunk(chunk_x, chunk_z)
+        assert chunk["blocks"] == _scan_chunk(world, chunk_x, chunk_z)
+
+    # Chunk sizes that don't line up with sectors still work
+    chunk = world.get_world_chunk(1, 2, chunk_size=24)
+    assert chunk["blocks"] == _scan_chunk(world, 1, 2, chunk_size=24)
+    print("  ✅ Chunk extraction matches full scan")
+
+
+def test_index_follows_mutations():
+    """Test that add/remove, user blocks and reset keep the index in sync."""
+    print("🧪 Testing chunk index maintenance...")
+    world = GameWorld()
+
+    assert world.add_block((20, 120, 20), BlockType.BRICK)
+    assert "20,120,20" in world.get_world_chunk(1, 1)["blocks"]
+    assert world.remove_block((20, 120, 20))
+    assert "20,120,20" not in world.get_world_chunk(1, 1)["blocks"]
+
+    # User blocks move between chunks without leaving stale entries behind
+    world.add_user_block("player_1", (5.0, 150.0, 5.0))
+    world.add_user_block("player_1", (5.0, 150.0, 5.0))
+    world.add_user_block("player_1", (40.0, 150.0, 40.0))
+    assert "5,150,5" not in world.get_world_chunk(0, 0)["blocks"]
+    assert world.get_world_chunk(2, 2)["blocks"]["40,150,40"] == BlockType.USER
+    _assert_index_consistent(world)
+
+    world.remove_user_block("player_1")
+    world.add_block((30, 130, 30), BlockType.CAMERA, block_id="cam_x", owner="p")
+    world.reset_to_natural_terrain()
+    _assert_index_consistent(world)
+    print("  ✅ Index stays consistent across mutations")
+
+
+def test_region_query_uses_index():
+    """Test that region queries only return blocks within the radius."""
+    print("🧪 Testing region query...")
+    world = GameWorld()
+    center, radius = (64.0, 20.0, 64.0), 6.0
+
+    expected = sorted(
+        pos for pos in world.world
+        if sum((a - b) ** 2 for a, b in zip(pos, center)) ** 0.5 <= radius
+    )
+    result = sorted(tuple(b["position"]) for b in world.get_blocks_in_region(center, radius))
+    assert result == expected
+    print(f"  ✅ Region query returned {len(result)} blocks")
+
+
+if __name__ == "__main__":
+    test_chunk_extraction_matches_full_scan()
+    test_index_follows_mutations()
+    test_region_query_uses_index()
+    print("✅ ALL TESTS PASSED")
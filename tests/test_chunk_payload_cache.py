@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test the server-side cache of encoded WORLD_CHUNK frames.
+"""
+
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer
+from protocol import BlockType, create_world_chunk_message
+
+
+def _blocks(frame):
+    """The chunk data of a JSON frame without its version."""
+    data = json.loads(frame)["data"]
+    data.pop("version")
+    return data
+
+
+def test_frames_are_reused_until_edited():
+    """Test that a chunk is encoded once per version."""
+    print("🧪 Testing chunk payload cache...")
+    server = MinecraftServer()
+    world = server.world
+
+    frame = server.get_chunk_payload(2, 2)
+    assert frame == create_world_chunk_message({**world.get_world_chunk(2, 2),
+                                                "version": world.chunk_version(2, 2)}).to_json()
+    assert server.get_chunk_payload(2, 2) is frame
+    assert server.get_chunk_payload(3, 3) is not None
+    assert (server.chunk_payload_hits, server.chunk_payload_misses) == (1, 2)
+
+    # An edit only invalidates its own chunk
+    version = world.chunk_version(2, 2)
+    assert world.add_block((40, 120, 40), BlockType.BRICK)
+    assert world.chunk_version(2, 2) > version
+    edited = server.get_chunk_payload(2, 2)
+    assert edited is not frame and "40,120,40" in json.loads(edited)["data"]["blocks"]
+    other = server.get_chunk_payload(3, 3)
+    assert server.chunk_payload_misses == 3 and server.chunk_payload_hits == 2
+
+    assert world.remove_block((40, 120, 40))
+    assert _blocks(server.get_chunk_payload(2, 2)) == _blocks(frame)  # Same blocks, newer version
+    assert server.get_chunk_payload(3, 3) is other
+    print("  ✅ Frames are rebuilt only for edited chunks")
+
+
+def test_reset_invalidates_every_chunk():
+    """Test that clearing the world bumps every chunk version."""
+    print("🧪 Testing chunk payload invalidation on reset...")
+    server = MinecraftServer(world_storage="voxel")
+    world = server.world
+    assert server.get_chunk_payload(50, 50) is None  # Outside the world: nothing to send
+    frame = server.get_chunk_payload(1, 1)
+    before, misses = world.chunk_version(1, 1), server.chunk_payload_misses
+    world._clear_world()
+    assert world.chunk_version(1, 1) > before
+    # Cleared voxel chunks are generated again on touch, so the frame is rebuilt with the same blocks
+    assert _blocks(server.get_chunk_payload(1, 1)) == _blocks(frame)
+    assert server.chunk_payload_misses == misses + 1
+    print("  ✅ Bulk reloads invalidate the cache")
+
+
+if __name__ == "__main__":
+    test_frames_are_reused_until_edited()
+    test_reset_invalidates_every_chunk()
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test the memory-bounded chunk residency manager (LRU eviction over region files).
+"""
+
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import GameWorld
+from protocol import BlockType
+from world_storage import CHUNK_SIZE, WORLD_HEIGHT
+
+CHUNK_MB = CHUNK_SIZE * WORLD_HEIGHT * CHUNK_SIZE / (1024 * 1024)
+
+
+def _region_world(region_dir, chunks_in_budget):
+    # The first open writes the generated world to the region files
+    GameWorld(storage="voxel", region_dir=region_dir).world.regions.close()
+    return GameWorld(storage="voxel", region_dir=region_dir,
+                     chunk_memory_mb=chunks_in_budget * CHUNK_MB)
+
+
+def test_lru_eviction_within_budget():
+    """Test that the least recently used chunk is evicted first."""
+    print("🧪 Testing LRU chunk eviction...")
+    reference = GameWorld(storage="voxel")
+    with tempfile.TemporaryDirectory() as region_dir:
+        world = _region_world(region_dir, 3)
+        store = world.world
+        for cx in range(3):
+            world.get_world_chunk(cx, 0)
+        world.get_world_chunk(0, 0)  # (0, 0) becomes most recent
+        world.get_world_chunk(5, 5)  # evicts (1, 0), the coldest
+
+        assert set(store.chunks) == {(2, 0), (0, 0), (5, 5)}
+        assert store.resident_bytes() <= store.memory_budget
+        stats = world.residency_stats()
+        assert stats["misses"] == 4 and stats["evictions"] == 1 and stats["hits"] > 0
+
+        # Evicted chunks reload transparently
+        assert world.get_world_chunk(1, 0) == reference.get_world_chunk(1, 0)
+        assert len(store.chunks) == 3
+        store.regions.close()
+    print("  ✅ Coldest chunks are evicted within the budget")
+
+
+def test_dirty_chunks_are_flushed_before_eviction():
+    """Test that an evicted chunk keeps its edits."""
+    print("🧪 Testing dirty chunk write-back on eviction...")
+    with tempfile.TemporaryDirectory() as region_dir:
+        world = _region_world(region_dir, 2)
+        assert world.add_block((5, 120, 5), BlockType.CAMERA, block_id="camera_9", owner="p1")
+        assert (0, 0) in world.world.dirty
+        world.get_world_chunk(3, 3)
+        world.get_world_chunk(4, 4)  # evicts (0, 0)
+
+        assert (0, 0) not in world.world.chunks and (0, 0) not in world.world.dirty
+        assert world.world[(5, 120, 5)].owner == "p1"
+        world.world.regions.close()
+    print("  ✅ Dirty chunks survive eviction")
+
+
+def test_chunks_with_player_blocks_stay_resident():
+    """Test that a chunk holding a player (USER) block is not evicted, even unpinned."""
+    print("🧪 Testing player blocks under eviction...")
+    with tempfile.TemporaryDirectory() as region_dir:
+        world = _region_world(region_dir, 2)
+        store = world.world
+        assert world.add_user_block("p1", (5.0, 120.0, 5.0))
+        assert world.add_block((6, 120, 5), BlockType.CAMERA, block_id="camera_9", owner="p1")
+        count = store.chunk_counts[(0, 0)]
+        for cx in range(3, 6):
+            world.get_world_chunk(cx, 3)
+
+        assert (0, 0) in store.chunks and not store.pinned
+        assert world.get_block((5, 120, 5)) == BlockType.USER
+        assert store.chunk_counts[(0, 0)] == count
+        assert store._chunk_metadata[(0, 0)] == {(5, 120, 5), (6, 120, 5)}
+
+        # Once the player block is gone the chunk is evicted like any other
+        assert world.remove_user_block("p1")
+        world.get_world_chunk(6, 3)
+        world.get_world_chunk(7, 3)
+        assert (0, 0) not in store.chunks
+        assert store.chunk_counts[(0, 0)] == count - 1
+        assert world.world[(6, 120, 5)].owner == "p1"
+        assert store._chunk_metadata[(0, 0)] == {(6, 120, 5)}
+        store.regions.close()
+    print("  ✅ Player blocks are never evicted out of memory")
+
+
+def test_chunks_near_players_are_pinned():
+    """Test that chunks around player positions are never evicted."""
+    print("🧪 Testing player chunk pinning...")
+    with tempfile.TemporaryDirectory() as region_dir:
+        world = _region_world(region_dir, 4)
+        world.update_residency([(40.0, 60.0, 40.0)], radius=0)
+        assert world.world.pinned == {(2, 2)} and (2, 2) in world.world.chunks
+
+        for cx in range(8):
+            world.get_world_chunk(cx, 7)
+        assert (2, 2) in world.world.chunks
+        assert world.residency_stats()["pinned"] == 1
+        world.world.regions.close()
+
+    try:
+        GameWorld(storage="voxel", chunk_memory_mb=1)
+        assert False, "A memory budget without region files should be rejected"
+    except ValueError:
+        pass
+    print("  ✅ Player chunks stay resident")
+
+
+if __name__ == "__main__":
+    test_lru_eviction_within_budget()
+    test_dirty_chunks_are_flushed_before_eviction()
+    test_chunks_with_player_blocks_stay_resident()
+    test_chunks_near_players_are_pinned()
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test versioned chunks and delta resync: a reconnecting client reports the
+chunk versions it holds and only gets what changed while it was away.
+"""
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer, CHUNK_EDIT_LOG_SIZE
+from protocol import (
+    MessageType, BlockType, create_player_join_message, create_player_move_message,
+)
+from server_helpers import join_player
+
+
+def _feed(model, websocket):
+    """Apply what a client does with world messages."""
+    for message in websocket.messages():
+        if message.type == MessageType.WORLD_INIT:
+            model.load_world_data(message.data)
+        elif message.type == MessageType.WORLD_CHUNK:
+            model.load_world_chunk(message.data)
+        elif message.type == MessageType.CHUNK_UNLOAD:
+            for chunk_x, chunk_z in message.data["chunks"]:
+                model.unload_chunk(chunk_x, chunk_z)
+        elif message.type == MessageType.CHUNK_DELTA:
+            model.apply_chunk_delta(message.data)
+
+
+async def _join(server, model, encoding="binary"):
+    join = create_player_join_message("resync", chunk_encodings=(encoding,), compression=(),
+                                      known_chunks=dict(model.chunk_versions), world_epoch=model.world_epoch)
+    player_id, websocket = await join_player(server, join)
+    _feed(model, websocket)
+    return player_id, websocket
+
+
+def _surface_block(server, chunk, block_type):
+    """A position of the given type on the surface of a chunk."""
+    return next(position for position in sorted(server.world.exposed_blocks(*chunk))
+                if server.world.get_block(position) == block_type)
+
+
+def test_reconnect_only_sends_changes():
+    """Test that unchanged chunks are kept and edited ones get a CHUNK_DELTA."""
+    print("🧪 Testing delta resync on reconnect...")
+    from minecraft_client_fr import EnhancedClientModel
+
+    async def run():
+        server = MinecraftServer(view_radius=2)
+        model = EnhancedClientModel()
+        player_id, first = await _join(server, model)
+        held = dict(model.chunk_versions)
+        assert len(held) == 25 and model.world_epoch == server.world.epoch
+        assert all(version == server.world.chunk_version(*key) for key, version in held.items())
+        await server.unregister_client(player_id)
+
+        # While the client is away: a block placed and one dug in two of its chunks
+        assert server.world.add_block((69, 120, 55), BlockType.BRICK)
+        dug = _surface_block(server, (3, 5), BlockType.GRASS)
+        assert server.world.remove_block(dug)
+
+        _, second = await _join(server, model)
+        assert MessageType.WORLD_CHUNK not in second.types()
+        deltas = {(message.data["chunk_x"], message.data["chunk_z"]): message.data
+                  for message in second.messages() if message.type == MessageType.CHUNK_DELTA}
+        assert set(deltas) == {(4, 3), (3, 5)}
+        assert {"position": [69, 120, 55], "block_type": BlockType.BRICK} in deltas[(4, 3)]["blocks"]
+        assert deltas[(3, 5)]["blocks"][0] == {"position": list(dug), "block_type": BlockType.AIR}
+        assert len(deltas[(3, 5)]["blocks"]) > 1  # The blocks the dig exposed
+        assert server.resync_stats == {"kept": 23, "delta": 2, "unloaded": 0}
+        assert second.size() * 20 < first.size()
+
+        # The client now matches a fresh download, at the current versions
+        assert model.chunk_versions == {key: server.world.chunk_version(*key) for key in held}
+        fresh = EnhancedClientModel()
+        await _join(server, fresh)
+        assert all(server.world.get_block(position) == block_type for position, block_type in model.world.items())
+        assert set(fresh.world.items()) <= set(model.world.items())
+        assert dug not in model.world and model.world[(69, 120, 55)] == BlockType.BRICK
+
+    asyncio.run(run())
+    print("  ✅ Only the edited chunks are resent, as edit logs")
+
+
+def test_resync_falls_back_to_full_chunks():
+    """Test that chunks whose edits are no longer all known are unloaded and resent."""
+    print("🧪 Testing resync fallbacks...")
+    from minecraft_client_fr import EnhancedClientModel
+
+    async def run():
+        server = MinecraftServer(view_radius=1)
+        model = EnhancedClientModel()
+        player_id, _ = await _join(server, model, "json")
+        assert all(isinstance(version, int) for version in model.chunk_versions.values())
+        await server.unregister_client(player_id)
+
+        # More edits than the log keeps: that chunk can only be resent
+        for n in range(CHUNK_EDIT_LOG_SIZE // 2 + 1):
+            position = (66 + n % 8, 110 + n // 8, 50)
+            assert server.world.add_block(position, BlockType.WOOD)
+            assert server.world.remove_block(position)
+        assert server.world.chunk_edits_since(4, 3, model.chunk_versions[(4, 3)]) is None
+        player_id, websocket = await _join(server, model, "json")
+        unloaded = [message.data["chunks"] for message in websocket.messages()
+                    if message.type == MessageType.CHUNK_UNLOAD]
+        assert unloaded == [[[4, 3]]]
+        resent = [(message.data["chunk_x"], message.data["chunk_z"]) for message in websocket.messages()
+                  if message.type == MessageType.WORLD_CHUNK]
+        assert resent == [(4, 3)]
+        await server.unregister_client(player_id)
+
+        # Versions from another server run mean nothing: everything is unloaded and resent
+        other = MinecraftServer(view_radius=1)
+        _, websocket = await _join(other, model, "json")
+        assert websocket.types().index(MessageType.CHUNK_UNLOAD) < websocket.types().index(MessageType.WORLD_CHUNK)
+        assert len(websocket.messages()[1].data["chunks"]) == 9
+        assert model.chunk_versions == {key: other.world.chunk_version(*key) for key in model.chunk_versions}
+
+        # Malformed reports are refused
+        _, websocket = await join_player(other, {
+            "name": "bad", "known_chunks": {"epoch": other.world.epoch, "chunks": [[1, 2]]}})
+        assert websocket.types() == [MessageType.ERROR]
+
+    asyncio.run(run())
+    print("  ✅ Unknown histories fall back to a full chunk")
+
+
+def test_walking_keeps_chunk_histories():
+    """Test that a player walking around does not use up chunk versions or edit logs."""
+    print("🧪 Testing resync after walking...")
+    from minecraft_client_fr import EnhancedClientModel
+
+    async def run():
+        server = MinecraftServer(view_radius=1)
+        model = EnhancedClientModel()
+        player_id, _ = await _join(server, model)
+        held = dict(model.chunk_versions)
+        payload = server.get_chunk_payload(4, 4, "binary")
+
+        # 300 steps around a square in chunk (4, 4), each one onto another block
+        x, z = 64.0, 64.0
+        for step in range(300):
+            dx, dz = ((1.0, 0.0), (0.0, 1.0), (-1.0, 0.0), (0.0, -1.0))[step // 5 % 4]
+            await server.handle_client_message(player_id, create_player_move_message((x + dx, 100.0, z + dz),
+                                                                                     (0.0, 0.0)))
+            await server._apply_pending_moves()
+            x, z = server.players[player_id].position[0], server.players[player_id].position[2]
+        assert server.move_stats["applied"] * 2 >= CHUNK_EDIT_LOG_SIZE  # Enough block changes to fill an edit log
+        assert server.world.block_id_map[player_id] == (int(x), 100, int(z))  # The player's block moved along
+        assert server.world.chunk_version(4, 4) == held[(4, 4)]
+        assert server.world.chunk_edits_since(4, 4, held[(4, 4)]) == []
+        misses = server.chunk_payload_misses
+        assert server.get_chunk_payload(4, 4, "binary") is payload
+        assert server.chunk_payload_misses == misses
+        await server.unregister_client(player_id)
+
+        assert server.world.add_block((69, 120, 69), BlockType.BRICK)
+        _, websocket = await _join(server, model)
+        assert MessageType.WORLD_CHUNK not in websocket.types()
+        assert MessageType.CHUNK_UNLOAD not in websocket.types()
+        deltas = [message.data for message in websocket.messages() if message.type == MessageType.CHUNK_DELTA]
+        assert deltas == [{"chunk_x": 4, "chunk_z": 4, "version": server.world.chunk_version(4, 4),
+                           "blocks": [{"position": [69, 120, 69], "block_type": BlockType.BRICK}]}]
+
+    asyncio.run(run())
+    print("  ✅ Walking players leave chunk versions and edit logs alone")
+
+
+def test_replayed_overwrite_is_versioned():
+    """Test that apply_edit over an occupied position bumps the chunk and logs the edit."""
+    print("🧪 Testing overwrites through apply_edit...")
+    from server import GameWorld
+    world = GameWorld()
+    position = _surface_block(SimpleNamespace(world=world), (3, 5), BlockType.GRASS)
+    before = world.chunk_version(3, 5)
+    world.apply_edit(position, BlockType.BRICK)
+    assert world.chunk_version(3, 5) > before
+    assert world.chunk_edits_since(3, 5, before) == [(position, BlockType.BRICK)]
+    assert position in world.exposed_blocks(3, 5)
+    print("  ✅ Overwrites are seen by payload caches and resync")
+
+
+if __name__ == "__main__":
+    test_reconnect_only_sends_changes()
+    test_resync_falls_back_to_full_chunks()
+    test_walking_keeps_chunk_histories()
+    test_replayed_overwrite_is_versioned()
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test distance-ordered per-player chunk streaming and CHUNK_UNLOAD.
+"""
+
+import sys
+import os
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer
+from protocol import Message, MessageType, create_player_move_message
+from server_helpers import join_player
+
+
+def test_join_streams_nearest_chunks_first():
+    """Test that a join only sends the view radius, nearest chunk first."""
+    print("🧪 Testing chunk streaming on join...")
+
+    async def run():
+        server = MinecraftServer(world_storage="voxel", world_size=0, view_radius=2)
+        player_id, websocket = await join_player(server)
+        chunks = websocket.data("world_chunk")
+        assert len(chunks) == 25
+        assert (chunks[0]["chunk_x"], chunks[0]["chunk_z"]) == (4, 4)  # Spawn (64, 100, 64)
+        assert server.streamed_chunks[player_id] == {(4 + dx, 4 + dz) for dx in range(-2, 3)
+                                                     for dz in range(-2, 3)}
+        # Staying in the same chunk streams nothing
+        assert await server.stream_chunks(player_id) == 0
+
+    asyncio.run(run())
+    print("  ✅ Joins send the view radius, nearest first")
+
+
+def test_moves_stream_new_chunks_and_unload_far_ones():
+    """Test streaming across chunk borders and CHUNK_UNLOAD with hysteresis."""
+    print("🧪 Testing chunk streaming on movement...")
+
+    async def run():
+        server = MinecraftServer(world_storage="voxel", world_size=0, view_radius=2)
+        player_id, websocket = await join_player(server)
+
+        async def move(x):
+            websocket.frames.clear()
+            message = create_player_move_message((x, 100.0, 64.0), (0.0, 0.0))
+            await server.handle_client_message(player_id, message)
+            await server._apply_pending_moves()  # Moves are applied on the next tick
+            await server.flush_outboxes()
+            return websocket.data("world_chunk"), websocket.data("chunk_unload")
+
+        chunks, unloads = await move(80.0)  # Into chunk (5, 4): one new column
+        assert sorted(c["chunk_x"] for c in chunks) == [7] * 5 and not unloads
+
+        chunks, unloads = await move(112.0)  # Chunk (7, 4): columns 2 and 3 are more than 3 away
+        assert sorted({c["chunk_x"] for c in chunks}) == [8, 9]
+        assert sorted(map(tuple, unloads[0]["chunks"])) == [(cx, cz) for cx in (2, 3) for cz in range(2, 7)]
+        assert all(cx >= 4 for cx, _ in server.streamed_chunks[player_id])
+
+    asyncio.run(run())
+    print("  ✅ New chunks stream in, far chunks are unloaded")
+
+
+def test_block_updates_only_reach_clients_holding_the_chunk():
+    """Test that WORLD_UPDATEs skip clients that unloaded the chunk, block by block."""
+    print("🧪 Testing block updates per streamed chunk...")
+
+    async def run():
+        server = MinecraftServer(world_storage="voxel", world_size=0, view_radius=1)
+        digger, near = await join_player(server)
+        walker, far = await join_player(server)
+        server.players[walker].position = (400.0, 100.0, 64.0)
+        await server.stream_chunks(walker)  # Unloads everything around spawn
+        edge, edge_socket = await join_player(server)
+        server.streamed_chunks[edge] = {(4, 4)}  # Holds the dug chunk, not its neighbour
+
+        # A block on the border of chunk (4, 4) whose dig exposes a buried block of (5, 4)
+        buried = (80, 150, 64)
+        for dx, dy, dz in ((0, 0, 0), (-1, 0, 0), (1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)):
+            assert server.world.add_block((buried[0] + dx, buried[1] + dy, buried[2] + dz), "brick")
+        dug = (79, 150, 64)
+        assert server.world.hidden_neighbors(dug) == [buried]
+        for websocket in (near, far, edge_socket):
+            websocket.frames.clear()
+        await server.handle_client_message(digger, Message(MessageType.BLOCK_DESTROY, {"position": list(dug)}))
+        await server.flush_outboxes()
+
+        [update] = near.data("world_update")
+        assert any(block["position"][0] == 80 for block in update["blocks"])
+        assert far.data("world_update") == []
+        [partial] = edge_socket.data("world_update")
+        assert partial["blocks"][0]["position"] == list(dug)
+        assert all(block["position"][0] < 80 for block in partial["blocks"])
+
+    asyncio.run(run())
+    print("  ✅ Clients only hear about chunks they hold")
+
+
+if __name__ == "__main__":
+    test_join_streams_nearest_chunks_first()
+    test_moves_stream_new_chunks_and_unload_far_ones()
+    test_block_updates_only_reach_clients_holding_the_chunk()
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test per-client bounded outbound queues: coalescing, overflow policy and
+isolation of slow clients.
+"""
+
+import sys
+import os
+import json
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer, ClientOutbox
+from protocol import Message, MessageType, create_player_update_message, PlayerState
+from server_helpers import FakeWebSocket
+
+
+def _update(player_id, x):
+    player = PlayerState(player_id, (x, 50.0, 0.0), (0.0, 0.0), name=player_id)
+    return create_player_update_message(player)
+
+
+def test_player_updates_are_coalesced():
+    """Test that a queued PLAYER_UPDATE is replaced by the next one for the same player."""
+    print("🧪 Testing outbound PLAYER_UPDATE coalescing...")
+
+    async def run():
+        websocket = FakeWebSocket()
+        websocket.stalled.clear()
+        outbox = ClientOutbox(websocket, max_size=8)
+        outbox.task = asyncio.create_task(outbox.run())
+        await asyncio.sleep(0)
+        for x in range(5):
+            outbox.put(f"a{x}", key=("player_update", "a"))
+            outbox.put(f"b{x}", key=("player_update", "b"))
+        outbox.put("chat")
+        assert len(outbox) == 3 and outbox.coalesced == 8
+        websocket.stalled.set()
+        await outbox.drain()
+        outbox.task.cancel()
+        assert websocket.frames == ["a4", "b4", "chat"]  # Coalesced frames keep their queue slot
+        assert outbox.sent == len(websocket.frames)
+
+    asyncio.run(run())
+    print("  ✅ Only the latest update per player is sent")
+
+
+def test_overflow_policies():
+    """Test the drop and disconnect policies once a client's queue is full."""
+    print("🧪 Testing outbound queue overflow...")
+
+    async def run(policy):
+        server = MinecraftServer(outbox_size=4, outbox_policy=policy)
+        slow, fast = FakeWebSocket(), FakeWebSocket()
+        slow.stalled.clear()
+        slow_id = await server.register_client(slow)
+        fast_id = await server.register_client(fast)
+        for n in range(10):
+            await server.broadcast_message(Message(MessageType.CHAT_MESSAGE, {"text": str(n)}))
+            await asyncio.sleep(0)  # Let the writers run, as between two ticks
+        await server.flush_outboxes([fast_id])
+        chats = fast.data("chat_message")
+        assert [chat["text"] for chat in chats] == [str(n) for n in range(10)]
+        return server, slow_id, slow
+
+    server, slow_id, slow = asyncio.run(run("drop"))
+    assert slow_id in server.clients and not slow.closed
+    assert server.outbox_stats()["dropped"] >= 5
+
+    server, slow_id, slow = asyncio.run(run("disconnect"))
+    assert slow_id not in server.clients and slow_id not in server.outboxes and slow.closed
+    assert server.outbox_stats()["overflow_disconnects"] == 1
+    try:
+        MinecraftServer(outbox_policy="block")
+        assert False, "Unknown overflow policies should be rejected"
+    except ValueError:
+        pass
+    print("  ✅ Full queues drop frames or disconnect the client")
+
+
+def test_slow_client_does_not_block_broadcasts():
+    """Test that broadcasting never waits on a stalled socket."""
+    print("🧪 Testing broadcast isolation from slow clients...")
+
+    async def run():
+        server = MinecraftServer()
+        slow, fast = FakeWebSocket(), FakeWebSocket()
+        slow.stalled.clear()
+        await server.register_client(slow)
+        await server.register_client(fast)
+        for x in range(50):
+            await asyncio.wait_for(server.broadcast_message(_update("mover", float(x))), timeout=1)
+        stats = server.outbox_stats()
+        assert stats["queued"] <= 2  # The stalled client holds a single coalesced update
+        assert stats["coalesced"] >= 48
+        slow.stalled.set()
+        await server.flush_outboxes()
+        assert json.loads(slow.frames[-1])["data"]["position"][0] == 49.0
+        assert json.loads(fast.frames[-1])["data"]["position"][0] == 49.0
+
+    asyncio.run(run())
+    print("  ✅ Stalled sockets only grow their own queue")
+
+
+class ClosedWebSocket(FakeWebSocket):
+    """A client whose connection dropped: every send fails."""
+
+    async def send(self, frame):
+        raise ConnectionResetError("gone")
+
+
+def test_failed_sends_are_cleaned_up_in_bulk():
+    """Test that clients failing during one fan-out are unregistered together."""
+    print("🧪 Testing bulk cleanup of failed clients...")
+
+    async def run():
+        server = MinecraftServer()
+        healthy = FakeWebSocket()
+        healthy_id = await server.register_client(healthy)
+        dead_ids = [await server.register_client(ClosedWebSocket()) for _ in range(5)]
+        queued = server.fan_out(MessageType.CHAT_MESSAGE, '{"type": "chat_message"}', list(server.outboxes))
+        assert queued == 6
+        await server.flush_outboxes()
+        assert list(server.clients) == [healthy_id]
+        assert not server.pending_disconnects and not any(pid in server.players for pid in dead_ids)
+        assert healthy.frames[0] == '{"type": "chat_message"}'
+
+    asyncio.run(run())
+    print("  ✅ Dead clients are removed after the fan-out")
+
+
+if __name__ == "__main__":
+    test_player_updates_are_coalesced()
+    test_overflow_policies()
+    test_slow_client_does_not_block_broadcasts()
+    test_failed_sends_are_cleaned_up_in_bulk()
+    print("✅ ALL TESTS PASSED")
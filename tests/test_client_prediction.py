@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test client-side prediction: sequenced PLAYER_MOVEs, MOVE_ACK from the
+server and replay of unacknowledged inputs after a correction.
+"""
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer
+from protocol import Message, BlockType, create_player_move_message, create_move_ack_message, PlayerState
+from minecraft_physics import MinecraftCollisionDetector, MinecraftPhysics
+from server_helpers import FakeWebSocket
+
+
+def _floor_physics():
+    world = {(x, 0, z): BlockType.STONE for x in range(-5, 40) for z in range(-5, 5)}
+    world.update({(20, y, z): BlockType.BRICK for y in (1, 2) for z in range(-5, 5)})  # A wall ahead
+    return MinecraftPhysics(MinecraftCollisionDetector(world, 128))
+
+
+def _simulate(physics, buffer, position, dy, on_ground, steps, jump_at=()):
+    """Walk +x at 5 blocks/s, sending a move every 3 frames like the client does."""
+    for step in range(steps):
+        jumping = step in jump_at
+        position, velocity, on_ground = physics.update_position(position, (5.0, dy, 0.0), 1 / 60, on_ground, jumping)
+        dy = velocity[1]
+        buffer.record(1 / 60, 5.0, 0.0, jumping)
+        if step % 3 == 2:
+            buffer.next_seq()
+    return position, dy, on_ground
+
+
+def test_replay_matches_prediction():
+    """Test that replaying unacknowledged inputs reproduces the local prediction."""
+    print("🧪 Testing input replay...")
+    from minecraft_client_fr import PredictionBuffer
+    physics = _floor_physics()
+    buffer = PredictionBuffer()
+    start = (0.5, 1.0, 0.5)
+
+    # State when move 4 was sent, then more frames the server hasn't seen yet
+    acked_state = _simulate(physics, buffer, start, 0.0, True, 12, jump_at=(4,))
+    predicted = _simulate(physics, buffer, *acked_state, 20, jump_at=(6,))
+    assert buffer.seq == 10
+
+    # The server agrees with move 4: replaying from its state lands where we are
+    buffer.acknowledge(4)
+    assert all(entry[0] > 4 for entry in buffer.inputs) and len(buffer.inputs) == 20
+    assert buffer.replay(physics, *acked_state) == predicted
+
+    # The server refused move 4 and kept us back: the same frames are played from there
+    held_back = ((acked_state[0][0] - 1.5,) + acked_state[0][1:], acked_state[1], acked_state[2])
+    expected = _simulate(physics, PredictionBuffer(), *held_back, 20, jump_at=(6,))
+    assert buffer.replay(physics, *held_back) == expected
+    assert expected[0][0] < predicted[0][0]
+
+    # Replay goes through the shared physics: the wall still stops us
+    blocked = buffer.replay(physics, (19.0, 1.0, 0.5), 0.0, True)
+    assert blocked[0][0] < 20 - 0.3 + 1e-6
+    print("  ✅ Replays reproduce the prediction and respect collisions")
+
+
+def test_replay_while_flying():
+    """Test that flight steps are recorded and replayed from a correction."""
+    print("🧪 Testing input replay in flying mode...")
+    from minecraft_client_fr import PredictionBuffer
+    physics = _floor_physics()
+    buffer = PredictionBuffer()
+    for step in range(30):
+        buffer.record(1 / 60, 0.0, 0.0, False, flight=(0.1, 0.02, 0.0))
+        if step % 3 == 2:
+            buffer.next_seq()
+    buffer.acknowledge(4)
+    assert len(buffer.inputs) == 18
+
+    # Corrected back in the air: the pending flight is flown again from there, not dropped
+    position, dy, on_ground = buffer.replay(physics, (5.0, 10.0, 0.5), 0.0, False)
+    assert abs(position[0] - 6.8) < 1e-6 and abs(position[1] - 10.36) < 1e-6
+    assert (dy, on_ground) == (0.0, False)
+
+    # Collisions still apply: the wall at x = 20 stops the flight
+    position, _, _ = buffer.replay(physics, (19.0, 1.0, 0.5), 0.0, False)
+    assert position[0] < 20 - 0.3 + 1e-6
+    print("  ✅ Flying corrections replay the pending flight")
+
+
+def test_server_acks_and_corrects():
+    """Test MOVE_ACK for accepted moves and corrections for refused ones."""
+    print("🧪 Testing MOVE_ACK...")
+
+    async def run():
+        server = MinecraftServer()
+        websocket = FakeWebSocket()
+        player_id = await server.register_client(websocket)
+        await server.flush_outboxes()
+        websocket.frames.clear()
+
+        for seq in (1, 2, 3):
+            await server.handle_client_message(
+                player_id, create_player_move_message((64.0 + seq * 0.2, 100.0, 64.0), (0.0, 0.0), seq))
+        await server._apply_pending_moves()
+        await server.flush_outboxes()
+        assert websocket.data("move_ack") == [{"seq": 3}]  # One ack for the move applied this tick
+        assert websocket.data("error") == [] and websocket.data("player_update") == []
+
+        websocket.frames.clear()
+        await server.handle_client_message(
+            player_id, create_player_move_message((64.0, 100.0, 64.0 + 60), (0.0, 0.0), 4))
+        await server._apply_pending_moves()
+        await server.flush_outboxes()
+        assert websocket.data("error") == [] and websocket.data("player_update") == []
+        [correction] = websocket.data("move_ack")
+        assert correction["seq"] == 4 and correction["position"][2] == 64.0 and "velocity" in correction
+
+    asyncio.run(run())
+    print("  ✅ Accepted moves are acked, refused ones corrected")
+
+
+def test_client_applies_corrections_only():
+    """Test that plain acks only trim the buffer and corrections reset the player."""
+    print("🧪 Testing MOVE_ACK handling on the client...")
+    from minecraft_client_fr import AdvancedNetworkClient
+
+    corrections = []
+    window = SimpleNamespace(apply_server_correction=lambda *state: corrections.append(state))
+    client = AdvancedNetworkClient(window, "ws://test")
+    for seq in (1, 1, 2, 3):
+        client.prediction.inputs.append((seq, 1 / 60, 0.0, 0.0, False))
+    client._handle_server_message(Message.from_json(create_move_ack_message(1).to_json()))
+    assert [entry[0] for entry in client.prediction.inputs] == [2, 3] and corrections == []
+
+    player = PlayerState("me", (3.0, 4.0, 5.0), (0.0, 0.0))
+    player.velocity = [0.0, -2.0, 0.0]
+    client._handle_server_message(Message.from_json(create_move_ack_message(2, correction=player).to_json()))
+    assert corrections == [((3.0, 4.0, 5.0), -2.0, False)]
+    assert [entry[0] for entry in client.prediction.inputs] == [3]
+    print("  ✅ Only refused moves move the player back")
+
+
+if __name__ == "__main__":
+    test_replay_matches_prediction()
+    test_replay_while_flying()
+    test_server_acks_and_corrects()
+    test_client_applies_corrections_only()
+    print("✅ ALL TESTS PASSED")
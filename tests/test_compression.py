@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test selective per-message-type compression of server frames.
+"""
+
+import sys
+import os
+import json
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer
+from protocol import (
+    MessageType, PlayerState, create_player_join_message, create_player_update_message,
+    create_blocks_list_message, compress_frame, decompress_frame, is_compressed_frame, is_chunk_frame,
+)
+from server_helpers import join_player
+
+
+def test_envelope_round_trip():
+    """Test that text and binary frames survive the zlib envelope."""
+    print("🧪 Testing compressed frame envelope...")
+    text = json.dumps({"type": "blocks_list", "data": {"blocks": ["stone"] * 500}})
+    for frame in (text, b"CVCK" + bytes(4000)):
+        compressed = compress_frame(frame)
+        assert is_compressed_frame(compressed) and len(compressed) < len(frame) / 10
+        assert decompress_frame(compressed) == frame
+    assert not is_compressed_frame(text)
+    print("  ✅ Envelopes round-trip text and binary frames")
+
+
+def test_compression_is_selective():
+    """Test the per-type selection, the size threshold and the counters."""
+    print("🧪 Testing selective compression...")
+    server = MinecraftServer(compression_threshold=1024)
+    update = create_player_update_message(PlayerState("p1", (1.0, 2.0, 3.0), (0, 0), "Alice"))
+    update_frame = update.to_json()
+    assert server.compress(update.type, update_frame) is update_frame  # Never compressed
+
+    small = create_blocks_list_message([{"position": [1, 2, 3]}]).to_json()
+    assert server.compress(MessageType.BLOCKS_LIST, small) is small  # Under the threshold
+    assert server.compression_stats["skipped"] == 1
+
+    large = create_blocks_list_message([{"position": [i, 2, 3], "block_type": "stone"}
+                                        for i in range(500)]).to_json()
+    compressed = server.compress(MessageType.BLOCKS_LIST, large)
+    assert decompress_frame(compressed) == large
+    stats = server.compression_stats
+    assert stats["compressed"] == 1 and stats["bytes_in"] == len(large)
+    assert stats["bytes_out"] == len(compressed) and stats["cpu_seconds"] > 0
+
+    disabled = MinecraftServer(compression_level=0)
+    assert disabled.compress(MessageType.BLOCKS_LIST, large) is large
+    print("  ✅ Only large payloads of the selected types are compressed")
+
+
+def test_compression_is_negotiated_at_join():
+    """Test that only clients asking for zlib get compressed chunks."""
+    print("🧪 Testing compression negotiation...")
+
+    async def join(server, data):
+        _, websocket = await join_player(server, data)
+        return websocket.frames
+
+    async def join_twice(server):
+        frames = await join(server, create_player_join_message("zip").data)
+        compressed_before = server.compression_stats["compressed"]
+        await join(server, create_player_join_message("zip2").data)
+        return frames, server.compression_stats["compressed"] - compressed_before
+
+    frames, compressed = asyncio.run(join_twice(MinecraftServer()))
+    assert json.loads(frames[0])["data"]["compression"] == "zlib"
+    chunks = [frame for frame in frames if is_compressed_frame(frame)]
+    assert len(chunks) == 64 and all(is_chunk_frame(decompress_frame(frame)) for frame in chunks)
+    # The second join reuses the compressed frames (PLAYER_LIST is under the threshold)
+    assert compressed == 0
+
+    frames = asyncio.run(join(MinecraftServer(), {"name": "legacy"}))
+    assert json.loads(frames[0])["data"]["compression"] is None
+    assert not any(is_compressed_frame(frame) for frame in frames)
+    print("  ✅ Compression only for clients that negotiate it")
+
+
+if __name__ == "__main__":
+    test_envelope_round_trip()
+    test_compression_is_selective()
+    test_compression_is_negotiated_at_join()
+    print("✅ ALL TESTS PASSED")
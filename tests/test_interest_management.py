@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test area-of-interest filtering of player updates with the spatial grid.
+"""
+
+import sys
+import os
+import json
+import random
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer, SpatialGrid, INTEREST_HYSTERESIS
+from protocol import create_player_move_message
+from server_helpers import FakeWebSocket, run_tick
+
+
+def test_grid_matches_brute_force():
+    """Test grid queries against a scan of every position."""
+    print("🧪 Testing spatial grid queries...")
+    rng = random.Random(20)
+    grid = SpatialGrid(32)
+    positions = {}
+    for n in range(300):
+        positions[f"p{n}"] = (rng.uniform(-200, 200), 60.0, rng.uniform(-200, 200))
+        grid.move(f"p{n}", positions[f"p{n}"])
+    for n in range(0, 300, 3):  # Move some, remove others
+        positions[f"p{n}"] = (rng.uniform(-200, 200), 60.0, rng.uniform(-200, 200))
+        grid.move(f"p{n}", positions[f"p{n}"])
+        grid.remove(f"p{n + 1}")
+        del positions[f"p{n + 1}"]
+    for _ in range(50):
+        center = (rng.uniform(-200, 200), 0.0, rng.uniform(-200, 200))
+        radius = rng.uniform(5, 90)
+        expected = {pid for pid, (x, _, z) in positions.items()
+                    if (x - center[0]) ** 2 + (z - center[2]) ** 2 <= radius ** 2}
+        assert {pid for pid, _ in grid.near(center, radius)} == expected
+    assert sum(len(members) for members in grid.cells.values()) == len(positions)
+    print("  ✅ Grid queries return exactly the players in range")
+
+
+def test_snapshots_follow_the_area_of_interest():
+    """Test enter/leave notifications and filtering of snapshots and moves."""
+    print("🧪 Testing area-of-interest snapshots...")
+
+    async def run():
+        server = MinecraftServer(interest_radius=40)
+        sockets = [FakeWebSocket() for _ in range(3)]
+        a, b, c = [await server.register_client(websocket) for websocket in sockets]
+        far = (64.0 + 200, 100.0, 64.0)
+        server.players[b].position = far
+        server.player_grid.move(b, far)
+
+        await run_tick(server)
+        assert sorted(entry["id"] for entry in sockets[0].data("player_snapshot")[-1]["players"]) == sorted([a, c])
+        assert [entry["id"] for entry in sockets[1].data("player_snapshot")[-1]["players"]] == [b]
+
+        # b walks up to a: sent in full when it comes into range
+        near = (64.0 + 30, 100.0, 64.0)
+        server.players[b].position = near
+        server.player_grid.move(b, near)
+        await run_tick(server)
+        entered = sockets[0].data("player_snapshot")[-1]["players"]
+        assert [entry["id"] for entry in entered] == [b] and "n" in entered[0]
+
+        # Within the hysteresis band b stays in view, beyond it b is reported as gone
+        edge = (64.0 + 40 + INTEREST_HYSTERESIS - 1, 100.0, 64.0)
+        server.players[b].position = edge
+        server.player_grid.move(b, edge)
+        await run_tick(server)
+        assert sockets[0].data("player_snapshot")[-1]["left"] == []
+        server.players[b].position = far
+        server.player_grid.move(b, far)
+        await run_tick(server)
+        assert sockets[0].data("player_snapshot")[-1]["left"] == [b]
+        assert server.interest[a] == {a, c}
+
+        # Moves only reach players in range
+        for websocket in sockets:
+            websocket.frames.clear()
+        await server.handle_client_message(c, create_player_move_message((66.0, 100.0, 64.0), (0.0, 0.0)))
+        await run_tick(server)
+        assert [entry["id"] for entry in sockets[0].data("player_snapshot")[-1]["players"]] == [c]
+        assert sockets[1].data("player_snapshot") == []
+
+    asyncio.run(run())
+    print("  ✅ Players only hear about players nearby")
+
+
+def test_unlimited_radius_shares_one_frame():
+    """Test that with no interest radius everyone sees everyone through one frame."""
+    print("🧪 Testing snapshots without an interest radius...")
+
+    async def run():
+        server = MinecraftServer(interest_radius=0)
+        sockets = [FakeWebSocket() for _ in range(4)]
+        ids = [await server.register_client(websocket) for websocket in sockets]
+        server.players[ids[0]].position = (5000.0, 100.0, 5000.0)
+        await server._broadcast_physics_updates()
+        server.players[ids[1]].position = (10.0, 100.0, 10.0)
+        await server._broadcast_physics_updates()
+        await server.flush_outboxes()
+        assert len({websocket.frames[-1] for websocket in sockets}) == 1
+        assert json.loads(sockets[0].frames[-1])["data"]["players"] == [{"id": ids[1], "p": [640, 6400, 640]}]
+        assert all(len(websocket.data("player_snapshot")[0]["players"]) == 4 for websocket in sockets)
+
+    asyncio.run(run())
+    print("  ✅ One shared frame when every client sees every player")
+
+
+if __name__ == "__main__":
+    test_grid_matches_brute_force()
+    test_snapshots_follow_the_area_of_interest()
+    test_unlimited_radius_shares_one_frame()
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test the binary message codec: round trips against JSON for randomly
+generated hot messages, the JSON fallback and negotiation at PLAYER_JOIN.
+"""
+
+import sys
+import os
+import json
+import random
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer
+from protocol import (
+    Message, MessageType, PlayerState, BlockUpdate, create_player_join_message, create_player_move_message,
+    create_player_update_message, create_block_place_message, create_block_destroy_message,
+    create_world_update_message, create_move_ack_message, create_chat_message,
+    encode_message, decode_message, is_message_frame, is_chunk_frame, is_compressed_frame,
+)
+from server_helpers import join_player
+
+
+def _text(rng):
+    return "".join(rng.choice("abcXYZ_-0123456789éß漢🧱") for _ in range(rng.randint(0, 40)))
+
+
+def _number(rng):
+    return rng.choice([rng.uniform(-1e6, 1e6), rng.randint(-100000, 100000), 0.1, -0.0, 1e-300])
+
+
+def _numbers(rng, count):
+    return tuple(_number(rng) for _ in range(count)) if rng.random() < 0.5 else [_number(rng) for _ in range(count)]
+
+
+def _block_position(rng):
+    return tuple(rng.randint(-2 ** 31, 2 ** 31 - 1) if rng.random() < 0.2 else rng.randint(-500, 500)
+                 for _ in range(3))
+
+
+def _random_message(rng):
+    kind = rng.randrange(6)
+    if kind == 0:
+        message = create_player_move_message(_numbers(rng, 3), _numbers(rng, 2),
+                                             rng.choice([None, 0, rng.randint(1, 2 ** 32 - 1)]))
+    elif kind == 1:
+        player = PlayerState(_text(rng), _numbers(rng, 3), _numbers(rng, 2), _text(rng) or None,
+                             rng.random() < 0.5, rng.random() < 0.5)
+        player.velocity = list(_numbers(rng, 3))
+        player.on_ground, player.flying, player.sprinting = (rng.random() < 0.5 for _ in range(3))
+        player.size = rng.choice([0.5, 1, rng.uniform(0, 2)])
+        message = create_player_update_message(player)
+    elif kind == 2:
+        message = create_block_place_message(_block_position(rng), _text(rng))
+    elif kind == 3:
+        message = create_block_destroy_message(_block_position(rng))
+    elif kind == 4:
+        message = create_world_update_message([BlockUpdate(_block_position(rng), _text(rng),
+                                                           rng.choice([None, _text(rng)]))
+                                               for _ in range(rng.randint(0, 20))])
+    else:
+        player = PlayerState("p", _numbers(rng, 3), (0.0, 0.0))
+        player.velocity = list(_numbers(rng, 3))
+        player.on_ground = rng.random() < 0.5
+        message = create_move_ack_message(rng.randint(0, 2 ** 32 - 1), rng.choice([None, player]))
+    message.player_id = rng.choice([None, _text(rng)])
+    return message
+
+
+def test_binary_round_trips_match_json():
+    """Test that random hot messages decode from binary exactly as from JSON."""
+    print("🧪 Testing binary round trips...")
+    rng = random.Random(24)
+    for _ in range(3000):
+        message = _random_message(rng)
+        frame = encode_message(message, "binary")
+        assert isinstance(frame, bytes) and is_message_frame(frame), message.data
+        assert not is_chunk_frame(frame) and not is_compressed_frame(frame)
+        expected = Message.from_json(message.to_json())
+        decoded = decode_message(frame)
+        assert (decoded.type, decoded.data, decoded.player_id) == (expected.type, expected.data, expected.player_id)
+        assert len(frame) < len(message.to_json().encode())
+    print("  ✅ 3000 random messages round-trip like JSON, in fewer bytes")
+
+
+def test_json_fallback_and_malformed_frames():
+    """Test that data outside the layouts stays JSON and bad frames are refused."""
+    print("🧪 Testing JSON fallback...")
+    odd = [
+        create_chat_message("hello"),                                                   # No layout
+        Message(MessageType.PLAYER_MOVE, {"position": [1, 2, 3], "rotation": [0, 0], "extra": 1}),
+        Message(MessageType.PLAYER_MOVE, {"position": [1, 2], "rotation": [0, 0]}),
+        Message(MessageType.PLAYER_MOVE, {"position": [True, 2, 3], "rotation": [0, 0]}),
+        Message(MessageType.PLAYER_MOVE, {"position": [1, 2, 3], "rotation": [0, 0], "seq": -1}),
+        Message(MessageType.BLOCK_PLACE, {"position": [1.5, 2, 3], "block_type": "stone"}),
+        Message(MessageType.BLOCK_DESTROY, {"position": [2 ** 31, 0, 0]}),
+        Message(MessageType.MOVE_ACK, {"seq": 3, "position": [1, 2, 3]}),               # Partial correction
+        Message(MessageType.WORLD_UPDATE, {"blocks": [{"position": [1, 2, 3], "block_type": "sand"}]}),
+        Message(MessageType.BLOCK_DESTROY, {"position": [1, 2, 3]}, player_id=42),
+    ]
+    for message in odd:
+        frame = encode_message(message, "binary")
+        assert frame == message.to_json()
+        assert decode_message(frame).data == json.loads(frame)["data"]
+    move = create_player_move_message((1.0, 2.0, 3.0), (4.0, 5.0), 6)
+    assert encode_message(move) == encode_message(move, "json") == move.to_json()
+
+    frame = encode_message(move, "binary")
+    for bad in (frame[:-1], frame + b"\x00", frame[:10], b"\x3f\x00", b"CVCK"):
+        try:
+            decode_message(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"Accepted a malformed frame: {bad!r}")
+    print("  ✅ Anything the layouts can't hold exactly is sent as JSON")
+
+
+def test_codec_negotiated_at_join():
+    """Test that binary clients get binary hot messages and JSON clients keep JSON."""
+    print("🧪 Testing codec negotiation...")
+
+    async def run():
+        server = MinecraftServer()
+        binary_id, binary = await join_player(server, create_player_join_message("bin", compression=()))
+        text_id, text = await join_player(server, {"name": "txt"})
+        inits = [websocket.data(MessageType.WORLD_INIT)[0] for websocket in (binary, text)]
+        assert [init["message_codec"] for init in inits] == ["binary", "json"]
+        binary.frames.clear()
+        text.frames.clear()
+
+        # A binary move from the client goes through the same handlers
+        move = decode_message(encode_message(create_player_move_message((66.0, 100.0, 64.0), (0.0, 0.0), 1), "binary"))
+        await server.handle_client_message(binary_id, move)
+        await server._apply_pending_moves()
+        await server.handle_client_message(text_id, create_block_place_message((70, 100, 70), "brick"))
+        await server.flush_outboxes()
+
+        assert server.players[binary_id].position == (66.0, 100.0, 64.0)
+        assert binary.data(MessageType.MOVE_ACK) == [{"seq": 1}]
+        assert all(isinstance(frame, bytes) for frame in binary.frames)  # Chunks, ack and update
+        updates = {name: [frame for frame in websocket.frames if not is_chunk_frame(frame)
+                          and decode_message(frame).type == MessageType.WORLD_UPDATE]
+                   for name, websocket in (("binary", binary), ("text", text))}
+        assert len(updates["binary"]) == 1 and isinstance(updates["binary"][0], bytes)
+        assert len(updates["text"]) == 1 and isinstance(updates["text"][0], str)
+        assert decode_message(updates["binary"][0]).data == decode_message(updates["text"][0]).data
+
+    asyncio.run(run())
+    print("  ✅ Each client gets the codec it negotiated")
+
+
+if __name__ == "__main__":
+    test_binary_round_trips_match_json()
+    test_json_fallback_and_malformed_frames()
+    test_codec_negotiated_at_join()
+    print("✅ ALL TESTS PASSED")
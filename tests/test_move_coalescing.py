@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test tick-aligned PLAYER_MOVE handling: per-player buffering of the latest
+move, swept validation from the last accepted position and no echo.
+"""
+
+import sys
+import os
+import asyncio
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer
+from protocol import Message, MessageType, BlockType, create_player_move_message
+from server_helpers import FakeWebSocket, run_tick
+
+
+def test_only_latest_move_is_applied_per_tick():
+    """Test that a burst of moves costs one validation and is not echoed."""
+    print("🧪 Testing PLAYER_MOVE coalescing...")
+
+    async def run():
+        server = MinecraftServer()
+        mover, watcher = FakeWebSocket(), FakeWebSocket()
+        mover_id = await server.register_client(mover)
+        await server.register_client(watcher)
+        await run_tick(server)
+        mover.frames.clear()
+        watcher.frames.clear()
+
+        for step in range(1, 11):
+            await server.handle_client_message(mover_id, create_player_move_message((64.0 + step * 0.1, 100.0, 64.0),
+                                                                                  (float(step), 0.0)))
+        assert server.players[mover_id].position == (64.0, 100.0, 64.0)  # Nothing applied before the tick
+        await run_tick(server)
+        assert server.players[mover_id].position == (65.0, 100.0, 64.0)
+        assert server.move_stats == {"applied": 1, "coalesced": 9, "rejected": 0}
+        assert mover.data("player_update") == [] and mover.data("error") == []
+        entries = watcher.data("player_snapshot")[-1]["players"]
+        assert [entry["p"] for entry in entries if entry["id"] == mover_id] == [[65 * 64, 100 * 64, 64 * 64]]
+
+    asyncio.run(run())
+    print("  ✅ One move per player per tick, carried by the snapshot")
+
+
+def test_swept_validation_and_corrections():
+    """Test that a move through a wall is refused and corrected."""
+    print("🧪 Testing swept move validation...")
+
+    async def run():
+        server = MinecraftServer()
+        websocket = FakeWebSocket()
+        player_id = await server.register_client(websocket)
+        for y in range(98, 104):
+            for z in range(61, 68):
+                assert server.world.add_block((66, y, z), BlockType.BRICK)
+
+        # The end point is clear, but the straight path crosses the wall
+        await server.handle_client_message(player_id, create_player_move_message((68.5, 100.0, 64.0), (0.0, 0.0)))
+        await run_tick(server)
+        assert server.players[player_id].position == (64.0, 100.0, 64.0)
+        assert websocket.data("error")[-1]["message"] == "Movement blocked by blocks"
+        assert websocket.data("player_update")[-1]["position"] == [64.0, 100.0, 64.0]
+        assert server.move_stats["rejected"] == 1
+
+        # Along the wall is fine
+        await server.handle_client_message(player_id, create_player_move_message((64.0, 100.0, 66.0), (0.0, 0.0)))
+        await run_tick(server)
+        assert server.players[player_id].position == (64.0, 100.0, 66.0)
+
+        # Malformed moves are refused on arrival and never buffered
+        await server.handle_client_message(player_id, Message(MessageType.PLAYER_MOVE, {"position": [1, 2],
+                                                                                        "rotation": [0, 0]}))
+        await server.flush_outboxes()
+        assert websocket.data("error")[-1]["message"] == "Invalid position format"
+        assert not server.pending_moves
+
+    asyncio.run(run())
+    print("  ✅ Moves through blocks are refused with the authoritative position")
+
+
+if __name__ == "__main__":
+    test_only_latest_move_is_applied_per_tick()
+    test_swept_validation_and_corrections()
+    print("✅ ALL TESTS PASSED")
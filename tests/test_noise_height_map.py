@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test that the vectorized NoiseGen.height_map matches the scalar getHeight exactly.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from noise_gen import NoiseGen
+from server import GameWorld, WORLD_SIZE
+from protocol import BlockType
+
+
+def _assert_bit_identical(gen, x0, z0, w, h):
+    heights = gen.height_map(x0, z0, w, h)
+    assert heights.shape == (w, h)
+    for i in range(w):
+        for j in range(h):
+            expected = gen.getHeight(x0 + i, z0 + j)
+            assert heights[i, j] == expected, \
+                f"Height mismatch at ({x0 + i}, {z0 + j}): {heights[i, j]!r} != {expected!r}"
+
+
+def test_height_map_matches_scalar_path():
+    """Test the default world area and seed."""
+    print("🧪 Testing height_map against getHeight...")
+    _assert_bit_identical(NoiseGen(452692), 0, 0, WORLD_SIZE, WORLD_SIZE)
+    print("  ✅ Default world heights are bit-identical")
+
+
+def test_height_map_other_regions_and_seeds():
+    """Test negative, far-away and odd-sized regions with other seeds."""
+    print("🧪 Testing height_map on other regions...")
+    _assert_bit_identical(NoiseGen(452692), -300, -77, 31, 17)
+    _assert_bit_identical(NoiseGen(1), 100000, -250000, 12, 12)
+    _assert_bit_identical(NoiseGen(987654321), 5, 9, 1, 1)
+    print("  ✅ Other regions are bit-identical")
+
+
+def test_world_surface_follows_height_map():
+    """Test that generated columns sit on the scalar terrain height."""
+    print("🧪 Testing world generation from height map...")
+    world = GameWorld()
+    gen = NoiseGen(452692)
+    for x, z in [(17, 90), (64, 64), (40, 100), (127, 127)]:
+        h = int(gen.getHeight(x, z))
+        assert h >= 0
+        assert world.get_block((x, h, z)) in {BlockType.GRASS, BlockType.SAND}
+    print("  ✅ World surface matches scalar heights")
+
+
+if __name__ == "__main__":
+    test_height_map_matches_scalar_path()
+    test_height_map_other_regions_and_seeds()
+    test_world_surface_follows_height_map()
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test the per-tick PLAYER_SNAPSHOT that replaces one PLAYER_UPDATE per player:
+quantized entries, per-tick deltas and keyframes.
+"""
+
+import sys
+import os
+import json
+import random
+import asyncio
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import MinecraftServer
+from protocol import (
+    Message, PlayerState, PlayerSnapshotDecoder, create_player_snapshot_message,
+    quantize_player_state, dequantize_player_state, player_state_delta,
+    POSITION_STEPS, ROTATION_STEPS,
+)
+from server_helpers import FakeWebSocket, run_tick
+
+
+def test_one_snapshot_per_tick():
+    """Test that a tick sends one frame per client with only the players that changed."""
+    print("🧪 Testing per-tick player snapshots...")
+
+    async def run():
+        server = MinecraftServer()
+        sockets = [FakeWebSocket() for _ in range(3)]
+        ids = [await server.register_client(websocket) for websocket in sockets]
+
+        await run_tick(server)
+        for websocket in sockets:
+            snapshots = websocket.data("player_snapshot")
+            assert len(snapshots) == 1 and snapshots[0]["keyframe"]  # New clients start from a keyframe
+            assert sorted(player["id"] for player in snapshots[0]["players"]) == sorted(ids)
+
+        server.players[ids[1]].position = (10.0, 80.0, 10.0)
+        await run_tick(server)
+        latest = sockets[0].data("player_snapshot")[-1]
+        assert latest["players"] == [{"id": ids[1], "p": [640, 5120, 640]}]
+        assert latest["tick"] == 2 and not latest["keyframe"]
+
+        # Nothing moved: nothing is sent
+        await run_tick(server)
+        assert all(len(websocket.data("player_snapshot")) == 2 for websocket in sockets)
+        assert not any(websocket.data("player_update") for websocket in sockets)
+
+        # A client that lost frames to its full outbox is resynced with a keyframe
+        server.outboxes[ids[2]].dropped += 1
+        server.players[ids[0]].rotation = (90.0, 0.0)
+        await run_tick(server)
+        assert sockets[2].data("player_snapshot")[-1]["keyframe"] and len(sockets[2].data("player_snapshot")[-1]["players"]) == 3
+        assert sockets[1].data("player_snapshot")[-1]["players"] == [{"id": ids[0], "r": [64, 0]}]
+
+    asyncio.run(run())
+    print("  ✅ One snapshot per tick with the changed players")
+
+
+def test_client_applies_snapshot():
+    """Test that the client updates every other player from one snapshot."""
+    print("🧪 Testing client snapshot handling...")
+    from minecraft_client_fr import AdvancedNetworkClient
+
+    window = SimpleNamespace(model=SimpleNamespace(other_players={}))
+    client = AdvancedNetworkClient(window, "ws://test")
+    client.player_id = "me"
+    players = [PlayerState(pid, (float(n), 50.0, 0.0), (0.0, 0.0)) for n, pid in enumerate(["me", "a", "b"])]
+    entries = [quantize_player_state(player) for player in players]
+    message = Message.from_json(create_player_snapshot_message(7, entries, keyframe=True).to_json())
+    client._handle_server_message(message)
+    assert sorted(window.model.other_players) == ["a", "b"]
+    assert window.model.other_players["b"].position == (2.0, 50.0, 0.0)
+
+    delta = Message.from_json(create_player_snapshot_message(8, [{"id": "a", "g": True}]).to_json())
+    client._handle_server_message(delta)
+    assert window.model.other_players["a"].on_ground and window.model.other_players["a"].position == (1.0, 50.0, 0.0)
+    print("  ✅ Other players are updated, our own entry is skipped")
+
+
+def test_quantization_error_is_bounded():
+    """Test that fixed-point entries reconstruct within half a step."""
+    print("🧪 Testing player state quantization error...")
+    rng = random.Random(19)
+    for _ in range(2000):
+        player = PlayerState("p", tuple(rng.uniform(-5000, 5000) for _ in range(3)),
+                             (rng.uniform(-1080, 1080), rng.uniform(-90, 90)))
+        player.velocity = [rng.uniform(-50, 50) for _ in range(3)]
+        rebuilt = dequantize_player_state(json.loads(json.dumps(quantize_player_state(player))))
+        for original, value in zip(player.position, rebuilt.position):
+            assert abs(original - value) <= 0.5 / POSITION_STEPS + 1e-9
+        yaw_error = (player.rotation[0] - rebuilt.rotation[0] + 180) % 360 - 180
+        assert abs(yaw_error) <= 180 / ROTATION_STEPS + 1e-9
+        assert abs(player.rotation[1] - rebuilt.rotation[1]) <= 180 / ROTATION_STEPS + 1e-9
+        assert 0 <= rebuilt.rotation[0] < 360
+    print(f"  ✅ Position within 1/{2 * POSITION_STEPS} block, rotation within {180 / ROTATION_STEPS:.2f}°")
+
+
+def test_deltas_rebuild_keyframes_and_recover_from_loss():
+    """Test that a stream of deltas matches the keyframes, and keyframes heal a lost snapshot."""
+    print("🧪 Testing snapshot deltas and keyframe recovery...")
+    rng = random.Random(7)
+    players = [PlayerState(f"p{n}", (0.0, 60.0, 0.0), (0.0, 0.0)) for n in range(5)]
+    streamed, lossy = PlayerSnapshotDecoder(), PlayerSnapshotDecoder()
+    baselines = {}
+    for tick in range(1, 60):
+        for player in rng.sample(players, 2):
+            x, y, z = player.position
+            player.position = (x + rng.uniform(-1, 1), y, z + rng.uniform(-1, 1))
+            player.on_ground = rng.random() < 0.5
+        states = {player.id: quantize_player_state(player) for player in players}
+        keyframe = tick % 20 == 0
+        if keyframe:
+            entries = list(states.values())
+        else:
+            entries = [delta for delta in (player_state_delta(state, baselines.get(pid))
+                                           for pid, state in states.items()) if delta is not None]
+        baselines = states
+        data = json.loads(create_player_snapshot_message(tick, entries, keyframe).to_json())["data"]
+        streamed.apply(data)
+        if tick != 10:  # This client loses one delta snapshot
+            lossy.apply(data)
+        assert streamed.baselines == states
+        if tick < 10:
+            assert lossy.baselines == states
+        elif tick >= 20:
+            assert lossy.baselines == states  # The keyframe at tick 20 healed it
+    print("  ✅ Deltas track the state; keyframes recover lost snapshots")
+
+
+if __name__ == "__main__":
+    test_one_snapshot_per_tick()
+    test_client_applies_snapshot()
+    test_quantization_error_is_bounded()
+    test_deltas_rebuild_keyframes_and_recover_from_loss()
+    print("✅ ALL TESTS PASSED")
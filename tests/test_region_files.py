@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test region-file world storage with lazy per-chunk loading.
+"""
+
+import sys
+import os
+import tempfile
+import zlib
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import GameWorld
+from protocol import BlockType
+from world_storage import RegionFile, RegionStore, REGION_SIZE
+from minecraft_physics import UnifiedCollisionManager
+
+
+def test_region_file_round_trip():
+    """Test chunk payloads, metadata and rewrites in a single region file."""
+    print("🧪 Testing region file round trip...")
+    with tempfile.TemporaryDirectory() as region_dir:
+        store = RegionStore(region_dir)
+        first = bytes(range(256)) * 256
+        store.save_chunk(-1, 33, first, {(-5, 10, 530): ("cam", "p1")}, 7)
+        store.save_chunk(-1, 33, b"\x02" * len(first), {}, 9)  # rewrite is appended
+        store.save_chunk(0, 0, first, {}, 3)
+        store.close()
+
+        store = RegionStore(region_dir)
+        assert sorted(os.listdir(region_dir)) == ["r.-1.1.region", "r.0.0.region"]
+        assert store.chunk_counts() == {(-1, 33): 9, (0, 0): 3}
+        assert store.load_array(-1, 33) == b"\x02" * len(first)
+        assert store.load_array(0, 0) == first
+        assert store.load_metadata() == {}
+        try:
+            store.load_array(5, 5)
+            assert False, "Missing chunk should raise KeyError"
+        except KeyError:
+            pass
+        store.close()
+
+        for kwargs in ({"height": 128}, {"world_key": (1, 2, 128)}):
+            try:
+                RegionFile(os.path.join(region_dir, "r.0.0.region"), **kwargs)
+                assert False, f"Region opened with {kwargs} should be rejected"
+            except ValueError:
+                pass
+    assert REGION_SIZE == 32
+    print("  ✅ Region files round-trip chunk payloads")
+
+
+def test_rewrites_reuse_free_space():
+    """Test that rewriting and deleting chunks does not grow a region file without bound."""
+    print("🧪 Testing region file space reuse...")
+    with tempfile.TemporaryDirectory() as region_dir:
+        path = os.path.join(region_dir, "r.0.0.region")
+        region = RegionFile(path)
+        noisy = os.urandom(4096)  # Does not compress: the payload is about as large as the array
+        for n in range(50):
+            region.write_chunk(0, 0, noisy[:2048 + n * 37 % 2048], [[[1, 2, 3], f"cam_{n}", None]], n)
+            region.write_chunk(1, 0, b"\x01" * 4096, [], 1)
+        largest = len(zlib.compress(noisy, 1)) + 64 + len(zlib.compress(b"\x01" * 4096, 1))
+        assert os.path.getsize(path) <= RegionFile.DATA_OFFSET + 3 * largest
+        assert region.read_array(0, 0) == noisy[:2048 + 49 * 37 % 2048]
+        assert region.read_metadata(0, 0) == [[[1, 2, 3], "cam_49", None]]
+        region.delete_chunk(1, 0)
+        region.close()
+
+        # Free space is found again from the table when the file is reopened
+        size = os.path.getsize(path)
+        region = RegionFile(path)
+        for n in range(20):
+            region.write_chunk(2, 0, b"\x01" * 4096, [], 1)
+            region.write_chunk(0, 0, noisy[:2048], [], 2)
+        assert os.path.getsize(path) <= size
+        assert [count for _lx, _lz, count in region.chunk_counts()] == [2, 1]
+        assert region.read_array(0, 0) == noisy[:2048]
+        assert region.read_array(1, 0) is None
+        assert region.read_array(2, 0) == b"\x01" * 4096
+        region.close()
+    print("  ✅ Old payload space is reused")
+
+
+def test_chunks_load_on_first_touch():
+    """Test that a region-backed world starts empty and loads chunks lazily."""
+    print("🧪 Testing lazy chunk loading...")
+    reference = GameWorld(storage="voxel")
+    with tempfile.TemporaryDirectory() as region_dir:
+        GameWorld(storage="voxel", region_dir=region_dir).world.regions.close()
+
+        world = GameWorld(storage="voxel", region_dir=region_dir)
+        store = world.world
+        assert not store.chunks, "No chunk should be read at startup"
+        assert len(store) == len(reference.world)
+        assert world.block_id_map == reference.block_id_map
+
+        assert world.get_world_chunk(4, 4) == reference.get_world_chunk(4, 4)
+        assert set(store.chunks) == {(4, 4)}
+
+        # The physics engine goes through the same lookups
+        x, z = 20, 100
+        surface = max(y for y in range(256) if (x, y, z) in reference.world)
+        manager = UnifiedCollisionManager(store)
+        assert manager.check_block_collision((x, surface, z))
+        assert set(store.chunks) == {(4, 4), (1, 6)}
+        assert not store.is_loaded(0, 0) and store.is_loaded(1, 6)
+        store.regions.close()
+    print("  ✅ Chunks are read on first touch only")
+
+
+def test_edits_are_written_back():
+    """Test that changed chunks are flushed to the region files."""
+    print("🧪 Testing region write-back...")
+    with tempfile.TemporaryDirectory() as region_dir:
+        world = GameWorld(storage="voxel", region_dir=region_dir)
+        assert world.add_block((30, 120, 30), BlockType.CAMERA, block_id="camera_9", owner="p2")
+        assert world.add_user_block("player-uuid", (31.0, 120.0, 30.0))  # A connected player
+        assert world.flush() == 1
+        assert world.get_block((31, 120, 30)) == BlockType.USER
+        world.world.regions.close()
+
+        reopened = GameWorld(storage="voxel", region_dir=region_dir)
+        assert reopened.block_id_map["camera_9"] == (30, 120, 30)
+        assert reopened.world[(30, 120, 30)].owner == "p2"
+        assert reopened.get_block((31, 120, 30)) is None and "player-uuid" not in reopened.block_id_map
+        assert len(reopened.world) == len(world.world) - 1
+        reopened.world.regions.close()
+
+        # Regions written for another world size are refused rather than mixed in
+        try:
+            GameWorld(storage="voxel", region_dir=region_dir, world_size=256)
+            assert False, "Regions of another world should be rejected"
+        except ValueError:
+            pass
+
+    try:
+        GameWorld(storage="dict", region_dir="unused")
+        assert False, "Region files should require voxel storage"
+    except ValueError:
+        pass
+    print("  ✅ Edits survive a reopen")
+
+
+def test_world_wide_queries_stay_lazy():
+    """Test that listing cameras and resetting the terrain don't load every chunk."""
+    print("🧪 Testing camera listing and reset on a lazy world...")
+    with tempfile.TemporaryDirectory() as region_dir:
+        world = GameWorld(storage="voxel", region_dir=region_dir)
+        assert world.add_block((100, 120, 100), BlockType.BRICK)
+        world.flush()
+        world.world.regions.close()
+
+        reopened = GameWorld(storage="voxel", region_dir=region_dir)
+        store = reopened.world
+        camera_chunks = {(x // 16, z // 16) for x, _y, z in reopened.block_id_map.values()}
+        cameras = reopened.get_cameras()
+        assert sorted(camera["block_id"] for camera in cameras) == [f"camera_{i}" for i in range(5)]
+        assert set(store.chunks) == camera_chunks and len(camera_chunks) < len(store.chunk_counts)
+
+        assert reopened.reset_to_natural_terrain() == 6
+        assert reopened.get_block((100, 120, 100)) is None and reopened.get_cameras() == []
+        assert set(store.chunks) == camera_chunks | {(6, 6)}
+        store.regions.close()
+    print("  ✅ Only chunks holding cameras or player blocks are loaded")
+
+
+if __name__ == "__main__":
+    test_region_file_round_trip()
+    test_rewrites_reuse_free_space()
+    test_chunks_load_on_first_touch()
+    test_edits_are_written_back()
+    test_world_wide_queries_stay_lazy()
+    print("✅ ALL TESTS PASSED")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test remote player interpolation: persistent RemotePlayer objects updated in
+place, interpolated between timestamped samples and briefly extrapolated.
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from protocol import (
+    Message, PlayerState, RemotePlayer, create_player_update_message, create_player_snapshot_message,
+    create_player_list_message, quantize_player_state, INTERPOLATION_DELAY, MAX_EXTRAPOLATION,
+)
+
+
+def _state(x, yaw=0.0):
+    return PlayerState("p", (x, 60.0, 0.0), (yaw, 0.0))
+
+
+def test_interpolates_between_samples():
+    """Test positions and rotations between, before and after the samples."""
+    print("🧪 Testing interpolation between updates...")
+    player = RemotePlayer.from_state(_state(0.0, 350.0), 0.0)
+    player.apply_state(_state(1.0, 10.0), 0.1)
+    player.apply_state(_state(2.0, 30.0), 0.2)
+
+    position, rotation = player.sample(0.05 + INTERPOLATION_DELAY)
+    assert abs(position[0] - 0.5) < 1e-9 and abs(rotation[0]) < 1e-9  # 350 -> 10 goes through 0
+    assert abs(player.sample(0.15 + INTERPOLATION_DELAY)[0][0] - 1.5) < 1e-9
+    assert player.sample(-1.0)[0] == (0.0, 60.0, 0.0)
+    assert player.position == (2.0, 60.0, 0.0)  # The state itself is the newest update
+    assert player.get_render_position(0.15 + INTERPOLATION_DELAY)[1] == 60.0 + player.size
+
+    # Past the newest sample: dead reckoning, then back to the last known position
+    extrapolated = [player.sample(0.2 + INTERPOLATION_DELAY + ahead)[0][0]
+                    for ahead in (MAX_EXTRAPOLATION / 2, MAX_EXTRAPOLATION, 1.5 * MAX_EXTRAPOLATION, 1.0)]
+    assert [round(x, 6) for x in extrapolated] == [2.5, 3.0, 2.5, 2.0]
+    print("  ✅ Smooth between updates, bounded past the newest one")
+
+
+def test_rendering_is_smooth_at_low_update_rates():
+    """Test that 60 FPS frames of a player updated at 10 Hz advance evenly."""
+    print("🧪 Testing 10 Hz updates rendered at 60 FPS...")
+    player = None
+    rendered = []
+    for frame in range(120):
+        now = frame / 60
+        if frame % 6 == 0:  # 10 Hz, walking at 4 blocks/s
+            state = _state(4.0 * now)
+            if player is None:
+                player = RemotePlayer.from_state(state, now)
+            else:
+                player.apply_state(state, now)
+        rendered.append(player.get_render_position(now)[0])
+    steps = [b - a for a, b in zip(rendered, rendered[1:])][12:]  # Once the buffer covers the delay
+    assert all(abs(step - 4.0 / 60) < 1e-9 for step in steps)
+    assert len(player.samples) == player.samples.maxlen
+    print("  ✅ Even steps every frame instead of a jump every 6 frames")
+
+
+def test_client_updates_players_in_place():
+    """Test that updates, snapshots and player lists reuse the same objects."""
+    print("🧪 Testing in-place remote player updates...")
+    from minecraft_client_fr import AdvancedNetworkClient
+
+    window = SimpleNamespace(model=SimpleNamespace(other_players={}))
+    client = AdvancedNetworkClient(window, "ws://test")
+    client.player_id = "me"
+    a, b = PlayerState("a", (1.0, 50.0, 0.0), (0.0, 0.0)), PlayerState("b", (2.0, 50.0, 0.0), (0.0, 0.0))
+
+    client._handle_server_message(Message.from_json(create_player_update_message(a).to_json()))
+    remote_a = window.model.other_players["a"]
+    assert isinstance(remote_a, RemotePlayer)
+
+    a.position = (1.5, 50.0, 0.0)
+    snapshot = create_player_snapshot_message(1, [quantize_player_state(a), quantize_player_state(b)], keyframe=True)
+    client._handle_server_message(Message.from_json(snapshot.to_json()))
+    assert window.model.other_players["a"] is remote_a and len(remote_a.samples) == 2
+    assert remote_a.position == (1.5, 50.0, 0.0)
+
+    # Later updates are decoded straight into the existing objects: no PlayerState per update
+    built = []
+    init = PlayerState.__init__
+    PlayerState.__init__ = lambda self, *args, **kwargs: (built.append(args[0]), init(self, *args, **kwargs))[1]
+    try:
+        a.position, b.position = (2.0, 50.0, 0.0), (3.0, 50.0, 0.0)
+        snapshot = create_player_snapshot_message(2, [quantize_player_state(a), quantize_player_state(b)])
+        client._handle_server_message(Message.from_json(snapshot.to_json()))
+        client._handle_server_message(Message.from_json(create_player_update_message(a).to_json()))
+    finally:
+        PlayerState.__init__ = init
+    assert built == [] and remote_a.position == (2.0, 50.0, 0.0)
+    assert window.model.other_players["b"].position == (3.0, 50.0, 0.0)
+
+    # Listed players outside our area of interest never get a snapshot: no ghost for them
+    far = PlayerState("far", (900.0, 50.0, 0.0), (0.0, 0.0))
+    client._handle_server_message(Message.from_json(create_player_list_message([a, far]).to_json()))
+    assert list(window.model.other_players) == ["a"] and window.model.other_players["a"] is remote_a
+    print("  ✅ One object per remote player for its whole visit")
+
+
+if __name__ == "__main__":
+    test_interpolates_between_samples()
+    test_rendering_is_smooth_at_low_update_rates()
+    test_client_updates_players_in_place()
+    print("✅ ALL TESTS PASSED")
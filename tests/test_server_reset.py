@@ -31,7 +31,7 @@ def test_server_initialization_with_reset():
     
     # Verify no camera blocks exist
     camera_blocks = [pos for pos, data in server.world.world.items() 
-                     if isinstance(data, dict) and data.get("type") == BlockType.CAMERA]
+                     if data.type == BlockType.CAMERA]
     assert len(camera_blocks) == 0, f"Expected 0 camera blocks, got {len(camera_blocks)}"
     print("  ✅ No camera blocks found (expected)")
     
@@ -41,10 +41,7 @@ def test_server_initialization_with_reset():
                      BlockType.WATER, BlockType.WOOD, BlockType.LEAF}
     
     for pos, block_data in server.world.world.items():
-        if isinstance(block_data, dict):
-            block_type = block_data.get("type")
-        else:
-            block_type = block_data
+        block_type = block_data.type
         
         if block_type not in natural_types:
             non_natural_blocks.append((pos, block_type))
@@ -63,7 +60,7 @@ def test_server_initialization_without_reset():
     
     # Verify camera blocks exist
     camera_blocks = [pos for pos, data in server.world.world.items() 
-                     if isinstance(data, dict) and data.get("type") == BlockType.CAMERA]
+                     if data.type == BlockType.CAMERA]
     assert len(camera_blocks) == 5, f"Expected 5 camera blocks, got {len(camera_blocks)}"
     print(f"  ✅ Found {len(camera_blocks)} camera blocks (expected)")
     
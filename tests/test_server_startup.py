@@ -96,7 +96,7 @@ def test_server_instantiation_with_args():
     # Verify reset was applied (no camera blocks)
     from protocol import BlockType
     camera_blocks = [pos for pos, data in server.world.world.items() 
-                     if isinstance(data, dict) and data.get("type") == BlockType.CAMERA]
+                     if data.type == BlockType.CAMERA]
     assert len(camera_blocks) == 0, f"Expected 0 camera blocks after reset, got {len(camera_blocks)}"
     
     print(f"  ✅ Server instantiated with host={server.host}, port={server.port}, reset_world=True")
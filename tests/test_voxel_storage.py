@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the NumPy voxel storage backend for GameWorld.
+"""
+
+import sys
+import os
+import random
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import GameWorld, create_block_data
+from protocol import BlockType
+from world_storage import ChunkedVoxelStore
+from minecraft_physics import UnifiedCollisionManager
+
+
+def test_store_mapping_semantics():
+    """Test that the voxel store behaves like the dict it replaces."""
+    print("🧪 Testing voxel store mapping semantics...")
+    store = ChunkedVoxelStore(create_block_data)
+
+    store[(1, 2, 3)] = create_block_data(BlockType.STONE)
+    store[(-5, 10, 40)] = create_block_data(BlockType.CAMERA, block_id="cam", owner="p1")
+    assert len(store) == 2
+    assert (1, 2, 3) in store and (1.0, 2.0, 3.0) in store
+    assert (1.5, 2, 3) not in store and (0, 0, 0) not in store and (1, 999, 3) not in store
+    assert store[(1, 2, 3)] == create_block_data(BlockType.STONE)
+    assert store[(-5, 10, 40)].owner == "p1"
+    assert store.get((9, 9, 9)) is None
+    assert dict(store.items()) == {
+        (1, 2, 3): create_block_data(BlockType.STONE),
+        (-5, 10, 40): create_block_data(BlockType.CAMERA, block_id="cam", owner="p1"),
+    }
+
+    # Overwriting keeps the count, deleting clears metadata
+    store[(-5, 10, 40)] = create_block_data(BlockType.BRICK)
+    assert len(store) == 2 and store[(-5, 10, 40)].block_id is None
+    del store[(1, 2, 3)]
+    assert (1, 2, 3) not in store and len(store) == 1
+    try:
+        del store[(1, 2, 3)]
+        assert False, "Deleting a missing block should raise KeyError"
+    except KeyError:
+        pass
+    print("  ✅ Voxel store matches dict semantics")
+
+
+def test_voxel_world_matches_dict_world():
+    """Test that both backends generate and serve the same world."""
+    print("🧪 Testing voxel-backed GameWorld...")
+    random.seed(1234)
+    dict_world = GameWorld()
+    random.seed(1234)
+    voxel_world = GameWorld(storage="voxel")
+
+    assert len(voxel_world.world) < len(dict_world.world), "Voxel chunks are generated on demand"
+    voxel_world.generate_chunks()
+    assert len(voxel_world.world) == len(dict_world.world)
+    assert voxel_world.block_id_map == dict_world.block_id_map
+    for chunk_x, chunk_z in [(0, 0), (4, 4), (7, 2)]:
+        assert voxel_world.get_world_chunk(chunk_x, chunk_z) == dict_world.get_world_chunk(chunk_x, chunk_z)
+
+    # Mutations go through the same GameWorld API
+    assert voxel_world.add_block((20, 120, 20), BlockType.CAMERA, block_id="cam_v", owner="p")
+    assert voxel_world.get_block((20, 120, 20)) == BlockType.CAMERA
+    assert voxel_world.world[(20, 120, 20)].owner == "p"
+    assert any(c["block_id"] == "cam_v" for c in voxel_world.get_cameras())
+    assert voxel_world.remove_block((20, 120, 20))
+    assert voxel_world.get_block((20, 120, 20)) is None
+
+    assert voxel_world.reset_to_natural_terrain() == dict_world.reset_to_natural_terrain()
+    assert len(voxel_world.world) == len(dict_world.world)
+    print("  ✅ Voxel world matches dict world")
+
+
+def test_physics_on_voxel_world():
+    """Test that collision detection works against the voxel store."""
+    print("🧪 Testing physics on voxel storage...")
+    store = ChunkedVoxelStore(create_block_data)
+    store[(10, 10, 10)] = create_block_data(BlockType.STONE)
+    manager = UnifiedCollisionManager(store)
+    assert manager.check_block_collision((10.0, 10.0, 10.0))
+    assert not manager.check_block_collision((10.0, 12.0, 10.0))
+    print("  ✅ Collision detection works on voxel storage")
+
+
+if __name__ == "__main__":
+    test_store_mapping_semantics()
+    test_voxel_world_matches_dict_world()
+    test_physics_on_voxel_world()
+    print("✅ ALL TESTS PASSED")
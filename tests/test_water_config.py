@@ -27,7 +27,7 @@ def test_water_collision_enabled():
     
     # Create water block data and verify
     water_data = create_block_data(BlockType.WATER)
-    assert water_data["collision"] == True, "Water block data should have collision=True when enabled"
+    assert water_data.collision == True, "Water block data should have collision=True when enabled"
     
     print("  ✅ Water has collision when WATER_COLLISION_ENABLED = True")
     print("  ✅ Players will walk on top of water\n")
@@ -45,7 +45,7 @@ def test_water_collision_disabled():
     
     # Create water block data and verify
     water_data = create_block_data(BlockType.WATER)
-    assert water_data["collision"] == False, "Water block data should have collision=False when disabled"
+    assert water_data.collision == False, "Water block data should have collision=False when disabled"
     
     print("  ✅ Water has NO collision when WATER_COLLISION_ENABLED = False")
     print("  ✅ Players can pass through water\n")
@@ -23,7 +23,7 @@ def test_water_has_collision():
     
     # Create water block data and verify
     water_data = create_block_data(BlockType.WATER)
-    assert water_data["collision"] == True, "Water block data should have collision=True"
+    assert water_data.collision == True, "Water block data should have collision=True"
     
     print("✅ Water blocks correctly have collision\n")
 
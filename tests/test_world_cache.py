@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test the seed-keyed world snapshot cache.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+from server import GameWorld, world_cache_path
+from protocol import BlockType
+
+
+def _assert_same_world(a, b):
+    a.generate_chunks()  # Voxel worlds generate chunks lazily
+    b.generate_chunks()
+    assert len(a.world) == len(b.world)
+    assert a.block_id_map == b.block_id_map
+    assert dict(a.world.items()) == dict(b.world.items())
+    assert set(a.sectors) == set(b.sectors)
+
+
+def test_snapshot_round_trip():
+    """Test that a cached world loads back identical, and snapshots load on both backends."""
+    print("🧪 Testing world snapshot round trip...")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        generated = GameWorld(storage="voxel", world_cache=cache_dir)
+        assert os.path.exists(world_cache_path(cache_dir))
+        loaded = GameWorld(storage="voxel", world_cache=cache_dir)
+        _assert_same_world(loaded, GameWorld())
+
+        # Player edits are part of a snapshot written explicitly
+        generated.add_block((10, 120, 10), BlockType.CAMERA, block_id="cam_x", owner="p1")
+        path = os.path.join(cache_dir, "edited.npz")
+        generated.save_snapshot(path)
+
+        for storage in server.STORAGE_BACKENDS:
+            loaded = GameWorld(storage=storage)
+            loaded.load_snapshot(path)
+            _assert_same_world(loaded, generated)
+            assert loaded.world[(10, 120, 10)].owner == "p1"
+            assert loaded.get_world_chunk(4, 4) == generated.get_world_chunk(4, 4)
+    print("  ✅ Snapshots round-trip on both backends")
+
+
+def test_world_cache_requires_voxel_storage():
+    """Test that the dict backend refuses a world cache it could not load quickly."""
+    print("🧪 Testing world cache storage backend...")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        try:
+            GameWorld(storage="dict", world_cache=cache_dir)
+            assert False, "A world cache on dict storage should be rejected"
+        except ValueError:
+            pass
+        assert not os.listdir(cache_dir)
+    print("  ✅ World caches need voxel storage")
+
+
+def test_generation_is_deterministic():
+    """Test that a seed always produces the same world, trees included."""
+    print("🧪 Testing deterministic generation...")
+    _assert_same_world(GameWorld(), GameWorld())
+    print("  ✅ Same seed, same world")
+
+
+def test_stale_or_corrupt_cache_regenerates():
+    """Test that a different key or a damaged file falls back to generation."""
+    print("🧪 Testing stale and corrupt caches...")
+    reference = GameWorld()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = world_cache_path(cache_dir)
+        with open(path, "wb") as f:
+            f.write(b"not a snapshot")
+        _assert_same_world(GameWorld(storage="voxel", world_cache=cache_dir), reference)
+
+        # A snapshot for another generator version is never picked up
+        original = server.WORLD_GENERATOR_VERSION
+        try:
+            server.WORLD_GENERATOR_VERSION = original + 1
+            assert world_cache_path(cache_dir) != path
+            GameWorld(storage="voxel", world_cache=cache_dir)
+            try:
+                GameWorld().load_snapshot(path)
+                assert False, "Snapshot from another generator version should be rejected"
+            except ValueError:
+                pass
+        finally:
+            server.WORLD_GENERATOR_VERSION = original
+    print("  ✅ Stale and corrupt caches are regenerated")
+
+
+if __name__ == "__main__":
+    test_snapshot_round_trip()
+    test_world_cache_requires_voxel_storage()
+    test_generation_is_deterministic()
+    test_stale_or_corrupt_cache_regenerates()
+    print("✅ ALL TESTS PASSED")
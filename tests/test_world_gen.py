@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test per-chunk world generation and configurable / unbounded world size.
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import GameWorld, MinecraftServer, WORLD_SEED, validate_position
+from protocol import BlockType
+from world_gen import generate_chunk, generate_chunks, LEAF_RADIUS
+from world_storage import BLOCK_CODES, CHUNK_SIZE
+
+
+def test_chunks_are_deterministic():
+    """Test that a chunk only depends on (seed, cx, cz)."""
+    print("🧪 Testing deterministic chunk generation...")
+    first = generate_chunk(WORLD_SEED, 3, -2)
+    generate_chunk(WORLD_SEED, 9, 9)  # Generation order must not matter
+    assert np.array_equal(first, generate_chunk(WORLD_SEED, 3, -2))
+    assert not np.array_equal(first, generate_chunk(WORLD_SEED + 1, 3, -2))
+    assert generate_chunk(WORLD_SEED, 8, 0, world_size=128) is None
+    print("  ✅ Chunks are pure functions of the seed and coordinates")
+
+
+def test_process_pool_matches_sequential():
+    """Test that pool generation returns the same chunks, in order."""
+    print("🧪 Testing process pool chunk generation...")
+    keys = [(cx, cz) for cx in range(-1, 3) for cz in range(-1, 2)]
+    sequential = list(generate_chunks(WORLD_SEED, keys, world_size=32))
+    pooled = list(generate_chunks(WORLD_SEED, keys, world_size=32, workers=2))
+    assert [key for key, _ in pooled] == keys
+    for (_, expected), (_, chunk) in zip(sequential, pooled):
+        assert (expected is None) == (chunk is None)
+        assert expected is None or np.array_equal(expected, chunk)
+
+    world = GameWorld(storage="voxel", world_size=64, generation_workers=2)
+    assert world.generate_chunks() == 16 - 4  # All but the spawn-area chunks
+    reference = GameWorld(storage="voxel", world_size=64)
+    reference.generate_chunks()
+    assert dict(world.world.items()) == dict(reference.world.items())
+    print("  ✅ Pool workers produce the sequential world")
+
+
+def test_trees_cross_chunk_borders():
+    """Test that leaves of trees near a border show up in the neighbouring chunk."""
+    print("🧪 Testing trees across chunk borders...")
+    leaf, wood = BLOCK_CODES[BlockType.LEAF], BLOCK_CODES[BlockType.WOOD]
+    crossings = 0
+    for cx in range(-4, 4):
+        for cz in range(-4, 4):
+            west, east = generate_chunk(WORLD_SEED, cx, cz), generate_chunk(WORLD_SEED, cx + 1, cz)
+            trunks = np.argwhere(west[CHUNK_SIZE - LEAF_RADIUS:] == wood)
+            for x, y, z in trunks:
+                column = west[CHUNK_SIZE - LEAF_RADIUS + x, :, z]
+                if column[y + 1] != wood:  # Top of the trunk: the leaves start right above
+                    crossings += 1
+                    assert east[0, y + 1, z] in (leaf, wood)
+    assert crossings > 0, "Expected at least one tree on a chunk border"
+    print(f"  ✅ {crossings} trees reach across chunk borders")
+
+
+def test_unbounded_world_generates_on_demand():
+    """Test that an unbounded world only generates the spawn area up front."""
+    print("🧪 Testing unbounded world generation...")
+    world = GameWorld(storage="voxel", world_size=0)
+    assert world.world_size is None
+    spawn_chunks = len(world.world.chunk_counts)
+    assert spawn_chunks == 25
+
+    far = (-50, 500)
+    assert not world.world.is_loaded(*far)
+    chunk = world.get_world_chunk(*far)
+    assert chunk["blocks"] and world.world.is_loaded(*far)
+    assert len(world.world.chunk_counts) == spawn_chunks + 1
+
+    x, z = far[0] * CHUNK_SIZE + 3, far[1] * CHUNK_SIZE + 3
+    assert validate_position((x, 60, z), world.world_size)
+    assert not validate_position((x, 60, z))
+    assert world.add_block((x, 120, z), BlockType.BRICK)
+
+    keys = world.chunks_by_distance((8.0, 50.0, 8.0), radius=1)
+    assert keys[0] == (0, 0) and len(keys) == 9
+
+    try:
+        GameWorld(world_size=0)
+        assert False, "An unbounded dict world should be rejected"
+    except ValueError:
+        pass
+    print("  ✅ Far chunks are generated on first touch")
+
+
+def test_bounded_world_size_setting():
+    """Test that the world size is a per-world setting."""
+    print("🧪 Testing configurable world size...")
+    world = GameWorld(storage="voxel", world_size=64)
+    assert world.get_world_data()["world_size"] == 64
+    assert len(world.chunks_by_distance((0.0, 0.0, 0.0))) == 16
+    assert world.get_world_chunk(5, 5)["blocks"] == {}
+    assert not world.add_block((70, 120, 10), BlockType.BRICK)
+    print("  ✅ World size bounds generation and edits")
+
+
+def test_physics_is_not_clamped_on_unbounded_worlds():
+    """Test that server and client physics keep players beyond 128 on an unbounded world."""
+    print("🧪 Testing physics far from the origin...")
+    server = MinecraftServer(world_storage="voxel", world_size=0)
+    player = SimpleNamespace(id="far", position=(300.0, 120.0, 300.0), velocity=[0.0, 0.0, 0.0],
+                             on_ground=False, flying=False, last_move_time=0.0)
+    server._apply_physics(player, 1 / 60)
+    x, y, z = player.position
+    assert (x, z) == (300.0, 300.0) and y < 120.0
+
+    # The client detector exists before WORLD_INIT says the world is unbounded
+    from minecraft_client_fr import EnhancedClientModel, MinecraftWindow
+    window = SimpleNamespace(model=EnhancedClientModel())
+    physics = MinecraftWindow._get_physics(window)
+    assert window._collision_detector.manager.world_size == 128
+    window.model.load_world_data(server.world.get_world_data())
+    assert MinecraftWindow._get_physics(window) is physics
+    position, _velocity, _on_ground = physics.update_position((300.0, 120.0, 300.0), (0.0, 0.0, 0.0),
+                                                              1 / 60, False, False)
+    assert position[0] == 300.0 and position[2] == 300.0
+    print("  ✅ Players far out stay where they are")
+
+
+if __name__ == "__main__":
+    test_chunks_are_deterministic()
+    test_process_pool_matches_sequential()
+    test_trees_cross_chunk_borders()
+    test_unbounded_world_generates_on_demand()
+    test_bounded_world_size_setting()
+    test_physics_is_not_clamped_on_unbounded_worlds()
+    print("✅ ALL TESTS PASSED")
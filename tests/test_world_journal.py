@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Test the write-ahead block journal: replay, torn writes and compaction.
+"""
+
+import sys
+import os
+import asyncio
+import errno
+import tempfile
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import GameWorld, MinecraftServer
+from protocol import BlockType
+from world_journal import BlockJournal, JournalError, list_segments, segment_path
+from server_helpers import join_player
+
+
+def _edit_world(world):
+    assert world.add_block((10, 120, 10), BlockType.BRICK)
+    assert world.add_block((11, 120, 10), BlockType.CAMERA, block_id="camera_7", owner="p1")
+    assert world.add_block((12, 120, 10), BlockType.WOOD)
+    assert world.remove_block((12, 120, 10))
+
+
+def _assert_edits_present(world):
+    assert world.get_block((10, 120, 10)) == BlockType.BRICK
+    assert world.world[(11, 120, 10)].owner == "p1"
+    assert world.block_id_map["camera_7"] == (11, 120, 10)
+    assert world.get_block((12, 120, 10)) is None
+
+
+def test_journal_replay_after_restart():
+    """Test that edits survive a restart, including camera owners."""
+    print("🧪 Testing journal replay...")
+    with tempfile.TemporaryDirectory() as journal_dir:
+        world = GameWorld(journal=BlockJournal(journal_dir, fsync_policy="always"))
+        _edit_world(world)
+        world.journal.close()
+
+        restored = GameWorld(journal=BlockJournal(journal_dir))
+        _assert_edits_present(restored)
+        assert len(restored.world) == len(world.world)
+        restored.journal.close()
+
+        # The server picks up the restored camera ids and cubes
+        server = MinecraftServer(journal_dir=journal_dir)
+        assert server._camera_counter == 8
+        assert server.camera_cubes["camera_7"].owner == "p1"
+        server.journal.close()
+    print("  ✅ Journaled edits are replayed on startup")
+
+
+def test_torn_final_record_is_ignored():
+    """Test that a crash mid-write only loses the unfinished record."""
+    print("🧪 Testing torn journal writes...")
+    with tempfile.TemporaryDirectory() as journal_dir:
+        world = GameWorld(journal=BlockJournal(journal_dir))
+        _edit_world(world)
+        world.journal.close()
+        with open(segment_path(journal_dir, list_segments(journal_dir)[-1]), "ab") as f:
+            f.write(b'["s",20,120,20,"bri')
+
+        restored = GameWorld(journal=BlockJournal(journal_dir))
+        _assert_edits_present(restored)
+        assert restored.get_block((20, 120, 20)) is None
+        restored.journal.close()
+    print("  ✅ Torn records are dropped")
+
+
+def test_compaction_folds_journal_into_snapshot():
+    """Test that compaction writes a snapshot and prunes the covered segments."""
+    print("🧪 Testing journal compaction...")
+    with tempfile.TemporaryDirectory() as journal_dir:
+        world = GameWorld(journal=BlockJournal(journal_dir, compact_edits=3))
+        _edit_world(world)
+        assert world.journal.needs_compaction
+        world.journal.compact(world)
+        assert world.add_block((13, 120, 10), BlockType.SAND)  # lands in the new segment
+        world.journal.close()
+
+        assert os.path.exists(world.journal.snapshot_path)
+        assert list_segments(journal_dir) == [world.journal.segment]
+
+        restored = GameWorld(journal=BlockJournal(journal_dir), reset_to_natural=True)
+        assert restored.get_block((13, 120, 10)) == BlockType.SAND
+        assert restored.get_block((10, 120, 10)) is None  # BRICK is not natural terrain
+        assert "camera_7" not in restored.block_id_map
+        restored.journal.close()
+
+        # The reset itself was journaled
+        again = GameWorld(storage="voxel", journal=BlockJournal(journal_dir))
+        assert again.get_block((11, 120, 10)) is None
+        assert again.get_block((13, 120, 10)) == BlockType.SAND
+        again.journal.close()
+    print("  ✅ Compaction keeps snapshot and journal tail consistent")
+
+
+def test_player_blocks_do_not_survive_restart():
+    """Test that a connected player's USER block is left out of the compacted snapshot."""
+    print("🧪 Testing restart with a connected player...")
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        server = MinecraftServer(journal_dir=journal_dir)
+        player_id, _ = asyncio.run(join_player(server))
+        marker = server.world.block_id_map[player_id]
+        assert server.world.get_block(marker) == BlockType.USER
+        assert server.world.add_block((10, 120, 10), BlockType.BRICK)
+        server.journal.compact(server.world)
+        server.journal.close()  # Stopped with the player still connected
+
+        for storage in ("dict", "voxel"):
+            restored = GameWorld(storage=storage, journal=BlockJournal(journal_dir))
+            assert restored.get_block(marker) is None
+            assert player_id not in restored.block_id_map
+            assert BlockType.USER not in {restored.get_block(p) for p in restored.block_id_map.values()}
+            assert restored.get_block((10, 120, 10)) == BlockType.BRICK
+            restored.journal.close()
+    print("  ✅ Player markers are not written to snapshots")
+
+
+def test_async_compaction_yields_between_chunks():
+    """Test that compact_async lets the event loop run while it copies the world."""
+    print("🧪 Testing compaction off the event loop...")
+    with tempfile.TemporaryDirectory() as journal_dir:
+        world = GameWorld(journal=BlockJournal(journal_dir))
+        _edit_world(world)
+        chunk_count = len(world.sectors)
+        ticks = []
+        finish = world.journal._finish_compaction
+
+        def finish_compaction(*state):
+            ticks.append("copied")
+            finish(*state)
+
+        async def run():
+            async def ticker():
+                while True:
+                    ticks.append("tick")
+                    if len(ticks) == 3:  # An edit while the copy is under way
+                        assert world.add_block((14, 120, 10), BlockType.WOOD)
+                    await asyncio.sleep(0)
+
+            world.journal._finish_compaction = finish_compaction
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            await world.journal.compact_async(world)
+            task.cancel()
+
+        asyncio.run(run())
+        world.journal.close()
+        assert ticks.index("copied") >= chunk_count  # The loop ran once per chunk copied
+
+        restored = GameWorld(journal=BlockJournal(journal_dir))
+        _assert_edits_present(restored)
+        assert restored.get_block((14, 120, 10)) == BlockType.WOOD
+        restored.journal.close()
+    print("  ✅ Physics ticks keep running during compaction")
+
+
+def test_cancelled_compaction_finishes_its_snapshot():
+    """Test that cancelling compact_async (server shutdown) never leaves a snapshot half written."""
+    print("🧪 Testing cancelled compactions...")
+    with tempfile.TemporaryDirectory() as journal_dir:
+        world = GameWorld(journal=BlockJournal(journal_dir))
+        _edit_world(world)
+        journal = world.journal
+        finish = journal._finish_compaction
+        writing = threading.Event()
+
+        def slow_finish(*state):
+            writing.set()
+            time.sleep(0.2)
+            finish(*state)
+
+        async def cancel(when):
+            task = asyncio.create_task(journal.compact_async(world))
+            await when()
+            task.cancel()
+            try:
+                await task
+                assert False, "compact_async should have been cancelled"
+            except asyncio.CancelledError:
+                pass
+
+        async def copying():
+            await asyncio.sleep(0)
+
+        async def writing_snapshot():
+            while not writing.is_set():
+                await asyncio.sleep(0.01)
+
+        # Cancelled while copying: nothing written, the edits still count
+        edits = journal.edits_since_compaction
+        asyncio.run(cancel(copying))
+        assert not os.path.exists(journal.snapshot_path)
+        assert journal.edits_since_compaction == edits
+
+        # Cancelled while writing: the snapshot lands before the task ends
+        journal._finish_compaction = slow_finish
+        asyncio.run(cancel(writing_snapshot))
+        assert os.path.exists(journal.snapshot_path)
+        journal.close()
+
+        restored = GameWorld(journal=BlockJournal(journal_dir))
+        _assert_edits_present(restored)
+        restored.journal.close()
+    print("  ✅ Cancelled compactions leave the journal consistent")
+
+
+def test_shutdown_compacts_the_journal():
+    """Test that stopping the server folds the journal into a snapshot."""
+    print("🧪 Testing journal compaction at shutdown...")
+    with tempfile.TemporaryDirectory() as journal_dir:
+        server = MinecraftServer(host="127.0.0.1", port=0, journal_dir=journal_dir)
+        _edit_world(server.world)
+
+        async def run():
+            task = asyncio.create_task(server.start_server())
+            await asyncio.sleep(0.2)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(run())
+        assert os.path.exists(server.journal.snapshot_path)
+        assert server.journal.edits_since_compaction == 0
+
+        restored = GameWorld(journal=BlockJournal(journal_dir))
+        assert restored.journal.edits_since_compaction == 0  # Nothing left to replay
+        _assert_edits_present(restored)
+        restored.journal.close()
+    print("  ✅ A clean shutdown leaves no journal tail to replay")
+
+
+def test_interval_policy_syncs_the_end_of_a_burst():
+    """Test that the last edits of a burst are fsynced even if no other edit follows."""
+    print("🧪 Testing interval fsync after a burst...")
+    syncs = []
+
+    class CountingJournal(BlockJournal):
+        def _sync(self):
+            super()._sync()
+            syncs.append(time.monotonic())
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        world = GameWorld(journal=CountingJournal(journal_dir, fsync_interval=0.5))
+        _edit_world(world)
+        world.journal.flush()
+        assert syncs == [] and world.journal._dirty  # Written, but within the interval
+
+        deadline = time.monotonic() + 5
+        while not syncs and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(syncs) == 1
+        assert not world.journal._dirty
+        world.journal.close()
+        assert len(syncs) == 1  # Nothing left to sync on close
+    print("  ✅ The tail of a burst is fsynced when the interval runs out")
+
+
+def test_writer_failure_is_reported():
+    """Test that a failing writer thread surfaces its error instead of hanging flush()."""
+    print("🧪 Testing journal writer failures...")
+
+    class FullDiskJournal(BlockJournal):
+        def _write_batch(self, batch):
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        world = GameWorld(journal=FullDiskJournal(journal_dir))
+        assert world.add_block((10, 120, 10), BlockType.BRICK)
+        try:
+            world.journal.flush()
+            assert False, "flush() should report the writer failure"
+        except JournalError as e:
+            assert isinstance(e.__cause__, OSError)
+        try:
+            world.add_block((11, 120, 10), BlockType.BRICK)
+            assert False, "edits should not be accepted once the journal failed"
+        except JournalError:
+            pass
+        try:
+            world.journal.close()
+            assert False, "close() should report the writer failure"
+        except JournalError:
+            pass
+        assert world.journal._writer is None
+    print("  ✅ Writer errors are raised from record, flush and close")
+
+
+if __name__ == "__main__":
+    test_journal_replay_after_restart()
+    test_torn_final_record_is_ignored()
+    test_compaction_folds_journal_into_snapshot()
+    test_player_blocks_do_not_survive_restart()
+    test_async_compaction_yields_between_chunks()
+    test_cancelled_compaction_finishes_its_snapshot()
+    test_shutdown_compacts_the_journal()
+    test_interval_policy_syncs_the_end_of_a_burst()
+    test_writer_failure_is_reported()
+    print("✅ ALL TESTS PASSED")
@@ -32,7 +32,7 @@ def test_world_reset_basic():
     
     # Count camera blocks (should have 5 from world init)
     camera_blocks = [pos for pos, data in world.world.items() 
-                     if isinstance(data, dict) and data.get("type") == BlockType.CAMERA]
+                     if data.type == BlockType.CAMERA]
     print(f"  Initial camera blocks: {len(camera_blocks)}")
     assert len(camera_blocks) == 5, f"Expected 5 camera blocks, got {len(camera_blocks)}"
     
@@ -60,15 +60,12 @@ def test_world_reset_basic():
     
     # Verify all cameras are gone
     camera_blocks_after = [pos for pos, data in world.world.items() 
-                           if isinstance(data, dict) and data.get("type") == BlockType.CAMERA]
+                           if data.type == BlockType.CAMERA]
     assert len(camera_blocks_after) == 0, f"Expected 0 camera blocks after reset, got {len(camera_blocks_after)}"
     
     # Verify only natural blocks remain
     for pos, block_data in world.world.items():
-        if isinstance(block_data, dict):
-            block_type = block_data.get("type")
-        else:
-            block_type = block_data
+        block_type = block_data.type
         
         assert block_type in {BlockType.GRASS, BlockType.SAND, BlockType.STONE, 
                               BlockType.WATER, BlockType.WOOD, BlockType.LEAF}, \
@@ -89,15 +86,12 @@ def test_world_reset_on_init():
     
     # Verify no cameras exist
     camera_blocks = [pos for pos, data in world.world.items() 
-                     if isinstance(data, dict) and data.get("type") == BlockType.CAMERA]
+                     if data.type == BlockType.CAMERA]
     assert len(camera_blocks) == 0, f"Expected 0 camera blocks after reset on init, got {len(camera_blocks)}"
     
     # Verify only natural blocks
     for pos, block_data in world.world.items():
-        if isinstance(block_data, dict):
-            block_type = block_data.get("type")
-        else:
-            block_type = block_data
+        block_type = block_data.type
         
         assert block_type in {BlockType.GRASS, BlockType.SAND, BlockType.STONE, 
                               BlockType.WATER, BlockType.WOOD, BlockType.LEAF}, \
@@ -0,0 +1,146 @@
+"""
+World Generation - Terrain and trees for one chunk at a time
+
+generate_chunk(seed, cx, cz) is a pure function of its arguments: terrain
+comes from the NoiseGen height map and tree placement from a hash of
+(seed, x, z), so any chunk can be generated on demand, in any order, and
+always comes out the same. Trees whose leaves reach across a chunk border
+are found by scanning a LEAF_RADIUS margin around the chunk.
+
+generate_chunks() spreads a batch of chunks over a process pool; workers
+send back each chunk trimmed to its highest non-air layer, and the main
+process pads it back to full height.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from noise_gen import NoiseGen
+from world_storage import BLOCK_CODES, CHUNK_SIZE, WORLD_HEIGHT
+from protocol import BlockType
+
+# ---------- Constants ----------
+WATER_LEVEL = 15
+GRASS_LEVEL = 18
+TREE_LINE = 20          # Trees only grow on columns higher than this
+TREE_CHANCE = 9         # Trees per 1000 eligible columns
+LEAF_RADIUS = 2         # Leaves extend this many blocks around the trunk
+LEAF_LAYERS = 3
+
+_SAND = BLOCK_CODES[BlockType.SAND]
+_GRASS = BLOCK_CODES[BlockType.GRASS]
+_STONE = BLOCK_CODES[BlockType.STONE]
+_WATER = BLOCK_CODES[BlockType.WATER]
+_WOOD = BLOCK_CODES[BlockType.WOOD]
+_LEAF = BLOCK_CODES[BlockType.LEAF]
+
+
+def column_hash(seed: int, xs: np.ndarray, zs: np.ndarray) -> np.ndarray:
+    """Return a well-mixed uint64 per (x, z) column (splitmix64 finalizer)."""
+    with np.errstate(over="ignore"):
+        v = (np.uint64(seed & 0xFFFFFFFFFFFFFFFF) * np.uint64(0x9E3779B97F4A7C15)
+             ^ xs.astype(np.int64).astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F)
+             ^ zs.astype(np.int64).astype(np.uint64) * np.uint64(0x165667B19E3779F9))
+        v = (v ^ (v >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        v = (v ^ (v >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return v ^ (v >> np.uint64(31))
+
+
+def generate_chunk(seed: int, cx: int, cz: int, world_size: Optional[int] = None,
+                   height: int = WORLD_HEIGHT) -> Optional[np.ndarray]:
+    """Generate one chunk as a uint8[x, y, z] array of palette codes.
+
+    Columns outside a bounded world (0 <= x, z < world_size) are left
+    empty; returns None if the whole chunk is outside it.
+    """
+    x0, z0 = cx * CHUNK_SIZE, cz * CHUNK_SIZE
+    if world_size is not None and not (0 <= x0 < world_size and 0 <= z0 < world_size):
+        return None
+
+    # Heights for the chunk plus a margin wide enough to see neighbouring trees
+    margin = LEAF_RADIUS
+    span = CHUNK_SIZE + 2 * margin
+    heights = NoiseGen(seed).height_map(x0 - margin, z0 - margin, span, span).astype(np.int64)
+    inner = heights[margin:margin + CHUNK_SIZE, margin:margin + CHUNK_SIZE]
+
+    # Terrain: stone under a grass/sand top, sand and water below the water level
+    chunk = np.zeros((CHUNK_SIZE, height, CHUNK_SIZE), dtype=np.uint8)
+    ys = np.arange(height).reshape(1, height, 1)
+    hh = inner.reshape(CHUNK_SIZE, 1, CHUNK_SIZE)
+    chunk[(hh >= WATER_LEVEL) & (ys >= 1) & (ys < hh)] = _STONE
+    chunk[(hh < WATER_LEVEL) & (ys > hh) & (ys <= WATER_LEVEL)] = _WATER
+    top = np.broadcast_to(np.where(hh < GRASS_LEVEL, _SAND, _GRASS), chunk.shape)
+    surface = ys == hh
+    chunk[surface] = top[surface]
+
+    # Trees: one hash per column decides placement and trunk height
+    xs = np.arange(x0 - margin, x0 - margin + span).reshape(span, 1)
+    zs = np.arange(z0 - margin, z0 - margin + span).reshape(1, span)
+    hashes = column_hash(seed, np.broadcast_to(xs, (span, span)), np.broadcast_to(zs, (span, span)))
+    eligible = (heights > TREE_LINE) & (hashes % np.uint64(1000) >= np.uint64(1000 - TREE_CHANCE))
+    if world_size is not None:
+        eligible &= (xs >= 0) & (xs < world_size) & (zs >= 0) & (zs < world_size)
+    trees = [(int(i) - margin, int(heights[i, j]), int(j) - margin,
+              5 + int(hashes[i, j] >> np.uint64(32)) % 2)
+             for i, j in zip(*np.nonzero(eligible))]
+
+    # Trunks first, then leaves into the cells left empty, so overlapping
+    # trees give the same result whatever order chunks are generated in
+    for lx, h, lz, tree_height in trees:
+        if 0 <= lx < CHUNK_SIZE and 0 <= lz < CHUNK_SIZE:
+            chunk[lx, h + 1:min(h + tree_height + 1, height), lz] = _WOOD
+    for lx, h, lz, tree_height in trees:
+        leaf_h = h + tree_height
+        if leaf_h >= height:
+            continue
+        block = chunk[max(lx - LEAF_RADIUS, 0):max(lx + LEAF_RADIUS + 1, 0),
+                      leaf_h:leaf_h + LEAF_LAYERS,
+                      max(lz - LEAF_RADIUS, 0):max(lz + LEAF_RADIUS + 1, 0)]
+        block[block == 0] = _LEAF
+
+    if world_size is not None:
+        chunk[max(world_size - x0, 0):] = 0
+        chunk[:, :, max(world_size - z0, 0):] = 0
+    return chunk
+
+
+def _generate_compact(seed: int, world_size: Optional[int], height: int,
+                      cx: int, cz: int) -> Optional[np.ndarray]:
+    """Pool task: generate a chunk and drop the empty layers above its terrain."""
+    chunk = generate_chunk(seed, cx, cz, world_size, height)
+    if chunk is None:
+        return None
+    filled = np.flatnonzero(chunk.any(axis=(0, 2)))
+    top = int(filled[-1]) + 1 if len(filled) else 0
+    return np.ascontiguousarray(chunk[:, :top])
+
+
+def generate_chunks(seed: int, keys: Iterable[Tuple[int, int]], world_size: Optional[int] = None,
+                    workers: Optional[int] = 1, height: int = WORLD_HEIGHT
+                    ) -> Iterator[Tuple[Tuple[int, int], Optional[np.ndarray]]]:
+    """Yield ((cx, cz), chunk) for each key, in order, using `workers` processes.
+
+    workers=1 generates in this process; None or 0 uses every CPU.
+    """
+    keys = list(keys)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(keys) < 2:
+        for cx, cz in keys:
+            yield (cx, cz), generate_chunk(seed, cx, cz, world_size, height)
+        return
+
+    task = partial(_generate_compact, seed, world_size, height)
+    batch = max(1, len(keys) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(task, [cx for cx, _ in keys], [cz for _, cz in keys], chunksize=batch)
+        for key, compact in zip(keys, results):
+            if compact is None:
+                yield key, None
+                continue
+            chunk = np.zeros((CHUNK_SIZE, height, CHUNK_SIZE), dtype=np.uint8)
+            chunk[:, :compact.shape[1]] = compact
+            yield key, chunk
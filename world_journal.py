@@ -0,0 +1,333 @@
+"""
+World Journal - Write-ahead journal of player block edits
+
+Every successful block mutation (placement, destruction, camera/owner
+metadata) is appended to a journal segment by a background writer thread,
+so recording an edit from the event loop is only a queue put. Segments are
+periodically compacted into a world snapshot (see world_storage), and on
+startup the snapshot is loaded and the remaining segments are replayed.
+
+Directory layout:
+    world.npz            last compacted snapshot (header carries "journal_segment")
+    journal_000001.log   one JSON array per line: ["s", x, y, z, type, block_id, owner]
+    journal_000002.log                            or ["d", x, y, z]
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+from world_storage import save_snapshot
+
+# ---------- Constants ----------
+FSYNC_POLICIES = ("always", "interval", "never")
+DEFAULT_FSYNC_POLICY = "interval"
+DEFAULT_FSYNC_INTERVAL = 1.0        # seconds between fsyncs with the "interval" policy
+DEFAULT_COMPACT_EDITS = 10000       # edits since the last snapshot that trigger a compaction
+MAX_BATCH = 4096                    # records written per write() call
+
+SNAPSHOT_NAME = "world.npz"
+SEGMENT_PATTERN = re.compile(r"journal_(\d{6})\.log$")
+
+
+class JournalError(RuntimeError):
+    """The journal writer thread failed; later edits are not durable."""
+
+
+def segment_path(directory: str, segment: int) -> str:
+    return os.path.join(directory, f"journal_{segment:06d}.log")
+
+
+def list_segments(directory: str) -> List[int]:
+    """Return the journal segment numbers present in a directory, in order."""
+    segments = []
+    for path in glob.glob(os.path.join(directory, "journal_*.log")):
+        match = SEGMENT_PATTERN.search(path)
+        if match:
+            segments.append(int(match.group(1)))
+    return sorted(segments)
+
+
+def read_segment(path: str) -> List[list]:
+    """Parse one journal segment.
+
+    A torn final line (crash mid-write) is dropped; a corrupt line stops the
+    replay of that segment at the last good record.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    lines = data.split(b"\n")
+    lines.pop()  # Either b"" after the last newline or an unterminated record
+    if not lines:
+        return []
+    try:
+        # One json.loads for the whole segment is far faster than one per line
+        return json.loads(b"[" + b",".join(lines) + b"]")
+    except ValueError:
+        records = []
+        for number, line in enumerate(lines, 1):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logging.warning(f"Journal {path} corrupt at line {number}; ignoring the rest of the segment")
+                break
+        return records
+
+
+class BlockJournal:
+    """Append-only journal of block edits for one world directory."""
+
+    def __init__(self, directory: str, fsync_policy: str = DEFAULT_FSYNC_POLICY,
+                 fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+                 compact_edits: int = DEFAULT_COMPACT_EDITS):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown journal fsync policy: {fsync_policy}")
+        self.directory = directory
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.compact_edits = compact_edits
+        self.segment = 0
+        self.edits_since_compaction = 0
+        self._queue: "queue.Queue[Tuple[Any, ...]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._compacting = False
+        self.error: Optional[BaseException] = None   # Set when the writer thread fails
+        # Writer thread state
+        self._file = None
+        self._dirty = False             # Written but not fsynced yet
+        self._last_sync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, SNAPSHOT_NAME)
+
+    # ---------- Startup ----------
+
+    def restore(self, world) -> int:
+        """Load the snapshot (if any) into a GameWorld and replay the journal tail.
+
+        Opens a fresh segment and starts the writer thread. Returns the number
+        of edits replayed.
+        """
+        first_segment = 0
+        if os.path.exists(self.snapshot_path):
+            header = world.load_snapshot(self.snapshot_path)
+            first_segment = header.get("journal_segment", 0)
+
+        replayed = 0
+        segments = list_segments(self.directory)
+        for segment in segments:
+            if segment < first_segment:
+                continue
+            records = read_segment(segment_path(self.directory, segment))
+            apply_edit = world.apply_edit
+            for record in records:
+                if record[0] == "s":
+                    apply_edit((record[1], record[2], record[3]), record[4], record[5], record[6])
+                else:
+                    apply_edit((record[1], record[2], record[3]), None)
+            replayed += len(records)
+
+        self.segment = max(segments + [first_segment - 1, 0]) + 1
+        self.edits_since_compaction = replayed
+        self._last_sync = time.monotonic()
+        self._writer = threading.Thread(target=self._write_loop, name="block-journal", daemon=True)
+        self._writer.start()
+        if replayed:
+            logging.info(f"Replayed {replayed} journaled block edits from {self.directory}")
+        return replayed
+
+    # ---------- Recording (event loop side) ----------
+
+    def record_set(self, position, block_type: str, block_id: Optional[str] = None,
+                   owner: Optional[str] = None) -> None:
+        """Journal a block placed (or overwritten) at a position."""
+        self._raise_if_failed()
+        x, y, z = position
+        self._queue.put(("s", x, y, z, block_type, block_id, owner))
+        self.edits_since_compaction += 1
+
+    def record_remove(self, position) -> None:
+        """Journal a block removed from a position."""
+        self._raise_if_failed()
+        x, y, z = position
+        self._queue.put(("d", x, y, z))
+        self.edits_since_compaction += 1
+
+    def flush(self) -> None:
+        """Block until every queued record has been written (and fsynced per policy)."""
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """Flush outstanding records and stop the writer thread."""
+        if self._writer is None:
+            return
+        self._queue.put(("close",))
+        self._writer.join()
+        self._writer = None
+        self._raise_if_failed()
+
+    def _raise_if_failed(self) -> None:
+        if self.error is not None:
+            raise JournalError(f"Block journal writer failed: {self.error}") from self.error
+
+    # ---------- Compaction ----------
+
+    @property
+    def needs_compaction(self) -> bool:
+        return not self._compacting and self.edits_since_compaction >= self.compact_edits
+
+    def _begin_compaction(self, world):
+        """Rotate to a new segment and start copying the world (must run where edits happen).
+
+        Returns the snapshot header and an iterator copying the world chunk by
+        chunk. Edits made after this call but before their chunk is copied end
+        up both in the snapshot and in the new segment; replaying them again is
+        harmless.
+        """
+        header = world.snapshot_header()
+        chunks = world.snapshot_chunks()
+        self.segment += 1
+        self._queue.put(("rotate", self.segment))
+        header["journal_segment"] = self.segment
+        self.edits_since_compaction = 0
+        return header, chunks
+
+    def _finish_compaction(self, header, chunks, metadata) -> None:
+        """Write the captured snapshot, then let the writer drop the segments it covers."""
+        save_snapshot(self.snapshot_path, header, chunks, metadata)
+        self._queue.put(("prune", header["journal_segment"]))
+
+    def compact(self, world) -> None:
+        """Compact synchronously (server shutdown and tests)."""
+        header, copies = self._begin_compaction(world)
+        chunks, metadata = {}, {}
+        for key, array, chunk_metadata in copies:
+            chunks[key] = array
+            metadata.update(chunk_metadata)
+        self._finish_compaction(header, chunks, metadata)
+
+    async def compact_async(self, world) -> None:
+        """Compact without blocking the event loop.
+
+        The world is copied one chunk per loop iteration, so physics ticks and
+        message handlers run in between; compression and file I/O happen in an
+        executor thread. Once that write has started, cancelling waits for it
+        to finish, so the journal is never closed under a snapshot half written.
+        """
+        if self._compacting:
+            return
+        self._compacting = True
+        try:
+            edits = self.edits_since_compaction
+            header, copies = self._begin_compaction(world)
+            chunks, metadata = {}, {}
+            try:
+                for key, array, chunk_metadata in copies:
+                    chunks[key] = array
+                    metadata.update(chunk_metadata)
+                    await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                self.edits_since_compaction += edits  # No snapshot covers them yet
+                raise
+            loop = asyncio.get_running_loop()
+            write = loop.run_in_executor(None, self._finish_compaction, header, chunks, metadata)
+            try:
+                await asyncio.shield(write)
+            except asyncio.CancelledError:
+                await write
+                raise
+            logging.info(f"Compacted block journal into {self.snapshot_path}")
+        finally:
+            self._compacting = False
+
+    # ---------- Writer thread ----------
+
+    def _drain(self, timeout: Optional[float]) -> List[Tuple[Any, ...]]:
+        """Wait up to `timeout` seconds (None: forever) for one item, then take whatever else is queued."""
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < MAX_BATCH:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_loop(self) -> None:
+        running = True
+        while running:
+            timeout = None
+            if self._dirty and self.fsync_policy == "interval":
+                # Wake up to fsync the tail of a burst even if no other edit arrives
+                timeout = max(0.0, self._last_sync + self.fsync_interval - time.monotonic())
+            batch = self._drain(timeout)
+            try:
+                if self.error is None:
+                    self._write_batch(batch)
+            except Exception as e:
+                logging.error(f"Block journal writer failed, edits are no longer journaled: {e}")
+                self.error = e
+            finally:
+                # Failed or not, flush() and close() must not wait forever
+                for _ in batch:
+                    self._queue.task_done()
+            running = not any(item[0] == "close" for item in batch)
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                logging.error(f"Could not close block journal segment: {e}")
+            self._file = None
+
+    def _write_batch(self, batch: List[Tuple[Any, ...]]) -> None:
+        """Append a batch of records, applying control items in queue order."""
+        if self._file is None:
+            self._file = open(segment_path(self.directory, self.segment), "ab")
+        closing = False
+        lines = []
+        for item in batch:
+            kind = item[0]
+            if kind in ("s", "d"):
+                lines.append(json.dumps(item, separators=(",", ":")))
+                continue
+            # Control items apply in queue order, after the records before them
+            if lines:
+                self._file.write(("\n".join(lines) + "\n").encode())
+                self._dirty = True
+                lines = []
+            if kind == "rotate":
+                self._sync()
+                self._file.close()
+                self._file = open(segment_path(self.directory, item[1]), "ab")
+            elif kind == "prune":
+                for segment in list_segments(self.directory):
+                    if segment < item[1]:
+                        os.remove(segment_path(self.directory, segment))
+            elif kind == "close":
+                closing = True
+        if lines:
+            self._file.write(("\n".join(lines) + "\n").encode())
+            self._dirty = True
+        self._file.flush()
+        if self._dirty and (self.fsync_policy == "always" or closing or
+                            (self.fsync_policy == "interval" and
+                             time.monotonic() - self._last_sync >= self.fsync_interval)):
+            self._sync()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._dirty = False
+        self._last_sync = time.monotonic()
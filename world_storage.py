@@ -0,0 +1,780 @@
+"""
+World Storage - Alternative block storage engines for GameWorld
+
+The default GameWorld storage is a plain dict mapping (x, y, z) tuples to one
+block data dict per voxel. ChunkedVoxelStore keeps the same mapping API but
+stores block types as one dense uint8 buffer per 16x16 chunk column (viewed
+as a NumPy array for bulk operations), with a small side table for the
+block_id/owner metadata that only camera and user blocks carry.
+
+A ChunkedVoxelStore can take a chunk generator, in which case chunks are
+generated the first time a lookup touches them. It can also be backed by
+a RegionStore: chunks then live in
+region files on disk and are only read (through mmap) the first time a
+lookup touches them. With a memory budget, resident chunks are kept in LRU
+order and the coldest unpinned ones are written back and evicted.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import re
+import struct
+import zlib
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from protocol import BlockType
+
+# ---------- Constants ----------
+CHUNK_SIZE = 16
+WORLD_HEIGHT = 256
+SNAPSHOT_FORMAT_VERSION = 1
+REGION_SIZE = 32            # Chunks per region file side
+REGION_FORMAT_VERSION = 2    # 2: header carries the world key
+REGION_MAGIC = b"CVRG"
+
+# Block type palette: the array code of a block type is its index in this list.
+# Code 0 is reserved for "no block" so that freshly allocated chunks are empty.
+BLOCK_PALETTE = (
+    None,
+    BlockType.GRASS,
+    BlockType.SAND,
+    BlockType.BRICK,
+    BlockType.STONE,
+    BlockType.WOOD,
+    BlockType.LEAF,
+    BlockType.WATER,
+    BlockType.CAMERA,
+    BlockType.USER,
+    BlockType.AIR,
+    BlockType.CAT,
+)
+BLOCK_CODES = {block_type: code for code, block_type in enumerate(BLOCK_PALETTE) if block_type}
+# Player blocks only mark where connected players stand: never written to region files
+TRANSIENT_CODE = BLOCK_CODES[BlockType.USER]
+
+Position = Tuple[int, int, int]
+ChunkKey = Tuple[int, int]
+
+
+class ChunkedVoxelStore(MutableMapping):
+    """Dense per-chunk voxel storage exposing the GameWorld.world mapping API.
+
+    Keys are integer (x, y, z) positions and values are block records as built
+    by ``block_factory(block_type, block_id, owner)``; only their type, block_id
+    and owner are stored, and records are looked up again on read.
+    """
+
+    def __init__(self, block_factory: Callable[..., Any], height: int = WORLD_HEIGHT,
+                 regions: Optional['RegionStore'] = None, memory_budget: Optional[int] = None,
+                 generator: Optional[Callable[[int, int], Optional[np.ndarray]]] = None,
+                 on_load: Optional[Callable[[ChunkKey], None]] = None):
+        if memory_budget is not None and regions is None:
+            raise ValueError("A chunk memory budget requires region files to evict to")
+        self.block_factory = block_factory
+        self.height = height
+        # (cx, cz) -> flat uint8[x, y, z] buffer; with a budget, touched chunks are
+        # re-inserted so insertion order is least recently used first
+        self.chunks: Dict[ChunkKey, bytearray] = {}
+        self.chunk_counts: Dict[ChunkKey, int] = {}    # (cx, cz) -> number of blocks (loaded or not)
+        self.metadata: Dict[Position, Tuple[Optional[str], Optional[str]]] = {}
+        self._chunk_metadata: Dict[ChunkKey, Set[Position]] = {}  # (cx, cz) -> its positions in metadata
+        self.regions = regions
+        self.dirty: Set[ChunkKey] = set()              # chunks changed since their last flush
+        self._unloaded: Set[ChunkKey] = set()          # chunks only present in region files
+        self.generator = generator                     # (cx, cz) -> uint8[x, y, z] array or None
+        self._generated: Set[ChunkKey] = set()         # chunks the generator must not produce again
+        self.on_load = on_load                         # called with the key of every chunk brought into memory
+
+        # Residency (only maintained with a memory budget)
+        self.memory_budget = memory_budget             # bytes of chunk arrays kept resident
+        self.pinned: Set[ChunkKey] = set()             # chunks never evicted (near players)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        if regions is not None:
+            if regions.height != height:
+                raise ValueError(f"Region height {regions.height} does not match store height {height}")
+            for key, count in regions.chunk_counts().items():
+                self.chunk_counts[key] = count
+                self._unloaded.add(key)
+                self._generated.add(key)
+                self._size += count
+            # Metadata is tiny and needed up front to rebuild GameWorld.block_id_map
+            self.update_metadata(regions.load_metadata())
+
+    # ---------- Addressing ----------
+
+    def _locate(self, position) -> Optional[Tuple[ChunkKey, int]]:
+        """Map a position to (chunk key, flat index), or None if unaddressable."""
+        try:
+            x, y, z = position
+            ix, iy, iz = int(x), int(y), int(z)
+        except (TypeError, ValueError):
+            return None
+        # Keep dict semantics: 10.0 and 10 are the same key, 10.5 is not a key
+        if ix != x or iy != y or iz != z or not 0 <= iy < self.height:
+            return None
+        return (ix >> 4, iz >> 4), ((ix & 15) * self.height + iy) * CHUNK_SIZE + (iz & 15)
+
+    def _code_at(self, position) -> int:
+        """Return the palette code stored at a position (0 when empty)."""
+        x, y, z = position
+        try:
+            # Fast path for integer positions (CHUNK_SIZE == 16 == 1 << 4)
+            key = (x >> 4, z >> 4)
+            if not 0 <= y < self.height:
+                return 0
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                if key not in self._unloaded and (self.generator is None or key in self._generated):
+                    return 0
+                chunk = self._fetch(key)
+                if chunk is None:
+                    return 0
+            elif self.memory_budget is not None:
+                self.chunks[key] = self.chunks.pop(key)
+                self.hits += 1
+            return chunk[((x & 15) * self.height + y) * CHUNK_SIZE + (z & 15)]
+        except TypeError:
+            located = self._locate(position)
+            chunk = self._chunk(located[0]) if located else None
+            if chunk is None:
+                return 0
+            return chunk[located[1]]
+
+    def _new_chunk(self) -> bytearray:
+        return bytearray(CHUNK_SIZE * self.height * CHUNK_SIZE)
+
+    def _load(self, key: ChunkKey) -> bytearray:
+        """Read an on-disk chunk into memory."""
+        self._unloaded.discard(key)
+        chunk = self.chunks[key] = bytearray(self.regions.load_array(*key))
+        if self.memory_budget is not None:
+            self.misses += 1
+            self._evict(keep=key)
+        if self.on_load is not None:
+            self.on_load(key)
+        return chunk
+
+    def _generate(self, key: ChunkKey) -> Optional[bytearray]:
+        """Generate a chunk that was never materialized (None if it is outside the world)."""
+        self._generated.add(key)
+        array = self.generator(*key)
+        if array is None:
+            return None
+        self.load_chunk(key[0], key[1], array)
+        if self.memory_budget is not None:
+            self.misses += 1
+        return self.chunks[key]
+
+    def _fetch(self, key: ChunkKey) -> Optional[bytearray]:
+        """Bring a non-resident chunk in from its region file or the generator."""
+        if key in self._unloaded:
+            return self._load(key)
+        if self.generator is not None and key not in self._generated:
+            return self._generate(key)
+        return None
+
+    def _chunk(self, key: ChunkKey) -> Optional[bytearray]:
+        """Return a chunk buffer, loading or generating it on first touch."""
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self._fetch(key)
+        elif self.memory_budget is not None:
+            self.chunks[key] = self.chunks.pop(key)
+            self.hits += 1
+        return chunk
+
+    # ---------- Residency ----------
+
+    def resident_bytes(self) -> int:
+        return len(self.chunks) * CHUNK_SIZE * self.height * CHUNK_SIZE
+
+    def _evict(self, keep: Optional[ChunkKey] = None) -> int:
+        """Write back and drop least recently used unpinned chunks until within budget.
+
+        Chunks holding player (USER) blocks stay resident: those blocks are
+        never written to the region files, so a reload would lose them.
+        """
+        chunk_bytes = CHUNK_SIZE * self.height * CHUNK_SIZE
+        excess = self.resident_bytes() - self.memory_budget
+        evicted = 0
+        for key in list(self.chunks):
+            if excess <= 0:
+                break
+            if key == keep or key in self.pinned or TRANSIENT_CODE in self.chunks[key]:
+                continue
+            if key in self.dirty:
+                self._flush_chunk(key)
+                self.dirty.discard(key)
+            del self.chunks[key]
+            self._unloaded.add(key)
+            excess -= chunk_bytes
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def pin(self, keys) -> None:
+        """Replace the set of chunks that must stay resident and load them now."""
+        self.pinned = set(keys)
+        for key in self.pinned:
+            if key in self._unloaded:
+                self._load(key)
+        if self.memory_budget is not None:
+            self._evict()
+
+    def residency_stats(self) -> Dict[str, int]:
+        """Return chunk residency counters."""
+        return {
+            "resident": len(self.chunks),
+            "on_disk_only": len(self._unloaded),
+            "pinned": len(self.pinned),
+            "dirty": len(self.dirty),
+            "resident_bytes": self.resident_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def is_loaded(self, cx: int, cz: int) -> bool:
+        """Return True if a chunk is resident in memory."""
+        return (cx, cz) in self.chunks
+
+    def is_known_empty(self, cx: int, cz: int) -> bool:
+        """Return True if a chunk holds no blocks and nothing would load or generate any."""
+        key = (cx, cz)
+        return (key not in self.chunks and key not in self._unloaded and
+                (self.generator is None or key in self._generated))
+
+    def resident_array(self, cx: int, cz: int) -> Optional[np.ndarray]:
+        """Return a uint8[x, y, z] view of a chunk already in memory (None otherwise).
+
+        Nothing is loaded or generated, and the access is not counted for the
+        least recently used order.
+        """
+        chunk = self.chunks.get((cx, cz))
+        if chunk is None:
+            return None
+        return np.frombuffer(chunk, dtype=np.uint8).reshape(CHUNK_SIZE, self.height, CHUNK_SIZE)
+
+    def ensure_chunk(self, cx: int, cz: int) -> bool:
+        """Load or generate a chunk now; returns False if there is nothing there."""
+        return self._chunk((cx, cz)) is not None
+
+    def ungenerated(self, keys) -> List[ChunkKey]:
+        """Return the keys the generator has not produced (or been told to skip) yet."""
+        if self.generator is None:
+            return []
+        return [key for key in keys if key not in self._generated]
+
+    def add_generated(self, cx: int, cz: int, array: Optional[np.ndarray]) -> None:
+        """Install a chunk generated elsewhere (None: nothing there)."""
+        self._generated.add((cx, cz))
+        if array is not None:
+            self.load_chunk(cx, cz, array)
+
+    def chunk_array(self, cx: int, cz: int) -> Optional[np.ndarray]:
+        """Return a writable uint8[x, y, z] view of a chunk, or None if it was never touched."""
+        chunk = self._chunk((cx, cz))
+        if chunk is None:
+            return None
+        return np.frombuffer(chunk, dtype=np.uint8).reshape(CHUNK_SIZE, self.height, CHUNK_SIZE)
+
+    # ---------- Mapping API ----------
+
+    def __getitem__(self, position):
+        code = self._code_at(position)
+        if not code:
+            raise KeyError(position)
+        block_id, owner = self.metadata.get(position, (None, None))
+        return self.block_factory(BLOCK_PALETTE[code], block_id, owner)
+
+    def get(self, position, default=None):
+        code = self._code_at(position)
+        if not code:
+            return default
+        block_id, owner = self.metadata.get(position, (None, None))
+        return self.block_factory(BLOCK_PALETTE[code], block_id, owner)
+
+    def __contains__(self, position) -> bool:
+        return self._code_at(position) != 0
+
+    def __setitem__(self, position, block_data) -> None:
+        located = self._locate(position)
+        if located is None:
+            raise KeyError(f"Position not addressable by voxel storage: {position}")
+        block_type, block_id, owner = block_data.type, block_data.block_id, block_data.owner
+        code = BLOCK_CODES.get(block_type)
+        if code is None:
+            raise ValueError(f"Block type not in voxel palette: {block_type}")
+
+        key, index = located
+        chunk = self._chunk(key)
+        if chunk is None:
+            chunk = self.chunks[key] = self._new_chunk()
+            self.chunk_counts[key] = 0
+            self._generated.add(key)
+            if self.memory_budget is not None:
+                self._evict(keep=key)
+        if not chunk[index]:
+            self.chunk_counts[key] += 1
+            self._size += 1
+        chunk[index] = code
+        self.dirty.add(key)
+
+        position = tuple(int(c) for c in position)
+        if block_id is not None or owner is not None:
+            self._set_metadata(position, (block_id, owner))
+        else:
+            self._drop_metadata(position)
+
+    def __delitem__(self, position) -> None:
+        located = self._locate(position)
+        chunk = self._chunk(located[0]) if located else None
+        if chunk is None:
+            raise KeyError(position)
+        key, index = located
+        if not chunk[index]:
+            raise KeyError(position)
+        chunk[index] = 0
+        self.chunk_counts[key] -= 1
+        self._size -= 1
+        self.dirty.add(key)
+        self._drop_metadata(tuple(int(c) for c in position))
+
+    def __iter__(self) -> Iterator[Position]:
+        for key in list(self.chunk_counts):
+            yield from self.chunk_positions(*key)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        # On-disk chunks are dropped from their region files at the next flush,
+        # and the generator (if any) may produce every chunk again
+        self.dirty.update(self.chunk_counts)
+        self._generated.clear()
+        self.pinned.clear()
+        self.chunks.clear()
+        self.chunk_counts.clear()
+        self.metadata.clear()
+        self._chunk_metadata.clear()
+        self._unloaded.clear()
+        self._size = 0
+
+    def items(self):
+        """Iterate (position, block data) pairs chunk by chunk."""
+        factory, metadata = self.block_factory, self.metadata
+        for key in list(self.chunk_counts):
+            chunk = self.chunk_array(*key)
+            if chunk is None:
+                continue
+            xs, ys, zs = np.nonzero(chunk)
+            codes = chunk[xs, ys, zs].tolist()
+            base_x, base_z = key[0] * CHUNK_SIZE, key[1] * CHUNK_SIZE
+            for x, y, z, code in zip((xs + base_x).tolist(), ys.tolist(), (zs + base_z).tolist(), codes):
+                position = (x, y, z)
+                block_id, owner = metadata.get(position, (None, None))
+                yield position, factory(BLOCK_PALETTE[code], block_id, owner)
+
+    # ---------- Chunk-level access ----------
+
+    def chunk_positions(self, cx: int, cz: int) -> Iterator[Position]:
+        """Iterate the positions of all blocks stored in one chunk."""
+        if not self.chunk_counts.get((cx, cz)):
+            return iter(())
+        xs, ys, zs = np.nonzero(self.chunk_array(cx, cz))
+        return zip((xs + cx * CHUNK_SIZE).tolist(), ys.tolist(), (zs + cz * CHUNK_SIZE).tolist())
+
+    def positions_with_codes(self, codes) -> Iterator[Position]:
+        """Yield the positions holding any of the given palette codes, chunk by chunk.
+
+        On-disk chunks are scanned straight from their region files and stay
+        unloaded; only never-generated chunks are skipped.
+        """
+        codes = np.asarray(list(codes), dtype=np.uint8)
+        for key in list(self.chunk_counts):
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                if key not in self._unloaded:
+                    continue
+                chunk = self.regions.load_array(*key)
+            array = np.frombuffer(chunk, dtype=np.uint8).reshape(CHUNK_SIZE, self.height, CHUNK_SIZE)
+            xs, ys, zs = np.nonzero(np.isin(array, codes))
+            yield from list(zip((xs + key[0] * CHUNK_SIZE).tolist(), ys.tolist(),
+                                (zs + key[1] * CHUNK_SIZE).tolist()))
+
+    def load_chunk(self, cx: int, cz: int, array: np.ndarray) -> None:
+        """Replace a whole chunk with a uint8[x, y, z] array of palette codes."""
+        key = (cx, cz)
+        self._size -= self.chunk_counts.get(key, 0)
+        self._unloaded.discard(key)
+        self._generated.add(key)
+        self.chunks[key] = bytearray(np.ascontiguousarray(array, dtype=np.uint8).tobytes())
+        self.chunk_counts[key] = int(np.count_nonzero(array))
+        self._size += self.chunk_counts[key]
+        self.dirty.add(key)
+        if self.memory_budget is not None:
+            self._evict(keep=key)
+        if self.on_load is not None:
+            self.on_load(key)
+
+    def update_metadata(self, entries: Dict[Position, Tuple[Optional[str], Optional[str]]]) -> None:
+        """Add (block_id, owner) entries for blocks already stored."""
+        for position, entry in entries.items():
+            self._set_metadata(position, entry)
+
+    def _set_metadata(self, position: Position, entry: Tuple[Optional[str], Optional[str]]) -> None:
+        self.metadata[position] = entry
+        self._chunk_metadata.setdefault((position[0] >> 4, position[2] >> 4), set()).add(position)
+
+    def _drop_metadata(self, position: Position) -> None:
+        if self.metadata.pop(position, None) is None:
+            return
+        key = (position[0] >> 4, position[2] >> 4)
+        positions = self._chunk_metadata[key]
+        positions.discard(position)
+        if not positions:
+            del self._chunk_metadata[key]
+
+    def _flush_chunk(self, key: ChunkKey) -> None:
+        """Write one chunk and its metadata rows (or drop it if it was cleared).
+
+        Player (USER) blocks are left out of what is written.
+        """
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if key not in self._unloaded:
+                self.regions.delete_chunk(*key)
+            return
+        metadata = {position: self.metadata[position] for position in self._chunk_metadata.get(key, ())}
+        count = self.chunk_counts.get(key, 0)
+        if TRANSIENT_CODE in chunk:
+            height = self.height
+            metadata = {(x, y, z): entry for (x, y, z), entry in metadata.items()
+                        if chunk[((x & 15) * height + y) * CHUNK_SIZE + (z & 15)] != TRANSIENT_CODE}
+            array = np.frombuffer(chunk, dtype=np.uint8).copy()
+            transient = array == TRANSIENT_CODE
+            count -= int(np.count_nonzero(transient))
+            array[transient] = 0
+            chunk = array.tobytes()
+        self.regions.save_chunk(key[0], key[1], chunk, metadata, count)
+
+    def flush(self) -> int:
+        """Write dirty chunks to the region files; returns how many were written."""
+        if self.regions is None or not self.dirty:
+            return 0
+        for key in sorted(self.dirty):
+            self._flush_chunk(key)
+        written = len(self.dirty)
+        self.dirty.clear()
+        return written
+
+    def get_type(self, position) -> Optional[str]:
+        """Return the block type at a position without building block data."""
+        return BLOCK_PALETTE[self._code_at(position)]
+
+    @property
+    def sectors(self) -> 'VoxelSectorView':
+        """Sector index view compatible with GameWorld.sectors."""
+        return VoxelSectorView(self)
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the resident chunk arrays (metadata excluded)."""
+        return sum(len(chunk) for chunk in self.chunks.values())
+
+
+class VoxelSectorView(Mapping):
+    """Read-only view mapping sector keys (cx, 0, cz) to the positions they contain."""
+
+    def __init__(self, store: ChunkedVoxelStore):
+        self._store = store
+
+    def __getitem__(self, sector) -> Set[Position]:
+        cx, _, cz = sector
+        if not self._store.ensure_chunk(cx, cz) or not self._store.chunk_counts.get((cx, cz)):
+            raise KeyError(sector)
+        return set(self._store.chunk_positions(cx, cz))
+
+    def __contains__(self, sector) -> bool:
+        cx, _, cz = sector
+        return self._store.ensure_chunk(cx, cz) and bool(self._store.chunk_counts.get((cx, cz)))
+
+    def __iter__(self):
+        return ((cx, 0, cz) for (cx, cz), count in list(self._store.chunk_counts.items()) if count)
+
+    def __len__(self) -> int:
+        return sum(1 for count in self._store.chunk_counts.values() if count)
+
+
+# ---------- Snapshots ----------
+
+def save_snapshot(path: str, header: Dict[str, Any], chunks: Dict[ChunkKey, np.ndarray],
+                  metadata: Dict[Position, Tuple[Optional[str], Optional[str]]]) -> None:
+    """Write chunk arrays and the block metadata table to a compressed .npz file.
+
+    The file is written next to its destination and renamed into place, so a
+    crash mid-write never leaves a truncated snapshot behind.
+    """
+    keys = sorted(chunks)
+    header = dict(header, format_version=SNAPSHOT_FORMAT_VERSION, palette=list(BLOCK_PALETTE))
+    meta_rows = [[list(position), block_id, owner] for position, (block_id, owner) in metadata.items()]
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            header=np.array(json.dumps(header)),
+            chunk_keys=np.array(keys, dtype=np.int64).reshape(-1, 2),
+            chunks=(np.stack([chunks[key] for key in keys]) if keys
+                    else np.zeros((0, CHUNK_SIZE, WORLD_HEIGHT, CHUNK_SIZE), dtype=np.uint8)),
+            metadata=np.array(json.dumps(meta_rows)),
+        )
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> Tuple[Dict[str, Any], Dict[ChunkKey, np.ndarray],
+                                      Dict[Position, Tuple[Optional[str], Optional[str]]]]:
+    """Read a snapshot written by save_snapshot.
+
+    Returns (header, chunks, metadata). Raises ValueError if the file was
+    written with another format version or block palette.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(str(data["header"]))
+        if (header.get("format_version") != SNAPSHOT_FORMAT_VERSION or
+                header.get("palette") != list(BLOCK_PALETTE)):
+            raise ValueError(f"Incompatible world snapshot: {path}")
+        keys = [tuple(key) for key in data["chunk_keys"].tolist()]
+        arrays = data["chunks"]
+        chunks = {key: arrays[i] for i, key in enumerate(keys)}
+        metadata = {tuple(position): (block_id, owner)
+                    for position, block_id, owner in json.loads(str(data["metadata"]))}
+    return header, chunks, metadata
+
+
+# ---------- Region files ----------
+
+_REGION_HEADER = struct.Struct("<4sHHIqIi")  # magic, format version, region size, chunk height, world key
+_REGION_ENTRY = struct.Struct("<QIII")     # payload offset, array bytes, metadata bytes, block count
+_REGION_FILE_PATTERN = re.compile(r"r\.(-?\d+)\.(-?\d+)\.region$")
+
+
+class RegionFile:
+    """One REGION_SIZE x REGION_SIZE block of chunks in a single file.
+
+    Layout: a fixed header, a fixed table of one entry per chunk, then the
+    chunk payloads (zlib'd uint8 array followed by zlib'd JSON metadata
+    rows). A rewritten chunk goes to free space (or the end of the file) and
+    its table entry is overwritten last, so a crash mid-write leaves the
+    previous version readable; the old payload space is then free for later
+    writes, so rewriting a chunk does not grow the file without bound.
+    Payloads are read through a read-only mmap of the file.
+    """
+
+    TABLE_OFFSET = _REGION_HEADER.size
+    DATA_OFFSET = TABLE_OFFSET + REGION_SIZE * REGION_SIZE * _REGION_ENTRY.size
+
+    def __init__(self, path: str, height: int = WORLD_HEIGHT, world_key: Tuple[int, int, int] = (0, 0, 0)):
+        self.path = path
+        self.height = height
+        self.world_key = tuple(world_key)
+        exists = os.path.exists(path)
+        self._file = open(path, "r+b" if exists else "w+b")
+        self._map: Optional[mmap.mmap] = None
+        if exists:
+            header = self._file.read(_REGION_HEADER.size)
+            fields = _REGION_HEADER.unpack(header) if len(header) == _REGION_HEADER.size else (None,) * 7
+            if fields[:4] != (REGION_MAGIC, REGION_FORMAT_VERSION, REGION_SIZE, height):
+                self._file.close()
+                raise ValueError(f"Incompatible region file: {path}")
+            if fields[4:] != self.world_key:
+                self._file.close()
+                raise ValueError(f"Region file {path} belongs to world {fields[4:]}, not {self.world_key}")
+            table = self._file.read(self.DATA_OFFSET - self.TABLE_OFFSET)
+            self.entries = list(_REGION_ENTRY.iter_unpack(table))
+            self._free = self._find_free_space(self._file.seek(0, os.SEEK_END))
+        else:
+            self.entries = [(0, 0, 0, 0)] * (REGION_SIZE * REGION_SIZE)
+            self._file.write(_REGION_HEADER.pack(REGION_MAGIC, REGION_FORMAT_VERSION, REGION_SIZE, height,
+                                                 *self.world_key))
+            self._file.write(b"".join(_REGION_ENTRY.pack(*entry) for entry in self.entries))
+            self._file.flush()
+            self._free = []
+
+    def _find_free_space(self, end: int) -> List[Tuple[int, int]]:
+        """Return the sorted (offset, length) gaps between the payloads the table points at."""
+        free = []
+        position = self.DATA_OFFSET
+        for offset, length in sorted((offset, array_len + meta_len)
+                                     for offset, array_len, meta_len, _count in self.entries if offset):
+            if offset > position:
+                free.append((position, offset - position))
+            position = max(position, offset + length)
+        if end > position:
+            free.append((position, end - position))
+        return free
+
+    def _allocate(self, length: int) -> int:
+        """Return where to write a payload: the first gap it fits in, else the end of the file."""
+        end = max(self._file.seek(0, os.SEEK_END), self.DATA_OFFSET)
+        for i, (offset, size) in enumerate(self._free):
+            if size > length:
+                self._free[i] = (offset + length, size - length)
+                return offset
+            if size == length or offset + size == end:  # A gap at the end grows with the file
+                del self._free[i]
+                return offset
+        return end
+
+    def _release(self, offset: int, length: int) -> None:
+        """Return a payload's space to the free list, merging it with adjacent gaps."""
+        i = bisect.bisect(self._free, (offset, length))
+        if i < len(self._free) and offset + length == self._free[i][0]:
+            length += self._free.pop(i)[1]
+        if i and self._free[i - 1][0] + self._free[i - 1][1] == offset:
+            offset, previous = self._free.pop(i - 1)
+            length += previous
+            i -= 1
+        self._free.insert(i, (offset, length))
+
+    def _read(self, offset: int, length: int) -> bytes:
+        if self._map is None or offset + length > len(self._map):
+            # The file grew since it was mapped
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[offset:offset + length]
+
+    def chunk_counts(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield (local x, local z, block count) for every stored chunk."""
+        for index, (offset, _array_len, _meta_len, count) in enumerate(self.entries):
+            if offset:
+                yield index // REGION_SIZE, index % REGION_SIZE, count
+
+    def read_array(self, lx: int, lz: int) -> Optional[bytes]:
+        """Return the raw uint8[x, y, z] bytes of a chunk, or None if not stored."""
+        offset, array_len, _meta_len, _count = self.entries[lx * REGION_SIZE + lz]
+        if not offset:
+            return None
+        return zlib.decompress(self._read(offset, array_len))
+
+    def read_metadata(self, lx: int, lz: int) -> list:
+        """Return the [[x, y, z], block_id, owner] metadata rows of a chunk."""
+        offset, array_len, meta_len, _count = self.entries[lx * REGION_SIZE + lz]
+        if not offset or not meta_len:
+            return []
+        return json.loads(zlib.decompress(self._read(offset + array_len, meta_len)))
+
+    def _write_entry(self, lx: int, lz: int, entry: Tuple[int, int, int, int]) -> None:
+        index = lx * REGION_SIZE + lz
+        self._file.seek(self.TABLE_OFFSET + index * _REGION_ENTRY.size)
+        self._file.write(_REGION_ENTRY.pack(*entry))
+        self._file.flush()
+        self.entries[index] = entry
+
+    def delete_chunk(self, lx: int, lz: int) -> None:
+        """Mark a chunk as not stored and free its payload space."""
+        offset, array_len, meta_len, _count = self.entries[lx * REGION_SIZE + lz]
+        self._write_entry(lx, lz, (0, 0, 0, 0))
+        if offset:
+            self._release(offset, array_len + meta_len)
+
+    def write_chunk(self, lx: int, lz: int, array: bytes, metadata_rows: list, count: int) -> None:
+        """Write a chunk payload into free space and point its table entry at it."""
+        packed_array = zlib.compress(bytes(array), 1)
+        packed_meta = zlib.compress(json.dumps(metadata_rows).encode()) if metadata_rows else b""
+        payload = packed_array + packed_meta
+        offset = self._allocate(len(payload))
+        self._file.seek(offset)
+        self._file.write(payload)
+        previous = self.entries[lx * REGION_SIZE + lz]
+        self._write_entry(lx, lz, (offset, len(packed_array), len(packed_meta), count))
+        if previous[0]:
+            self._release(previous[0], previous[1] + previous[2])
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class RegionStore:
+    """Directory of region files named r.<rx>.<rz>.region, addressed by chunk.
+
+    Every file records the world key (seed, generator version, world size with
+    0 for unbounded) it was written for; opening a directory written for
+    another key raises ValueError instead of mixing its chunks with freshly
+    generated ones.
+    """
+
+    def __init__(self, directory: str, height: int = WORLD_HEIGHT, world_key: Tuple[int, int, int] = (0, 0, 0)):
+        self.directory = directory
+        self.height = height
+        self.world_key = tuple(world_key)
+        self.files: Dict[Tuple[int, int], RegionFile] = {}
+        os.makedirs(directory, exist_ok=True)
+        try:
+            for name in os.listdir(directory):
+                match = _REGION_FILE_PATTERN.match(name)
+                if match:
+                    self._region(int(match.group(1)), int(match.group(2)))
+        except ValueError:
+            self.close()
+            raise
+
+    def _region(self, rx: int, rz: int) -> RegionFile:
+        region = self.files.get((rx, rz))
+        if region is None:
+            path = os.path.join(self.directory, f"r.{rx}.{rz}.region")
+            region = self.files[(rx, rz)] = RegionFile(path, self.height, self.world_key)
+        return region
+
+    def chunk_counts(self) -> Dict[ChunkKey, int]:
+        """Return the block count of every chunk stored on disk, without reading payloads."""
+        counts = {}
+        for (rx, rz), region in self.files.items():
+            for lx, lz, count in region.chunk_counts():
+                counts[(rx * REGION_SIZE + lx, rz * REGION_SIZE + lz)] = count
+        return counts
+
+    def load_array(self, cx: int, cz: int) -> bytes:
+        region = self.files.get((cx // REGION_SIZE, cz // REGION_SIZE))
+        array = region.read_array(cx % REGION_SIZE, cz % REGION_SIZE) if region else None
+        if array is None:
+            raise KeyError((cx, cz))
+        return array
+
+    def load_metadata(self) -> Dict[Position, Tuple[Optional[str], Optional[str]]]:
+        """Read the block metadata of every stored chunk (chunk arrays are not touched)."""
+        metadata = {}
+        for region in self.files.values():
+            for lx, lz, _count in region.chunk_counts():
+                for position, block_id, owner in region.read_metadata(lx, lz):
+                    metadata[tuple(position)] = (block_id, owner)
+        return metadata
+
+    def save_chunk(self, cx: int, cz: int, array: bytes,
+                   metadata: Dict[Position, Tuple[Optional[str], Optional[str]]], count: int) -> None:
+        rows = [[list(position), block_id, owner] for position, (block_id, owner) in metadata.items()]
+        self._region(cx // REGION_SIZE, cz // REGION_SIZE).write_chunk(
+            cx % REGION_SIZE, cz % REGION_SIZE, array, rows, count)
+
+    def delete_chunk(self, cx: int, cz: int) -> None:
+        region = self.files.get((cx // REGION_SIZE, cz // REGION_SIZE))
+        if region is not None:
+            region.delete_chunk(cx % REGION_SIZE, cz % REGION_SIZE)
+
+    def close(self) -> None:
+        for region in self.files.values():
+            region.close()
+        self.files.clear()